@@ -0,0 +1,148 @@
+import numpy as np
+
+from Oraculo import bilhetes
+from Oraculo.bilhetes import popcount
+from Oraculo.indice import IndicePrefixo
+from Oraculo.jogos import LOTOFACIL
+
+JOGO = LOTOFACIL.nome
+DATA_PATH = LOTOFACIL.data_path
+DEZENAS = len(LOTOFACIL.simbolos)
+POR_SORTEIO = LOTOFACIL.por_sorteio
+COLUNAS = LOTOFACIL.colunas
+FAIXAS = LOTOFACIL.faixas  # faixas premiadas
+
+_BITS = np.arange(DEZENAS, dtype=np.uint32)
+
+
+def codificar(jogos):
+    """
+    Converte jogos (matriz n x k de dezenas 1..25) em bitmasks uint32 (dezena d -> bit d-1).
+    """
+    return bilhetes.codificar_mascaras(jogos, 1, np.uint32)
+
+
+def matriz_bits(mascaras):
+    """
+    Expande bitmasks em uma matriz 0/1 de formato (n, 25).
+    """
+    return bilhetes.matriz_mascaras(mascaras, DEZENAS, np.uint32)
+
+
+def de_bits(bits):
+    """
+    Inverso de `matriz_bits`: matriz 0/1 (n, 25) -> bitmasks uint32.
+    """
+    bits = np.asarray(bits).astype(np.uint32)
+    return np.bitwise_or.reduce(bits << _BITS, axis=-1).astype(np.uint32)
+
+
+def decodificar(mascaras):
+    """
+    Converte bitmasks de 15 dezenas de volta em uma matriz (n, 15) ordenada.
+    """
+    return bilhetes.decodificar_mascaras(mascaras, DEZENAS, 1, np.uint32)
+
+
+def como_mascaras(bilhetes):
+    """
+    Normaliza a entrada para um vetor de bitmasks. Aceita um bilhete (lista de
+    dezenas ou bitmask), um vetor de bitmasks ou uma matriz (n, 15) de dezenas.
+    Retorna também se a entrada representava um único bilhete.
+    """
+    arr = np.asarray(bilhetes)
+    if arr.ndim == 0:
+        return arr.astype(np.uint32).reshape(1), True
+    if arr.ndim == 1 and len(arr) and arr.max() <= DEZENAS:
+        return codificar(arr), True
+    if arr.ndim == 1:
+        return arr.astype(np.uint32), False
+    return codificar(arr), False
+
+
+def sincronizar(con, path=DATA_PATH):
+    """
+    Leva para o banco os concursos e faixas de prêmio novos do CSV.
+    """
+    return LOTOFACIL.sincronizar(con, path)
+
+
+class DrawStore:
+    """
+    Histórico da Lotofácil em ordem crescente de concurso, com cada sorteio
+    armazenado como um bitmask uint32 contíguo.
+    """
+
+    def __init__(self, mascaras, concursos=None, datas=None):
+        self.mascaras = np.ascontiguousarray(mascaras, dtype=np.uint32)
+        n = len(self.mascaras)
+        self.concursos = np.arange(1, n + 1) if concursos is None else np.asarray(concursos)
+        self.datas = np.full(n, np.datetime64('NaT'), dtype='datetime64[D]') if datas is None else np.asarray(datas)
+        self._bits = None
+
+    @classmethod
+    def carregar(cls, path=DATA_PATH):
+        dados = LOTOFACIL.carregar(path)
+        return cls(codificar(dados['matriz']), concursos=dados['concurso'], datas=dados['data'])
+
+    def __len__(self):
+        return len(self.mascaras)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            idx = slice(idx, idx + 1 if idx != -1 else None)
+        return DrawStore(self.mascaras[idx], self.concursos[idx], self.datas[idx])
+
+    def tail(self, n):
+        return self[max(len(self) - n, 0):]
+
+    @property
+    def ultimo_concurso(self):
+        return int(self.concursos[-1]) if len(self) else 0
+
+    def bits(self):
+        if self._bits is None:
+            self._bits = matriz_bits(self.mascaras)
+        return self._bits
+
+    def jogos(self):
+        return decodificar(self.mascaras) if len(self) else np.empty((0, POR_SORTEIO), dtype=np.int64)
+
+    def acertos(self, bilhetes):
+        """
+        Número de acertos de cada bilhete contra cada sorteio do histórico.
+        Aceita um bilhete (lista de dezenas ou bitmask) ou um lote; retorna
+        um vetor (n_sorteios,) ou uma matriz (n_bilhetes, n_sorteios).
+        """
+        mascaras, unico = como_mascaras(bilhetes)
+        resultado = popcount(mascaras[:, None] & self.mascaras[None, :])
+        return resultado[0] if unico else resultado
+
+    def histograma_acertos(self, bilhetes, bloco=2048, processos=None):
+        """
+        Para cada bilhete, em quantos sorteios do histórico ele teria feito
+        0..15 acertos: matriz (n_bilhetes, 16). Os bilhetes são processados em
+        blocos (memória limitada a bloco x n_sorteios) distribuídos entre processos.
+        """
+        mascaras, _ = como_mascaras(bilhetes)
+        return LOTOFACIL.histograma_acertos(mascaras, self.mascaras, bloco, processos)
+
+    def frequencia(self):
+        """
+        Ocorrências de cada dezena (índice 0 -> dezena 1).
+        """
+        return self.bits().sum(axis=0, dtype=np.int64)
+
+    def indice(self):
+        """
+        Índice de somas acumuladas para frequência em qualquer intervalo de concursos.
+        """
+        return IndicePrefixo.construir(self.bits(), self.concursos)
+
+    def coocorrencia(self):
+        """
+        Matriz 25 x 25 com o número de sorteios em que cada par de dezenas saiu junto.
+        A diagonal coincide com `frequencia()`.
+        """
+        bits = self.bits().astype(np.int32)
+        return bits.T @ bits
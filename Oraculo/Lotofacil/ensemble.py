@@ -0,0 +1,43 @@
+import numpy as np
+
+from Oraculo import ensemble
+from Oraculo.Lotofacil.draw_store import POR_SORTEIO, codificar, matriz_bits
+from Oraculo.Lotofacil.models import markov, mutation
+
+# Réplicas por modelo quando o ensemble é ativado (ORACULO_REPLICAS no predict)
+REPLICAS = 2000
+
+
+def modelos(stats, frequencia, replicas=REPLICAS):
+    # Só modelos com sorteio próprio: o beam search é determinístico (réplicas
+    # repetiriam a mesma busca) e entra no consenso junto dos jogos fixos
+    return {
+        'mutation': ensemble.modelo(mutation.amostrar_mutacoes, mutation.calcular_probabilidades(None, frequencia), replicas=replicas),
+        'markov': ensemble.modelo(markov.amostrar_caminhos, markov.matriz_transicao(stats['transicoes']), replicas=replicas),
+    }
+
+
+def probabilidades(amostras):
+    """
+    Probabilidade de seleção de cada dezena (índice 0 -> dezena 1) por modelo.
+    """
+    return {nome: matriz_bits(a).mean(axis=0) for nome, a in amostras.items()}
+
+
+def consenso(probs, jogos=()):
+    """
+    Média das probabilidades de seleção dos modelos estocásticos com os jogos
+    dos determinísticos (cada modelo pesa igual, um modelo com vários jogos
+    entra pela média deles). Retorna as 15 dezenas mais prováveis e a média.
+    """
+    linhas = list(probs.values()) + [matriz_bits(codificar(j)).mean(axis=0) for j in jogos]
+    media = np.mean(linhas, axis=0)
+    escolhidas = np.argsort(-media, kind='stable')[:POR_SORTEIO]
+    return sorted(int(d) + 1 for d in escolhidas), media
+
+
+def executar(stats, frequencia, replicas=REPLICAS, seed=None, processos=None, jogos=()):
+    amostras = ensemble.amostrar(modelos(stats, frequencia, replicas), seed=seed, processos=processos)
+    probs = probabilidades(amostras)
+    palpite, media = consenso(probs, jogos)
+    return palpite, media, probs
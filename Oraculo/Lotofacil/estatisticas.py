@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+
+from Oraculo import estatisticas
+from Oraculo.indice import IndicePrefixo
+from Oraculo.Lotofacil.draw_store import DATA_PATH, DEZENAS, decodificar, matriz_bits
+
+VERSAO = 7
+
+
+def caminho_snapshot(path=DATA_PATH):
+    # Ao lado do CSV (versionado), não em data/cache/: o CI commita o snapshot
+    # junto com os sorteios e a próxima execução só conta os concursos novos
+    return os.path.join(os.path.dirname(path), 'Lotofacil.estatisticas.npz')
+
+
+def inicializar():
+    return estatisticas.novo_snapshot(
+        VERSAO, (), np.uint32, (DEZENAS,),
+        # transicoes[a, b]: quantas vezes a dezena b sucedeu a dezena a no sorteio ordenado
+        transicoes=np.zeros((DEZENAS + 1, DEZENAS + 1), dtype=np.int64),
+        # pares[i, j]: sorteios em que as dezenas i+1 e j+1 saíram juntas (diagonal = frequência)
+        pares=np.zeros((DEZENAS, DEZENAS), dtype=np.int64),
+    )
+
+
+def contar_transicoes(jogos, transicoes):
+    jogos = np.asarray(jogos)
+    np.add.at(transicoes, (jogos[:, :-1], jogos[:, 1:]), 1)
+    return transicoes
+
+
+def transicoes_por_sorteio(jogos):
+    """
+    Contagens de transição de cada sorteio separadamente: (n, 26, 26).
+    """
+    jogos = np.asarray(jogos)
+    contagens = np.zeros((len(jogos), DEZENAS + 1, DEZENAS + 1), dtype=np.int32)
+    linhas = np.broadcast_to(np.arange(len(jogos))[:, None], jogos[:, 1:].shape)
+    np.add.at(contagens, (linhas, jogos[:, :-1], jogos[:, 1:]), 1)
+    return contagens
+
+
+def pares_por_sorteio(bits):
+    """
+    Produto externo de cada sorteio consigo mesmo: (n, 25, 25).
+    """
+    bits = np.asarray(bits, dtype=np.int32)
+    return bits[:, :, None] * bits[:, None, :]
+
+
+def acumular(snap, mascaras):
+    jogos = decodificar(mascaras)
+    contar_transicoes(jogos, snap['transicoes'])
+    bits = matriz_bits(mascaras).astype(np.int64)
+    snap['pares'] += bits.T @ bits
+
+
+def atualizar(store, path=None):
+    """
+    Estatísticas acumuladas do histórico de `store`, persistidas ao lado do
+    CSV e atualizadas apenas com os concursos novos.
+    """
+    path = path or caminho_snapshot()
+    return estatisticas.atualizar(path, VERSAO, store.concursos, store.mascaras, inicializar, acumular, matriz_bits)
+
+
+def janela(store, n):
+    """
+    Frequência por dezena nos últimos `n` concursos de `store`.
+    """
+    return estatisticas.janela(store.mascaras, n, matriz_bits)
+
+
+def indice(store):
+    """
+    Índice de frequências por dezena sobre qualquer intervalo de concursos
+    (para o backtest, que consulta todos os pontos do histórico).
+    """
+    return store.indice()
+
+
+def indice_transicoes(store):
+    """
+    Índice das contagens de transição (26 x 26) sobre qualquer intervalo de
+    concursos, montado em memória (o snapshot só guarda os totais).
+    """
+    return IndicePrefixo.construir(transicoes_por_sorteio(decodificar(store.mascaras)), store.concursos)
+
+
+def indice_pares(store):
+    """
+    Índice das coocorrências de pares (25 x 25) sobre qualquer intervalo de
+    concursos, montado em memória (o snapshot só guarda os totais).
+    """
+    return IndicePrefixo.construir(pares_por_sorteio(matriz_bits(store.mascaras)), store.concursos)
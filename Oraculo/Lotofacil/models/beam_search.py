@@ -1,33 +1,124 @@
-import pandas as pd
-import random
-from collections import Counter
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from Oraculo.Lotofacil.draw_store import DrawStore, DEZENAS, POR_SORTEIO, decodificar, matriz_bits
+
+_BITS = np.left_shift(np.uint32(1), np.arange(DEZENAS, dtype=np.uint32))
 
 def carregar_dados(path='Oraculo/Lotofacil/data/Lotofacil.csv'):
-    df = pd.read_csv(path)
-    colunas = [col for col in df.columns if 'Bola' in col or 'Numero' in col]
-    return df[colunas].values.tolist()
+    return DrawStore.carregar(path)
 
-def calcular_frequencia(jogos):
-    todas = [n for jogo in jogos for n in jogo]
-    freq = Counter(todas)
-    return freq
+def calcular_frequencia(store):
+    return store.frequencia()
 
 def score_combination(combination, freq):
-    return sum(freq.get(num, 0) for num in combination)
+    # Aceita um bilhete (coleção de dezenas) ou bitmasks (escalar ou vetor)
+    if isinstance(combination, (set, frozenset, list, tuple)):
+        return int(freq[np.fromiter(combination, dtype=np.int64) - 1].sum())
+    return matriz_bits(combination) @ freq
+
+# === Funções de pontuação ===
+# Uma pontuação é {'pesos': (25,), 'pares': (25, 25) ou None}; o score de um
+# bilhete x (vetor 0/1) é pesos·x + Σ_{i<j} pares[i, j]·x_i·x_j.
+
+def pontuacao_frequencia(store, frequencia=None):
+    freq = store.frequencia() if frequencia is None else np.asarray(frequencia)
+    return {'pesos': freq / max(freq.sum(), 1), 'pares': None}
+
+def pontuacao_recencia(store, meia_vida=10):
+    # Cada sorteio pesa 2^(-idade / meia_vida); o mais recente tem idade 0
+    idade = np.arange(len(store))[::-1]
+    decaimento = np.exp2(-idade / meia_vida)
+    pesos = decaimento @ store.bits()
+    return {'pesos': pesos / max(pesos.sum(), 1), 'pares': None}
+
+def pontuacao_coocorrencia(store, pares=None):
+    # `pares`: contagens 25 x 25 já acumuladas (ex.: estatisticas['pares']), sem varrer o histórico
+    cooc = (store.coocorrencia() if pares is None else np.array(pares)).astype(np.float64)
+    np.fill_diagonal(cooc, 0)
+    return {'pesos': np.zeros(DEZENAS), 'pares': cooc / max(cooc.sum(), 1)}
+
+def combinar(*pontuacoes, fatores=None):
+    fatores = fatores or [1.0] * len(pontuacoes)
+    pesos = sum(f * p['pesos'] for f, p in zip(fatores, pontuacoes))
+    pares = [f * p['pares'] for f, p in zip(fatores, pontuacoes) if p['pares'] is not None]
+    return {'pesos': pesos, 'pares': sum(pares) if pares else None}
+
+def pontuar(mascaras, pontuacao):
+    bits = matriz_bits(mascaras).astype(np.float64)
+    score = bits @ pontuacao['pesos']
+    if pontuacao['pares'] is not None:
+        score += 0.5 * np.einsum('...i,ij,...j->...', bits, pontuacao['pares'], bits)
+    return score
+
+def _limite_sufixo(ganho, restantes):
+    """
+    Para cada estado b e próxima dezena j, soma dos `restantes` maiores ganhos
+    entre as dezenas > j: um limite otimista para completar o bilhete.
+    """
+    if restantes == 0:
+        return np.zeros(ganho.shape)
+    # sufixo[b, j, m] = ganho[b, m] se m > j, senão -inf
+    sufixo = np.where(np.triu(np.ones((DEZENAS, DEZENAS), dtype=bool), k=1), ganho[:, None, :], -np.inf)
+    melhores = -np.sort(-sufixo, axis=2)[:, :, :restantes]
+    return np.where(np.isfinite(melhores), melhores, 0).sum(axis=2)
+
+def beam_search(store, beam_width=50, top_candidates=10, frequencia=None, pontuacao=None, seed=None, pares=None):
+    """
+    Busca em feixe sobre as C(25, 15) combinações: os bilhetes são construídos
+    dezena a dezena em ordem crescente e, a cada passo, mantêm-se os
+    `beam_width` bilhetes parciais com o maior limite otimista de score.
+    `seed` fixa o desempate entre parciais de mesmo limite. Com `pares`
+    (coocorrências 25 x 25), a afinidade entre dezenas soma-se à frequência.
+    """
+    if pontuacao is None:
+        pontuacao = pontuacao_frequencia(store, frequencia)
+        if pares is not None:
+            pontuacao = combinar(pontuacao, pontuacao_coocorrencia(store, pares))
+    pesos = np.asarray(pontuacao['pesos'], dtype=np.float64)
+    pares = pontuacao['pares']
+    pares_pos = None if pares is None else np.clip(pares, 0, None).max(axis=0)
+    rng = np.random.default_rng(seed)
+    largura = max(beam_width, top_candidates)
+
+    # Estado do feixe: máscara, score exato, última dezena (0-based; -1 = vazio)
+    mascaras = np.zeros(1, dtype=np.uint32)
+    scores = np.zeros(1)
+    ultimas = np.full(1, -1)
+    dezenas = np.arange(DEZENAS)
+
+    for passo in range(POR_SORTEIO):
+        restantes = POR_SORTEIO - passo - 1
+        bits = matriz_bits(mascaras).astype(np.float64)
+
+        # Ganho exato de adicionar cada dezena a cada parcial
+        ganho = np.broadcast_to(pesos, bits.shape).copy()
+        if pares is not None:
+            ganho += bits @ pares
+        filhos = scores[:, None] + ganho
+
+        # Limite otimista das dezenas que ainda faltam (pares futuros limitados pelo maior par positivo)
+        ganho_futuro = ganho if pares is None else ganho + restantes * pares_pos
+        limites = filhos + _limite_sufixo(ganho_futuro, restantes)
 
-def beam_search(df, beam_width=50, top_candidates=10):
-    freq = calcular_frequencia(df)
-    all_nums = list(range(1, 26))
+        # Só dezenas após a última escolhida, deixando espaço para completar 15
+        validos = (dezenas > ultimas[:, None]) & (dezenas <= DEZENAS - 1 - restantes)
+        pais, novas = np.nonzero(validos)
+        limite = limites[pais, novas]
 
-    # Geração de população inicial com diversidade
-    population = [set(random.sample(all_nums, 15)) for _ in range(beam_width * 5)]
+        desempate = rng.permutation(len(limite))
+        ordem = desempate[np.argsort(-limite[desempate], kind='stable')][:largura]
+        pais, novas = pais[ordem], novas[ordem]
 
-    # Scoring e ordenação
-    scored = sorted(population, key=lambda c: -score_combination(c, freq))
+        mascaras = mascaras[pais] | _BITS[novas]
+        scores = filhos[pais, novas]
+        ultimas = novas
 
-    # Seleção dos melhores
-    melhores = [sorted(list(c)) for c in scored[:top_candidates]]
-    return melhores
+    melhores = mascaras[np.argsort(-scores, kind='stable')[:top_candidates]]
+    return [[int(n) for n in jogo] for jogo in decodificar(melhores)]
 
 if __name__ == '__main__':
     jogos = carregar_dados()
@@ -0,0 +1,161 @@
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from Oraculo.dataset import caminho_cache, salvar_npy
+from Oraculo.distribuicoes import poisson_logpmf
+from Oraculo.Lotofacil.draw_store import DrawStore, DATA_PATH, DEZENAS, POR_SORTEIO, decodificar, matriz_bits
+
+TOTAL_COMBINACOES = 3268760  # C(25, 15)
+CHUNK = 1 << 18
+
+
+def carregar_dados(path=DATA_PATH):
+    return DrawStore.carregar(path)
+
+
+def gerar_combinacoes(n=DEZENAS, k=POR_SORTEIO):
+    """
+    Todas as C(n, k) combinações como bitmasks uint32 em ordem crescente,
+    construídas por programação dinâmica (dezena a dezena) sem laços por bilhete.
+    """
+    linhas = {0: np.zeros(1, dtype=np.uint32)}
+    for i in range(n):
+        bit = np.uint32(1 << i)
+        restam = n - i - 1
+        novas = {}
+        # Só interessam parciais que ainda podem chegar a k dezenas
+        for j in range(max(0, k - restam), min(i + 1, k) + 1):
+            partes = []
+            if j in linhas:
+                partes.append(linhas[j])
+            if j - 1 in linhas:
+                partes.append(linhas[j - 1] | bit)
+            novas[j] = np.concatenate(partes)
+        linhas = novas
+    return np.sort(linhas[k])
+
+
+def caminho_combinacoes(path=DATA_PATH):
+    return caminho_cache(path, 'Lotofacil.combinacoes.npy')
+
+
+def carregar_combinacoes(path=None):
+    """
+    Bitmasks de todos os bilhetes (~13 MB), gerados uma vez e mapeados do disco nas execuções seguintes.
+    """
+    path = path or caminho_combinacoes()
+    if os.path.exists(path):
+        combinacoes = np.load(path, mmap_mode='r')
+        if len(combinacoes) == TOTAL_COMBINACOES:
+            return combinacoes
+    combinacoes = gerar_combinacoes()
+    salvar_npy(path, combinacoes)
+    return combinacoes
+
+
+# === Vetores de peso por dezena (índice 0 -> dezena 1) ===
+
+def pesos_frequencia(frequencia):
+    frequencia = np.asarray(frequencia, dtype=np.float64)
+    return frequencia / max(frequencia.sum(), 1)
+
+
+def pesos_poisson(frequencia):
+    # Mesmo critério do modelo poisson: pmf da frequência de cada dezena com média comum
+    frequencia = np.asarray(frequencia)
+    log_pmf = poisson_logpmf(frequencia, frequencia.mean())
+    # Reescala pelo máximo: só a ordem relativa importa para o ranking
+    return np.exp(log_pmf - log_pmf.max())
+
+
+def pesos_markov(transicoes, amortecimento=0.85, iteracoes=200):
+    """
+    Distribuição estacionária da cadeia de transições entre dezenas ordenadas,
+    com teletransporte uniforme para tornar a cadeia ergódica (a dezena 25
+    não tem sucessoras).
+    """
+    contagens = np.asarray(transicoes, dtype=np.float64)[1:, 1:]
+    totais = contagens.sum(axis=1, keepdims=True)
+    matriz = np.divide(contagens, totais, out=np.full_like(contagens, 1 / DEZENAS), where=totais > 0)
+    pi = np.full(DEZENAS, 1 / DEZENAS)
+    for _ in range(iteracoes):
+        pi = amortecimento * pi @ matriz + (1 - amortecimento) / DEZENAS
+    return pi / pi.sum()
+
+
+def pesos_coocorrencia(pares):
+    """
+    Matriz de afinidade entre dezenas: coocorrências fora da diagonal, normalizadas.
+    """
+    pares = np.array(pares, dtype=np.float64)
+    np.fill_diagonal(pares, 0)
+    return pares / max(pares.sum(), 1)
+
+
+def _pontuar_bloco(bloco, pesos, pares=None):
+    # Linear + forma quadrática: pesos·x + ½ xᵀ·pares·x para cada bilhete x do bloco
+    # (float64: em float32 scores quase empatados trocam de ordem no top-k)
+    bits = matriz_bits(bloco).astype(np.float64)
+    scores = bits @ pesos
+    if pares is not None:
+        quadratico = 0.5 * np.einsum('ij,ij->i', bits @ pares, bits)
+        scores += quadratico if scores.ndim == 1 else quadratico[:, None]
+    return scores
+
+
+def pontuar_todas(pesos, combinacoes=None, chunk=CHUNK, pares=None):
+    """
+    Score de todos os bilhetes. `pesos` pode ser um vetor (25,) ou uma
+    matriz (25, m) para avaliar m vetores de peso de uma vez; `pares`
+    (25 x 25, ver `pesos_coocorrencia`) acrescenta a afinidade entre dezenas.
+    """
+    combinacoes = carregar_combinacoes() if combinacoes is None else combinacoes
+    pesos = np.asarray(pesos, dtype=np.float64)
+    pares = None if pares is None else np.asarray(pares, dtype=np.float64)
+    saida = np.empty((len(combinacoes),) + pesos.shape[1:], dtype=np.float64)
+    for inicio in range(0, len(combinacoes), chunk):
+        bloco = np.asarray(combinacoes[inicio:inicio + chunk])
+        saida[inicio:inicio + len(bloco)] = _pontuar_bloco(bloco, pesos, pares)
+    return saida
+
+
+def top_k(pesos, k=10, combinacoes=None, chunk=CHUNK, pares=None):
+    """
+    Os `k` bilhetes exatos de maior score sob o vetor `pesos` (e a matriz de
+    `pares`, se dada), percorrendo o espaço em blocos e mantendo só os
+    melhores de cada um.
+    """
+    combinacoes = carregar_combinacoes() if combinacoes is None else combinacoes
+    pesos = np.asarray(pesos, dtype=np.float64)
+    pares = None if pares is None else np.asarray(pares, dtype=np.float64)
+    melhores_m = np.empty(0, dtype=np.uint32)
+    melhores_s = np.empty(0, dtype=np.float64)
+    for inicio in range(0, len(combinacoes), chunk):
+        bloco = np.asarray(combinacoes[inicio:inicio + chunk])
+        scores = _pontuar_bloco(bloco, pesos, pares)
+        if len(scores) > k:
+            sel = np.argpartition(-scores, k)[:k]
+            bloco, scores = bloco[sel], scores[sel]
+        melhores_m = np.concatenate([melhores_m, bloco])
+        melhores_s = np.concatenate([melhores_s, scores])
+        if len(melhores_s) > k:
+            sel = np.argpartition(-melhores_s, k)[:k]
+            melhores_m, melhores_s = melhores_m[sel], melhores_s[sel]
+
+    ordem = np.lexsort((melhores_m, -melhores_s))
+    return [[int(n) for n in jogo] for jogo in decodificar(melhores_m[ordem])]
+
+
+def gerar_palpites(store, k=10, frequencia=None, pares=None):
+    frequencia = store.frequencia() if frequencia is None else frequencia
+    return top_k(pesos_frequencia(frequencia), k=k, pares=None if pares is None else pesos_coocorrencia(pares))
+
+
+if __name__ == '__main__':
+    store = carregar_dados()
+    print("Melhores jogos (busca exaustiva, peso por frequência):")
+    for jogo in gerar_palpites(store):
+        print(jogo)
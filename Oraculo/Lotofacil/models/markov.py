@@ -1,48 +1,90 @@
-import pandas as pd
+import sys
+import os
 import numpy as np
-from collections import defaultdict, Counter
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from Oraculo.ensemble import gerador
+from Oraculo.Lotofacil.draw_store import DrawStore, DEZENAS, POR_SORTEIO, de_bits, decodificar
+from Oraculo.Lotofacil.estatisticas import contar_transicoes
 
 def carregar_dados(path='Oraculo/Lotofacil/data/Lotofacil.csv'):
-    df = pd.read_csv(path)
-    colunas = [col for col in df.columns if 'Bola' in col or 'Numero' in col]
-    return df[colunas].values.tolist()
-
-def construir_matriz_transicao(sequencias):
-    transicoes = defaultdict(Counter)
-    for jogo in sequencias:
-        jogo_ordenado = sorted(jogo)
-        for i in range(len(jogo_ordenado) - 1):
-            atual = jogo_ordenado[i]
-            prox = jogo_ordenado[i + 1]
-            transicoes[atual][prox] += 1
-
-    matriz = {}
-    for dezena, contagem in transicoes.items():
-        total = sum(contagem.values())
-        matriz[dezena] = {k: v / total for k, v in contagem.items()}
-    return matriz
-
-def prever_proximas(matriz, estado_inicial, tamanho=15):
-    atual = estado_inicial
-    previsao = [atual]
-    while len(previsao) < tamanho:
-        if atual not in matriz or not matriz[atual]:
-            break
-        proximos = list(matriz[atual].keys())
-        probs = list(matriz[atual].values())
-        atual = np.random.choice(proximos, p=probs)
-        if atual not in previsao:
-            previsao.append(atual)
-    while len(previsao) < tamanho:
-        candidato = np.random.randint(1, 26)
-        if candidato not in previsao:
-            previsao.append(candidato)
-    return sorted(previsao)
-
-def gerar_palpite(dados):
-    matriz = construir_matriz_transicao(dados)
-    estado_inicial = np.random.choice(range(1, 26))
-    return prever_proximas(matriz, estado_inicial)
+    return DrawStore.carregar(path)
+
+def matriz_transicao(transicoes):
+    """
+    Matriz densa (26 x 26) de probabilidades: linha = dezena atual, coluna =
+    próxima dezena. Linhas sem transições (e a linha 0) ficam zeradas.
+    """
+    contagens = np.asarray(transicoes, dtype=np.float64)
+    totais = contagens.sum(axis=1, keepdims=True)
+    return np.divide(contagens, totais, out=np.zeros_like(contagens), where=totais > 0)
+
+def construir_matriz_transicao(store, transicoes=None):
+    # transicoes: contagens (26 x 26) já acumuladas, ex. do snapshot de estatísticas
+    if transicoes is None:
+        # store.jogos() já devolve cada sorteio com as dezenas em ordem crescente
+        transicoes = contar_transicoes(store.jogos(), np.zeros((DEZENAS + 1, DEZENAS + 1), dtype=np.int64))
+    return matriz_transicao(transicoes)
+
+def _proximas(matriz, acumulada, escolhidas, atual, preso, rng, tentativas):
+    """
+    Próxima dezena de cada passeio. Sorteia pela linha inteira (CDF
+    pré-calculada) e re-sorteia só os que caíram em dezena já escolhida, o que
+    equivale a amostrar da linha mascarada e renormalizada. Passeios presos
+    sorteiam uniforme. O que sobrar após `tentativas` rodadas é resolvido com
+    a linha mascarada explícita.
+    """
+    proximas = np.zeros(len(atual), dtype=np.int64)
+    pendentes = np.arange(len(atual))
+    for _ in range(tentativas):
+        if not len(pendentes):
+            return proximas
+        estados = atual[pendentes]
+        alvo = rng.random(len(pendentes)) * acumulada[estados, -1]
+        candidatas = np.minimum((acumulada[estados] <= alvo[:, None]).sum(axis=1), DEZENAS)
+        uniformes = preso[pendentes]
+        candidatas[uniformes] = rng.integers(1, DEZENAS + 1, size=int(uniformes.sum()))
+        aceitas = ~escolhidas[pendentes, candidatas]
+        proximas[pendentes[aceitas]] = candidatas[aceitas]
+        pendentes = pendentes[~aceitas]
+
+    if len(pendentes):
+        livres = ~escolhidas[pendentes]
+        pesos = np.where(livres, matriz[atual[pendentes]], 0)
+        # Sem massa livre na linha, o passeio fica preso
+        preso[pendentes[pesos.sum(axis=1) == 0]] = True
+        pesos[preso[pendentes]] = livres[preso[pendentes]]
+        acumulado = np.cumsum(pesos, axis=1)
+        alvo = rng.random(len(pendentes)) * acumulado[:, -1]
+        proximas[pendentes] = np.minimum((acumulado <= alvo[:, None]).sum(axis=1), DEZENAS)
+    return proximas
+
+def amostrar_caminhos(matriz, n, rng, tamanho=POR_SORTEIO, inicio=None, tentativas=32):
+    """
+    `n` passeios simultâneos de `tamanho` dezenas distintas, como bitmasks.
+    A cada passo a próxima dezena sai da linha da dezena atual restrita às
+    ainda não escolhidas; um passeio sem saída completa o bilhete com
+    dezenas uniformes entre as que faltam.
+    """
+    matriz = np.asarray(matriz, dtype=np.float64)
+    acumulada = np.cumsum(matriz, axis=1)
+    linhas = np.arange(n)
+    escolhidas = np.zeros((n, DEZENAS + 1), dtype=bool)
+    escolhidas[:, 0] = True  # a coluna 0 não é dezena
+    atual = rng.integers(1, DEZENAS + 1, size=n) if inicio is None else np.full(n, inicio)
+    escolhidas[linhas, atual] = True
+    preso = acumulada[atual, -1] == 0
+
+    for _ in range(tamanho - 1):
+        atual = _proximas(matriz, acumulada, escolhidas, atual, preso, rng, tentativas)
+        escolhidas[linhas, atual] = True
+        preso |= acumulada[atual, -1] == 0
+    return de_bits(escolhidas[:, 1:])
+
+def gerar_palpite(store, transicoes=None, seed=None):
+    matriz = construir_matriz_transicao(store, transicoes)
+    return [int(n) for n in decodificar(amostrar_caminhos(matriz, 1, gerador(seed)))[0]]
 
 if __name__ == '__main__':
     dados = carregar_dados()
@@ -1,56 +1,217 @@
-import pandas as pd
+import sys
+import os
 import numpy as np
-import random
-from collections import Counter
-
-
-def carregar_dados(path='lotofacil/data/Lotofacil.csv'):
-    df = pd.read_csv(path)
-    colunas = [col for col in df.columns if 'Bola' in col or 'Numero' in col]
-    return df[colunas].values.tolist()
-
-
-def calcular_probabilidades(jogos):
-    todas = [n for jogo in jogos for n in jogo]
-    freq = Counter(todas)
-    total = sum(freq.values())
-    probs = {n: freq[n] / total for n in range(1, 26)}
-    return probs
-
-
-def mutar(jogo_base, probs, taxa_mutacao=0.3):
-    jogo = jogo_base[:]
-    for i in range(len(jogo)):
-        if random.random() < taxa_mutacao:
-            candidatos = [n for n in range(1, 26) if n not in jogo]
-            pesos = [probs.get(n, 0) for n in candidatos]
-            if candidatos and sum(pesos) > 0:
-                novo = random.choices(candidatos, weights=pesos, k=1)[0]
-                jogo[i] = novo
-    # Garantir que o jogo tenha 15 dezenas únicas
-    jogo = sorted(set(jogo))
-    while len(jogo) < 15:
-        candidatos = [n for n in range(1, 26) if n not in jogo]
-        pesos = [probs.get(n, 0) for n in candidatos]
-        if candidatos and sum(pesos) > 0:
-            novo = random.choices(candidatos, weights=pesos, k=1)[0]
-        elif candidatos:
-            novo = random.choice(candidatos)
-        else:
-            break
-        jogo.append(novo)
-    return sorted(jogo[:15])
-
-
-def gerar_populacao_base(jogos, n=10):
-    return [sorted(random.sample(range(1, 26), 15)) for _ in range(n)]
-
-
-def gerar_mutacoes(jogos_hist, num_mutantes=10, taxa_mutacao=0.3):
-    probs = calcular_probabilidades(jogos_hist)
-    base = gerar_populacao_base(jogos_hist, n=num_mutantes)
-    mutantes = [mutar(jogo, probs, taxa_mutacao) for jogo in base]
-    return mutantes
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from Oraculo.ensemble import gerador
+from Oraculo.paralelo import numero_processos
+from Oraculo.Lotofacil.draw_store import DrawStore, DEZENAS, POR_SORTEIO, de_bits, decodificar, matriz_bits
+
+
+def carregar_dados(path='Oraculo/Lotofacil/data/Lotofacil.csv'):
+    return DrawStore.carregar(path)
+
+
+def calcular_probabilidades(store, frequencia=None):
+    # probs[n - 1] é a probabilidade relativa da dezena n
+    freq = store.frequencia() if frequencia is None else np.asarray(frequencia)
+    total = freq.sum()
+    return freq / total if total else np.full(len(freq), 1 / len(freq))
+
+
+def amostrar_mutacoes(probs, n, rng, taxa_mutacao=0.3):
+    """
+    `n` mutantes de uma vez, como bitmasks: base aleatória de 15 dezenas, cada
+    dezena sai com probabilidade `taxa_mutacao` e as que saem são repostas por
+    sorteio ponderado por `probs` sem reposição (Gumbel top-k). Dezenas fora
+    da base têm prioridade e as de peso zero só entram se faltarem candidatas.
+    """
+    probs = np.asarray(probs, dtype=np.float64)
+    base = np.zeros((n, DEZENAS), dtype=bool)
+    np.put_along_axis(base, np.argpartition(rng.random((n, DEZENAS)), POR_SORTEIO, axis=1)[:, :POR_SORTEIO], True, axis=1)
+    saem = base & (rng.random((n, DEZENAS)) < taxa_mutacao)
+    mantidas = base & ~saem
+
+    with np.errstate(divide='ignore'):
+        log_p = np.log(probs)
+    chave = np.where(np.isfinite(log_p), log_p, -1e6) + rng.gumbel(size=(n, DEZENAS))
+    # Camadas: fora da base > saíram da base > mantidas (nunca escolhidas)
+    chave = np.where(base, np.where(saem, 1e7, -np.inf), 2e7) + chave
+    ordem = np.argsort(-chave, axis=1)
+    novas = np.zeros_like(base)
+    np.put_along_axis(novas, ordem, np.arange(DEZENAS) < saem.sum(axis=1, keepdims=True), axis=1)
+    return de_bits(mantidas | novas)
+
+
+def gerar_mutacoes(store, num_mutantes=10, taxa_mutacao=0.3, frequencia=None, seed=None):
+    probs = calcular_probabilidades(store, frequencia)
+    mutantes = amostrar_mutacoes(probs, num_mutantes, gerador(seed), taxa_mutacao)
+    return [[int(n) for n in jogo] for jogo in decodificar(mutantes)]
+
+
+# === Algoritmo genético sobre bitmasks (15 de 25) ===
+# Um critério de fitness é {'pesos': (25,) ou None, 'store': DrawStore ou None,
+# 'valores': (16,)}: fitness = pesos·x + Σ_h histograma_acertos[h] · valores[h].
+
+def criterio_frequencia(frequencia):
+    frequencia = np.asarray(frequencia, dtype=np.float64)
+    return {'pesos': frequencia / max(frequencia.sum(), 1), 'store': None, 'valores': None}
+
+
+def criterio_historico(store, premios=None):
+    """
+    Fitness pelo desempenho do bilhete em todo o histórico: `premios` mapeia
+    acertos -> valor (ex.: `dataset.premios_medios`). Por padrão conta os
+    sorteios premiados (11 a 15 acertos).
+    """
+    premios = premios or {n: 1.0 for n in range(11, POR_SORTEIO + 1)}
+    valores = np.zeros(POR_SORTEIO + 1)
+    for acertos, valor in premios.items():
+        valores[acertos] = valor
+    return {'pesos': None, 'store': store, 'valores': valores}
+
+
+def avaliar(mascaras, criterio):
+    score = np.zeros(len(mascaras))
+    if criterio['pesos'] is not None:
+        score += matriz_bits(mascaras) @ criterio['pesos']
+    if criterio['store'] is not None:
+        score += criterio['store'].histograma_acertos(mascaras, processos=1) @ criterio['valores']
+    return score
+
+
+def _escolher(elegiveis, quantidade, rng, log_pesos=None):
+    """
+    Escolhe, por linha, `quantidade` posições distintas entre as elegíveis
+    (uniforme ou ponderado por exp(log_pesos), via Gumbel top-k).
+    """
+    chave = rng.gumbel(size=elegiveis.shape) if log_pesos is None else log_pesos + rng.gumbel(size=elegiveis.shape)
+    chave = np.where(elegiveis, chave, -np.inf)
+    ordem = np.argsort(-chave, axis=1)
+    escolhidas = np.zeros_like(elegiveis)
+    np.put_along_axis(escolhidas, ordem, np.arange(elegiveis.shape[1]) < np.reshape(quantidade, (-1, 1)), axis=1)
+    return escolhidas
+
+
+def mutacao_troca(mascaras, rng, taxa_mutacao=0.3, log_pesos=None):
+    """
+    Troca uma dezena do bilhete por uma de fora em cada indivíduo sorteado
+    com probabilidade `taxa_mutacao`: a cardinalidade se mantém sem reparo.
+    """
+    bits = matriz_bits(mascaras).astype(bool)
+    mutar = rng.random(len(bits)) < taxa_mutacao
+    sai = _escolher(bits, mutar, rng)
+    entra = _escolher(~bits, mutar, rng, log_pesos)
+    return de_bits(bits ^ sai ^ entra)
+
+
+def cruzamento(pais_a, pais_b, rng):
+    """
+    Filho com todas as dezenas comuns aos dois pais, completado com dezenas
+    sorteadas entre as que só um deles tem: sempre 15 dezenas distintas.
+    """
+    comuns = matriz_bits(pais_a & pais_b).astype(bool)
+    exclusivas = matriz_bits(pais_a ^ pais_b).astype(bool)
+    faltam = POR_SORTEIO - comuns.sum(axis=1)
+    return de_bits(comuns | _escolher(exclusivas, faltam, rng))
+
+
+def torneio(fitness, quantidade, rng, tamanho=3):
+    # Índice do melhor entre `tamanho` indivíduos sorteados, para cada vaga
+    competidores = rng.integers(0, len(fitness), size=(quantidade, tamanho))
+    return competidores[np.arange(quantidade), np.argmax(fitness[competidores], axis=1)]
+
+
+def populacao_aleatoria(tamanho, rng):
+    return de_bits(_escolher(np.ones((tamanho, DEZENAS), dtype=bool), np.full(tamanho, POR_SORTEIO), rng))
+
+
+def evoluir(criterio, populacao=None, tamanho=200, geracoes=100, rng=None, taxa_mutacao=0.3,
+            tamanho_torneio=3, elite=2, probs=None):
+    """
+    Algoritmo genético vetorizado sobre a população inteira: elitismo,
+    seleção por torneio, cruzamento que preserva conjuntos e mutação por
+    troca (dezena que entra ponderada por `probs`, se informado).
+    Retorna (bitmasks, fitness) ordenados do melhor para o pior.
+    """
+    rng = gerador(rng)
+    populacao = populacao_aleatoria(tamanho, rng) if populacao is None else np.asarray(populacao, dtype=np.uint32)
+    log_pesos = None
+    if probs is not None:
+        with np.errstate(divide='ignore'):
+            log_pesos = np.log(np.asarray(probs, dtype=np.float64))
+    fitness = avaliar(populacao, criterio)
+
+    for _ in range(geracoes):
+        ordem = np.argsort(-fitness, kind='stable')
+        filhos = len(populacao) - elite
+        pais_a = populacao[torneio(fitness, filhos, rng, tamanho_torneio)]
+        pais_b = populacao[torneio(fitness, filhos, rng, tamanho_torneio)]
+        novos = mutacao_troca(cruzamento(pais_a, pais_b, rng), rng, taxa_mutacao, log_pesos)
+        populacao = np.concatenate([populacao[ordem[:elite]], novos])
+        fitness = np.concatenate([fitness[ordem[:elite]], avaliar(novos, criterio)])
+
+    ordem = np.argsort(-fitness, kind='stable')
+    return populacao[ordem], fitness[ordem]
+
+
+def _epoca(criterio, populacao, geracoes, semente, opcoes):
+    return evoluir(criterio, populacao, len(populacao), geracoes, np.random.default_rng(semente), **opcoes)
+
+
+def evoluir_ilhas(criterio, ilhas=4, tamanho=200, geracoes=100, intervalo=10, migrantes=2,
+                  seed=None, processos=None, **opcoes):
+    """
+    Modelo de ilhas: `ilhas` populações evoluem de forma independente (uma
+    por processo) e, a cada `intervalo` gerações, os `migrantes` melhores de
+    cada ilha substituem os piores da seguinte (anel). Cada ilha tem seu
+    fluxo aleatório por época, então o resultado não depende do número de
+    processos. Retorna (bitmasks, fitness) de todas as ilhas, do melhor para o pior.
+    """
+    sementes = np.random.SeedSequence(seed).spawn(ilhas)
+    epocas = -(-geracoes // intervalo)
+    sementes = [s.spawn(epocas + 1) for s in sementes]
+    populacoes = [populacao_aleatoria(tamanho, np.random.default_rng(s[-1])) for s in sementes]
+    processos = min(numero_processos(processos), ilhas)
+    pool = ProcessPoolExecutor(max_workers=processos) if processos > 1 else None
+    try:
+        for epoca in range(epocas):
+            passo = min(intervalo, geracoes - epoca * intervalo)
+            args = [(criterio, pop, passo, sementes[i][epoca], opcoes) for i, pop in enumerate(populacoes)]
+            if pool is None:
+                resultados = [_epoca(*a) for a in args]
+            else:
+                resultados = [f.result() for f in [pool.submit(_epoca, *a) for a in args]]
+            # Cada população volta ordenada: melhores no início, piores no fim
+            populacoes = [pop for pop, _ in resultados]
+            if ilhas > 1 and migrantes:
+                melhores = [pop[:migrantes].copy() for pop in populacoes]
+                for i, pop in enumerate(populacoes):
+                    pop[-migrantes:] = melhores[i - 1]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    todas = np.concatenate(populacoes)
+    unicas = np.unique(todas)
+    fitness = avaliar(unicas, criterio)
+    ordem = np.argsort(-fitness, kind='stable')
+    return unicas[ordem], fitness[ordem]
+
+
+def gerar_geneticos(store, num_jogos=10, frequencia=None, premios=None, ilhas=4, tamanho=200,
+                    geracoes=60, seed=None, processos=None):
+    """
+    Os `num_jogos` melhores bilhetes do GA em ilhas, com fitness pelo
+    desempenho histórico e dezenas que entram na mutação ponderadas pela
+    frequência. Sem `seed`, as ilhas usam a entropia do sistema.
+    """
+    probs = calcular_probabilidades(store, frequencia)
+    melhores, _ = evoluir_ilhas(criterio_historico(store, premios), ilhas, tamanho, geracoes,
+                                seed=seed, processos=processos, probs=probs)
+    return [[int(n) for n in jogo] for jogo in decodificar(melhores[:num_jogos])]
 
 
 if __name__ == '__main__':
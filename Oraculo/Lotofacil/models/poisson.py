@@ -1,54 +1,56 @@
-import pandas as pd
+import sys
+import os
 import numpy as np
-from scipy.stats import poisson
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from Oraculo.Lotofacil.draw_store import DrawStore
+from Oraculo.distribuicoes import poisson_pmf
 
 
 def carregar_dados(path='Oraculo/Lotofacil/data/Lotofacil.csv'):
-    df = pd.read_csv(path)
-    colunas_bolas = [col for col in df.columns if 'Bola' in col or 'Numero' in col]
-    dezenas = df[colunas_bolas].values.flatten()
-    return pd.Series(dezenas)
+    return DrawStore.carregar(path)
 
 
-def calcular_frequencias(series):
-    freq_abs = series.value_counts().sort_index()
-    freq_rel = freq_abs / len(series)
-    return freq_abs, freq_rel
+def calcular_frequencias(store, frequencia=None):
+    contagem = store.frequencia() if frequencia is None else np.asarray(frequencia)
+    dezenas = np.flatnonzero(contagem > 0) + 1
+    freq_abs = contagem[dezenas - 1]
+    total = contagem.sum()
+    freq_rel = freq_abs / total if total else freq_abs.astype(float)
+    return dezenas, freq_abs, freq_rel
 
 
 def ajustar_poisson(freq_abs):
-    media = freq_abs.mean()
-    ajuste = {dezena: poisson.pmf(k=freq, mu=media) for dezena, freq in freq_abs.items()}
-    return ajuste, media
+    media = freq_abs.mean() if len(freq_abs) else 0.0
+    return poisson_pmf(freq_abs, media), media
 
 
-def gerar_tabela_probabilidades(freq_abs, freq_rel, ajuste_poisson):
+def gerar_tabela_probabilidades(dezenas, freq_abs, freq_rel, ajuste_poisson):
+    import pandas as pd
     df = pd.DataFrame({
-        'Dezena': freq_abs.index,
-        'Frequência Absoluta': freq_abs.values,
-        'Frequência Relativa (%)': (freq_rel.values * 100).round(2),
-        'Probabilidade Poisson': [ajuste_poisson[d] for d in freq_abs.index]
+        'Dezena': dezenas,
+        'Frequência Absoluta': freq_abs,
+        'Frequência Relativa (%)': (freq_rel * 100).round(2),
+        'Probabilidade Poisson': ajuste_poisson
     })
     return df.sort_values(by='Dezena')
 
 
-def gerar_combinacao_poisson(df, n=15):
-    series = df.values.flatten()
-    series = pd.Series(series)
-    freq_abs, _ = calcular_frequencias(series)
+def gerar_combinacao_poisson(store, n=15, frequencia=None):
+    dezenas, freq_abs, _ = calcular_frequencias(store, frequencia)
     ajuste, _ = ajustar_poisson(freq_abs)
 
-    # Ordena as dezenas com maiores probabilidades
-    ordenadas = sorted(ajuste.items(), key=lambda x: x[1], reverse=True)
-    combinacao = [int(dezena) for dezena, _ in ordenadas[:n]]
-    return sorted(combinacao)
+    # Ordena as dezenas com maiores probabilidades (empates na ordem das dezenas)
+    ordenadas = dezenas[np.argsort(-ajuste, kind='stable')]
+    return sorted(int(dezena) for dezena in ordenadas[:n])
 
 
 if __name__ == '__main__':
-    series = carregar_dados()
-    freq_abs, freq_rel = calcular_frequencias(series)
+    store = carregar_dados()
+    dezenas, freq_abs, freq_rel = calcular_frequencias(store)
     ajuste, media = ajustar_poisson(freq_abs)
-    tabela = gerar_tabela_probabilidades(freq_abs, freq_rel, ajuste)
+    tabela = gerar_tabela_probabilidades(dezenas, freq_abs, freq_rel, ajuste)
 
     print("Média de ocorrências por dezena:", media)
     print(tabela.to_markdown(index=False))
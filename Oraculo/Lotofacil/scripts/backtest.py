@@ -0,0 +1,148 @@
+# backtest.py (Lotofacil: walk-forward — a cada concurso t, os modelos são ajustados só com os sorteios anteriores a t)
+
+import pandas as pd
+import numpy as np
+import os
+import sys
+from contextlib import closing
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from Oraculo.Lotofacil.draw_store import DrawStore, DATA_PATH, JOGO, POR_SORTEIO, como_mascaras, popcount
+from Oraculo.Lotofacil import estatisticas
+from Oraculo.Lotofacil.models import beam_search, markov, mutation, poisson
+from Oraculo.benchmark import gerar_summary
+from Oraculo.jogos import LOTOFACIL
+from Oraculo import banco, perfil
+from Oraculo.paralelo import mapear_blocos
+from Oraculo.runner import semente_modelo
+
+# === CONFIGURAÇÃO ===
+ROOT = "Oraculo/Lotofacil"
+RESULT_CSV = f"{ROOT}/validation/backtest_results.csv"
+SUMMARY_MD = f"{ROOT}/validation/backtest_summary.md"
+CHART_IMG = f"{ROOT}/docs/charts/backtest_summary.png"
+
+# === PARÂMETROS ===
+N_CONCURSOS = 3000
+BLOCO = 100  # concursos por tarefa do pool
+SEED = 0
+
+# === MODELOS: (contexto, semente) -> bilhete ou lista de bilhetes ===
+# O contexto de t só tem contagens dos sorteios [0, t), tiradas dos índices de prefixo.
+
+def _top_dezenas(freq, n=POR_SORTEIO):
+    return sorted(int(d) + 1 for d in np.argsort(-freq, kind='stable')[:n])
+
+def _beam(ctx, seed):
+    return beam_search.beam_search(None, frequencia=ctx['frequencia'], seed=seed)
+
+def _mutation(ctx, seed):
+    return mutation.gerar_mutacoes(None, frequencia=ctx['frequencia'], seed=seed)
+
+def _markov(ctx, seed):
+    return markov.gerar_palpite(None, transicoes=ctx['transicoes'], seed=seed)
+
+def _beam_coocorrencia(ctx, seed):
+    # Beam search com a afinidade de pares, não o "coocorrencia" publicado
+    # pelo predict (busca exaustiva): o nome deixa claro qual modelo é medido
+    return beam_search.beam_search(None, frequencia=ctx['frequencia'], pares=ctx['pares'], seed=seed)
+
+def _poisson(ctx, seed):
+    return poisson.gerar_combinacao_poisson(None, frequencia=ctx['frequencia'])
+
+# exaustivo (e o coocorrencia do predict, que usa a busca exaustiva) e genetico
+# ficam de fora: custam de 0,5 a 2 s por concurso
+MODELOS = {
+    "beam_search": _beam,
+    "beam_coocorrencia": _beam_coocorrencia,
+    "mutation": _mutation,
+    "markov": _markov,
+    "poisson": _poisson,
+    "frequencia_curto": lambda ctx, seed: _top_dezenas(ctx['curto']),
+    "frequencia_medio": lambda ctx, seed: _top_dezenas(ctx['medio']),
+    "frequencia_longo": lambda ctx, seed: _top_dezenas(ctx['frequencia']),
+}
+
+# === FUNÇÕES ===
+_DADOS = {}
+
+def carregar(path=DATA_PATH):
+    """
+    Histórico e índices de prefixo (dezenas, transições e pares), uma vez por processo.
+    """
+    if path not in _DADOS:
+        store = DrawStore.carregar(path)
+        _DADOS[path] = (
+            store,
+            estatisticas.indice(store),
+            estatisticas.indice_transicoes(store),
+            estatisticas.indice_pares(store),
+        )
+    return _DADOS[path]
+
+def contexto(indice, indice_transicoes, indice_pares, t):
+    return {
+        "frequencia": indice.contagem(0, t),
+        "curto": indice.janela(5, fim=t),
+        "medio": indice.janela(75, fim=t),
+        "transicoes": indice_transicoes.contagem(0, t),
+        "pares": indice_pares.contagem(0, t),
+    }
+
+def semente(seed, modelo, concurso):
+    # Depende só do modelo e do concurso: o resultado não muda com o número de processos
+    return int(np.random.SeedSequence([semente_modelo(seed, modelo), int(concurso)]).generate_state(1)[0])
+
+def avaliar_bloco(posicoes, modelos, seed, path):
+    """
+    Linhas (posição, índice do modelo, acertos) de cada bilhete de cada modelo
+    em cada concurso do bloco.
+    """
+    store, *indices = carregar(path)
+    linhas = []
+    for t in posicoes:
+        ctx = contexto(*indices, t)
+        for i, nome in enumerate(modelos):
+            s = semente(seed, nome, store.concursos[t])
+            np.random.seed(s)
+            mascaras, _ = como_mascaras(MODELOS[nome](ctx, s))
+            acertos = popcount(mascaras & store.mascaras[t])
+            linhas.append(np.column_stack([np.full(len(acertos), t), np.full(len(acertos), i), acertos]))
+    return np.concatenate(linhas) if linhas else np.empty((0, 3), dtype=np.int64)
+
+def backtest(n=N_CONCURSOS, modelos=None, seed=SEED, processos=None, bloco=BLOCO, path=DATA_PATH):
+    """
+    Walk-forward sobre os últimos `n` concursos: para cada concurso t, cada
+    modelo é ajustado com os sorteios anteriores e pontuado no sorteio t.
+    Mesmo formato de `benchmark.benchmark`.
+    """
+    modelos = list(modelos or MODELOS)
+    store = carregar(path)[0]
+    posicoes = np.arange(max(1, len(store) - n), len(store))
+    linhas = mapear_blocos(avaliar_bloco, posicoes, bloco, processos, extra=(modelos, seed, path)).reshape(-1, 3)
+
+    t, i, acertos = linhas[:, 0], linhas[:, 1], linhas[:, 2]
+    df = pd.DataFrame({
+        "modelo": np.array(modelos, dtype=object)[i],
+        "data_palpite": store.datas[t - 1],
+        "data_concurso": store.datas[t],
+        "acertos_totais": acertos,
+        "acertos_por_coluna": "-",
+    }).sort_values(["data_concurso", "modelo"], kind="stable")
+
+    with closing(banco.conectar(banco.caminho(LOTOFACIL.pred_path))) as con:
+        banco.salvar_benchmark(con, JOGO, "backtest", df)
+    os.makedirs(os.path.dirname(RESULT_CSV), exist_ok=True)
+    df.to_csv(RESULT_CSV, index=False)
+    return df
+
+def main(grafico=True):
+    print(f"\n⏪ Executando backtest walk-forward ({N_CONCURSOS} concursos)...")
+    with perfil.etapa("backtest"):
+        df = backtest()
+    gerar_summary(df, SUMMARY_MD, CHART_IMG, grafico=grafico)
+    print("✅ Backtest concluído.")
+
+if __name__ == "__main__":
+    main()
@@ -1,133 +1,156 @@
-import pandas as pd
 import numpy as np
 import sys
 import os
-import random
-import json
-import plotly.graph_objects as go
-import plotly.io as pio
-from pathlib import Path
 from collections import Counter
+from datetime import date
 
 # Adiciona raiz do projeto ao sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 
-from Oraculo.Lotofacil.models import beam_search
-from Oraculo.Lotofacil.models import mutation
-from Oraculo.Lotofacil.models import markov
-from Oraculo.Lotofacil.models import poisson
-
-def load_data(path='Oraculo/Lotofacil/data/Lotofacil.csv'):
-    df_raw = pd.read_csv(path)
-    df_raw = df_raw.sort_values(by='Concurso', ascending=False).reset_index(drop=True)
-    df = df_raw[[f'Bola{i}' for i in range(1, 16)]]
-    return df_raw, df
-
-def generate_heatmap(df):
-    all_numbers = df.values.flatten()
-    freq = pd.Series(all_numbers).value_counts(normalize=True).reindex(range(1, 26), fill_value=0)
-    freq_matrix = freq.values.reshape((5, 5), order='F')  # 5 colunas de 5 linhas (de cima para baixo)
-    labels_matrix = np.arange(1, 26).reshape((5, 5), order='F')
+from Oraculo.Lotofacil.draw_store import DrawStore, DATA_PATH, JOGO, codificar, sincronizar
+from Oraculo.Lotofacil import estatisticas
+from Oraculo.Lotofacil import ensemble
+from Oraculo import runner
+from Oraculo import banco
+from Oraculo import graficos
+from Oraculo import perfil
+
+# Cada processo do runner abre o mesmo dataset pelos sidecars mapeados em memória
+DADOS = ('Oraculo.Lotofacil.draw_store:DrawStore.carregar', (DATA_PATH,))
+PRED_PATH = "Oraculo/Lotofacil/predictions"
+HEATMAP_PATH = "Oraculo/Lotofacil/docs/heatmap.json"
+CORES = [[0, '#f7f0f7'], [0.5, '#ff66f5'], [1, '#8200a8']]
+
+def load_data(path=DATA_PATH):
+    return DrawStore.carregar(path)
+
+def tarefas_modelos(stats, freq_total):
+    return [
+        runner.tarefa('beam_search', 'Oraculo.Lotofacil.models.beam_search:beam_search', dados=DADOS, timeout=120, frequencia=freq_total),
+        runner.tarefa('mutation', 'Oraculo.Lotofacil.models.mutation:gerar_mutacoes', dados=DADOS, timeout=120, frequencia=freq_total),
+        # Ilhas em série dentro do worker (sem pool aninhado), semeadas pela semente do modelo
+        runner.tarefa('genetico', 'Oraculo.Lotofacil.models.mutation:gerar_geneticos', dados=DADOS, timeout=300,
+                      passar_semente=True, frequencia=freq_total, processos=1),
+        runner.tarefa('exaustivo', 'Oraculo.Lotofacil.models.exaustivo:gerar_palpites', dados=DADOS, timeout=300, frequencia=freq_total),
+        # Mesma busca exata, somando a afinidade entre pares de dezenas (forma quadrática)
+        runner.tarefa('coocorrencia', 'Oraculo.Lotofacil.models.exaustivo:gerar_palpites', dados=DADOS, timeout=300,
+                      frequencia=freq_total, pares=stats['pares']),
+        runner.tarefa('markov', 'Oraculo.Lotofacil.models.markov:gerar_palpite', dados=DADOS, timeout=60, transicoes=stats['transicoes']),
+        runner.tarefa('poisson', 'Oraculo.Lotofacil.models.poisson:gerar_combinacao_poisson', dados=DADOS, timeout=60, frequencia=freq_total),
+    ]
+
+def top_dezenas(freq, n=15):
+    return sorted(int(d) + 1 for d in np.argsort(-freq, kind='stable')[:n])
 
-    heatmap_fig = go.Figure(data=go.Heatmap(
-        z=freq_matrix,
+def generate_heatmap(contagem):
+    freq = contagem / max(contagem.sum(), 1)
+    freq_matrix = freq.reshape((5, 5), order='F')  # 5 colunas de 5 linhas (de cima para baixo)
+    labels_matrix = np.arange(1, 26).reshape((5, 5), order='F')
+    return graficos.heatmap(
+        freq_matrix,
         x=["Coluna 1", "Coluna 2", "Coluna 3", "Coluna 4", "Coluna 5"],
         y=["Dezena 1", "Dezena 2", "Dezena 3", "Dezena 4", "Dezena 5"],
-        colorscale=[[0, '#f7f0f7'], [0.5, '#ff66f5'], [1, '#8200a8']],
-        text=labels_matrix,
-        texttemplate="%{text}",
-        hoverinfo="text+z",
-        showscale=True
-    ))
-    heatmap_fig.update_layout(
-        title="Heatmap de Frequência das Dezenas (1 a 25)",
-        xaxis_title="Colunas",
-        yaxis_title="Dezenas",
-        height=500
+        titulo="Heatmap de Frequência das Dezenas (1 a 25)",
+        cores=CORES,
+        texto=labels_matrix,
     )
-    return pio.to_html(heatmap_fig, include_plotlyjs='cdn', full_html=False)
-
-def save_predictions(predictions, path_prefix):
-    os.makedirs(os.path.dirname(path_prefix), exist_ok=True)
-    # Save JSON
-    def convert(o):
-        if isinstance(o, (np.integer, np.int64)): return int(o)
-        if isinstance(o, (np.floating, np.float64)): return float(o)
-        if isinstance(o, np.ndarray): return o.tolist()
-        if isinstance(o, list): return [convert(i) for i in o]
-        return o
-
-    with open(path_prefix + ".json", 'w', encoding='utf-8') as f:
-        json.dump(predictions, f, ensure_ascii=False, indent=2, default=convert)
-    # Save CSV
-    rows = []
-    for p in predictions:
-        jogo = p['jogo']
-        if isinstance(jogo[0], list):  # Ex: mutações múltiplas
-            for j in jogo:
-                row = {f"Bola{i+1}": int(n) for i, n in enumerate(j)}
-                row["modelo"] = p['modelo']
-                rows.append(row)
-        else:
-            row = {f"Bola{i+1}": int(n) for i, n in enumerate(jogo)}
-            row["modelo"] = p['modelo']
-            rows.append(row)
-
-    df = pd.DataFrame(rows)
-    df.to_csv(path_prefix + ".csv", index=False)
 
-if __name__ == '__main__':
+def generate_cooccurrence(store):
+    # Fração dos sorteios em que cada par de dezenas saiu junto
+    pares = store.coocorrencia() / max(len(store), 1)
+    dezenas = np.arange(1, 26)
+    return graficos.heatmap(pares, x=dezenas, y=dezenas, titulo="Coocorrência de Pares de Dezenas", cores=CORES)
+
+@perfil.medido('salvar')
+def save_predictions(predictions, data, concurso=None, pasta=PRED_PATH):
+    # Palpites (e os concursos novos do CSV) vão para o banco SQLite do jogo
+    con = banco.abrir(JOGO, pasta, codificar)
+    try:
+        sincronizar(con)
+        banco.salvar_palpites(con, JOGO, data, predictions, codificar, concurso)
+    finally:
+        con.close()
+
+@perfil.medido()
+def carregar():
     print("\n📊 Carregando dados históricos...")
-    df_raw, df = load_data()
-    print(f"Total de concursos: {len(df)} | Último concurso: {df_raw['Concurso'].iloc[0]}")
+    store = load_data()
+    print(f"Total de concursos: {len(store)} | Último concurso: {store.ultimo_concurso}")
+    return store
 
-    print("\n📈 Calculando estatísticas...")
+def predict(store=None):
+    """
+    Etapa de previsão: roda os modelos, combina o Palpite da Rodada e grava
+    os palpites no banco.
+    """
+    store = carregar() if store is None else store
 
-    # Modelos
-    beam = beam_search.beam_search(df)
-    mut = mutation.gerar_mutacoes(df)
-    markov_pred = markov.gerar_palpite(df)
-    poisson_pred = poisson.gerar_combinacao_poisson(df)
-
-    # Frequência (curto, médio, longo)
-    short_freq = df.tail(5).values.flatten()
-    mid_freq = df.tail(75).values.flatten()
-    full_freq = df.values.flatten()
-
-    def top_dezenas(data):
-        c = Counter(data)
-        return sorted([int(n) for n, _ in c.most_common(15)])
-
-    freq_short = top_dezenas(short_freq)
-    freq_mid = top_dezenas(mid_freq)
-    freq_long = top_dezenas(full_freq)
-
-    # Palpite da Rodada baseado nas dezenas mais frequentes entre todos os palpites
-    all_jogos = []
-    for jogo in [beam, markov_pred, poisson_pred, freq_short, freq_mid, freq_long]:
-        if isinstance(jogo, list) and all(isinstance(n, int) for n in jogo):
-            all_jogos.append(jogo)
-    if isinstance(mut, list):
-        for jogo in mut:
-            if isinstance(jogo, list) and all(isinstance(n, int) for n in jogo):
-                all_jogos.append(jogo)
-
-    # Gerar palpite da rodada com base nas dezenas mais comuns por posição
-    dez_por_posicao = [Counter([jogo[i] for jogo in all_jogos if len(jogo) > i and isinstance(jogo[i], int)]).most_common(1)[0][0] for i in range(15)]
-    palpite_rodada = sorted(dez_por_posicao)
+    print("\n📈 Calculando estatísticas...")
+    with perfil.etapa('estatisticas'):
+        stats = estatisticas.atualizar(store)
+        freq_total = stats['frequencia']
+
+    # Modelos (independentes: um processo por modelo, semente via ORACULO_SEED)
+    print("\n🧠 Executando modelos...")
+    with perfil.etapa('modelos'):
+        saidas = runner.executar_modelos(tarefas_modelos(stats, freq_total), seed=runner.semente_ambiente())
+    palpites = runner.resultados(saidas)
+    beam = palpites.get('beam_search')
+    mut = palpites.get('mutation')
+    genetico = palpites.get('genetico')
+    markov_pred = palpites.get('markov')
+    poisson_pred = palpites.get('poisson')
+    exato = palpites.get('exaustivo')
+    cooc = palpites.get('coocorrencia')
+
+    # Frequência (curto, médio, longo) sobre os concursos mais recentes
+    freq_short = top_dezenas(estatisticas.janela(store, 5))
+    freq_mid = top_dezenas(estatisticas.janela(store, 75))
+    freq_long = top_dezenas(freq_total)
+
+    # Palpite da Rodada: consenso por posição entre os palpites; com
+    # ORACULO_REPLICAS=N (opcional, ex. ensemble.REPLICAS), probabilidades de
+    # seleção do ensemble Monte Carlo. Os dois caminhos usam os mesmos modelos
+    # (os do consenso original): mutation e markov (amostrados no ensemble),
+    # beam_search, poisson e as frequências; exaustivo, coocorrencia e
+    # genetico são publicados, mas não entram no Palpite da Rodada.
+    fixos = [beam, poisson_pred, freq_short, freq_mid, freq_long]
+    with perfil.etapa('consenso'):
+        replicas = int(os.environ.get('ORACULO_REPLICAS', 0))
+        probs_rodada = None
+        if replicas:
+            print(f"\n🎲 Ensemble Monte Carlo ({replicas} réplicas por modelo)...")
+            deterministicos = [j for j in fixos if j]
+            palpite_rodada, probs_rodada, _ = ensemble.executar(stats, freq_total, replicas, seed=runner.semente_ambiente(), jogos=deterministicos)
+        else:
+            # Palpite da Rodada baseado nas dezenas mais frequentes entre todos os palpites
+            all_jogos = []
+            for jogo in [beam, markov_pred, poisson_pred, freq_short, freq_mid, freq_long]:
+                if isinstance(jogo, list) and all(isinstance(n, int) for n in jogo):
+                    all_jogos.append(jogo)
+            for jogo in mut or []:
+                if isinstance(jogo, list) and all(isinstance(n, int) for n in jogo):
+                    all_jogos.append(jogo)
+
+            # Gerar palpite da rodada com base nas dezenas mais comuns por posição
+            dez_por_posicao = [Counter([jogo[i] for jogo in all_jogos if len(jogo) > i and isinstance(jogo[i], int)]).most_common(1)[0][0] for i in range(15)]
+            palpite_rodada = sorted(dez_por_posicao)
 
     print("\n🎯 Palpites gerados:")
-    print(f"Beam: {beam}\nMutation: {mut}\nMarkov: {markov_pred}\nPoisson: {poisson_pred}")
+    print(f"Beam: {beam}\nMutation: {mut}\nGenético: {genetico}\nMarkov: {markov_pred}\nPoisson: {poisson_pred}\nExaustivo: {exato}\nCoocorrência: {cooc}")
     print(f"Frequência Curto: {freq_short}\nMédio: {freq_mid}\nLongo: {freq_long}")
     print(f"Palpite da Rodada: {palpite_rodada}")
 
     # Salvamento
     print("\n💾 Salvando previsões...")
-    today = pd.Timestamp.today().strftime("%Y-%m-%d")
+    today = date.today().isoformat()
 
     predictions = [
         {"modelo": "beam_search", "jogo": beam},
         {"modelo": "mutation", "jogo": mut},
+        {"modelo": "genetico", "jogo": genetico},
+        {"modelo": "exaustivo", "jogo": exato},
+        {"modelo": "coocorrencia", "jogo": cooc},
         {"modelo": "markov", "jogo": markov_pred},
         {"modelo": "poisson", "jogo": poisson_pred},
         {"modelo": "frequencia_curto", "jogo": freq_short},
@@ -135,10 +158,25 @@ if __name__ == '__main__':
         {"modelo": "frequencia_longo", "jogo": freq_long},
         {"modelo": "palpite_rodada", "jogo": palpite_rodada},
     ]
-    save_predictions(predictions, f"Oraculo/Lotofacil/predictions/prediction_{today}")
-
-    # Heatmap
-    heatmap_html = generate_heatmap(df)
-    Path(f"Oraculo/Lotofacil/docs/heatmap.html").write_text(heatmap_html, encoding="utf-8")
+    if probs_rodada is not None:
+        predictions[-1]["probabilidades"] = np.round(probs_rodada, 4).tolist()
+    # Modelos que falharam ou estouraram o tempo ficam de fora
+    predictions = [p for p in predictions if p["jogo"]]
+    save_predictions(predictions, today, concurso=int(store.ultimo_concurso) + 1)
+    print("\n✅ Previsões salvas com sucesso.")
+
+@perfil.medido()
+def heatmap(store=None):
+    # Heatmaps (dados em JSON, desenhados por static/heatmap.js na página)
+    store = carregar() if store is None else store
+    graficos.salvar_heatmaps(HEATMAP_PATH, [generate_heatmap(store.frequencia()), generate_cooccurrence(store)])
+    print(f"\n🗺️ Heatmaps salvos em {HEATMAP_PATH}")
+
+def main(gerar_heatmap=True):
+    store = carregar()
+    predict(store)
+    if gerar_heatmap:
+        heatmap(store)
 
-    print("\n✅ Arquivos salvos com sucesso.")
+if __name__ == '__main__':
+    main()
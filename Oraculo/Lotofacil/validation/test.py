@@ -0,0 +1,321 @@
+# test.py (microbenchmarks de desempenho dos modelos e carregadores, em históricos reais e sintéticos)
+#
+#   python -m Oraculo.Lotofacil.validation.test                     # mede e imprime a tabela
+#   python -m Oraculo.Lotofacil.validation.test --salvar            # grava a referência da máquina
+#   python -m Oraculo.Lotofacil.validation.test --comparar          # falha (código 1) em regressão
+#   python -m Oraculo.Lotofacil.validation.test --escalas 1 10 --casos beam_search markov
+#   pytest Oraculo/Lotofacil/validation/test.py                     # escala 1 contra a referência (pulado sem ela)
+#
+# A escala 1 é o histórico real dos CSVs; as escalas 10, 100 e 1000 são
+# históricos sintéticos com esse múltiplo de concursos, reamostrados dos
+# sorteios reais. Cada caso prepara os argumentos fora da medição e reporta o
+# menor tempo entre as repetições.
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from Oraculo.dataset import carregar_sorteios, salvar_atomico
+from Oraculo.jogos import LOTOFACIL, SUPERSETE
+from Oraculo.Lotofacil.draw_store import DrawStore, codificar
+from Oraculo.Lotofacil.models import beam_search, markov, mutation, poisson
+from Oraculo.SuperSete.models import evolutionary, frequency
+from Oraculo.SuperSete.models import markov as markov_supersete
+
+REFERENCIA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'microbenchmarks.json')
+ESCALAS = (1, 10, 100, 1000)
+REPETICOES = 5
+ORCAMENTO = 2.0    # segundos por caso e escala: para de repetir ao passar disso
+TOLERANCIA = 0.25  # regressão: mais de 25% acima da referência...
+PISO = 0.005       # ...e pelo menos 5 ms mais lento (abaixo disso é ruído)
+SEMENTE = 0
+
+
+# === HISTÓRICOS ===
+def _datas_texto(datas):
+    # datetime64[D] -> 'dd/mm/aaaa', o formato dos CSVs
+    return np.array([f'{d[8:10]}/{d[5:7]}/{d[:4]}' for d in np.datetime_as_string(datas, unit='D')])
+
+
+def historico(jogo, escala, rng):
+    """
+    Histórico de `escala` vezes o tamanho do real: escala 1 devolve os dados
+    do CSV; as demais reamostram sorteios reais (com reposição) e renumeram os concursos.
+    """
+    dados = jogo.carregar()
+    if escala == 1:
+        return {'concurso': np.asarray(dados['concurso']), 'data': np.asarray(dados['data']),
+                'matriz': np.asarray(dados['matriz'])}
+    n = len(dados['concurso']) * escala
+    idx = np.sort(rng.integers(0, len(dados['concurso']), size=n))
+    return {'concurso': np.arange(1, n + 1, dtype=np.int32), 'data': np.asarray(dados['data'])[idx],
+            'matriz': np.asarray(dados['matriz'])[idx]}
+
+
+def escrever_csv(jogo, dados, pasta):
+    """
+    CSV no layout do jogo (só as colunas lidas pelo carregador) em `pasta`.
+    """
+    import pandas as pd
+    path = os.path.join(pasta, f'{jogo.nome}.csv')
+    df = pd.DataFrame(dados['matriz'], columns=jogo.colunas)
+    df.insert(0, 'Data Sorteio', _datas_texto(dados['data']))
+    df.insert(0, 'Concurso', dados['concurso'])
+    df.to_csv(path, index=False)
+    return path
+
+
+class Cenario:
+    """
+    Históricos de uma escala, já codificados para os modelos, e os CSVs
+    sintéticos para os carregadores (gravados sob demanda em uma pasta temporária).
+    """
+
+    def __init__(self, escala, seed=SEMENTE):
+        rng = np.random.default_rng([seed, escala])
+        self.escala = escala
+        self.lotofacil = historico(LOTOFACIL, escala, rng)
+        self.supersete = historico(SUPERSETE, escala, rng)
+        self.mascaras = codificar(self.lotofacil['matriz'])
+        self._pasta = None
+        self._csvs = {}
+
+    def store(self):
+        # Store novo a cada repetição: a matriz de bits é cacheada no objeto
+        return DrawStore(self.mascaras, self.lotofacil['concurso'], self.lotofacil['data'])
+
+    def frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.supersete['matriz'], columns=SUPERSETE.colunas)
+
+    def pasta(self):
+        if self._pasta is None:
+            self._pasta = tempfile.mkdtemp(prefix=f'oraculo_bench_{self.escala}x_')
+        return self._pasta
+
+    def csv(self, jogo):
+        if jogo.nome not in self._csvs:
+            if self.escala == 1:
+                self._csvs[jogo.nome] = jogo.data_path
+            else:
+                dados = self.lotofacil if jogo is LOTOFACIL else self.supersete
+                self._csvs[jogo.nome] = escrever_csv(jogo, dados, self.pasta())
+        return self._csvs[jogo.nome]
+
+    def copia_csv(self, jogo):
+        # Cópia sem sidecars em pasta própria: força a leitura completa do CSV
+        pasta = tempfile.mkdtemp(prefix='frio_', dir=self.pasta())
+        destino = os.path.join(pasta, os.path.basename(self.csv(jogo)))
+        shutil.copyfile(self.csv(jogo), destino)
+        return destino
+
+    def limpar(self):
+        if self._pasta:
+            shutil.rmtree(self._pasta, ignore_errors=True)
+
+
+# === CASOS ===
+# Cada caso recebe o cenário e devolve a chamada a medir (sem argumentos): o
+# que acontece antes do `return` é preparação e fica fora do tempo.
+
+def _carregar_frio(jogo):
+    def caso(cenario):
+        path = cenario.copia_csv(jogo)
+        return lambda: carregar_sorteios(path, jogo.colunas)
+    return caso
+
+
+def _carregar_cache(jogo):
+    def caso(cenario):
+        path = cenario.csv(jogo)
+        carregar_sorteios(path, jogo.colunas)  # garante os sidecars
+        return lambda: carregar_sorteios(path, jogo.colunas)
+    return caso
+
+
+def _beam_search(cenario):
+    store = cenario.store()
+    return lambda: beam_search.beam_search(store, seed=SEMENTE)
+
+
+def _gerar_mutacoes(cenario):
+    store = cenario.store()
+    return lambda: mutation.gerar_mutacoes(store, seed=SEMENTE)
+
+
+def _markov(cenario):
+    store = cenario.store()
+    return lambda: markov.gerar_palpite(store, seed=SEMENTE)
+
+
+def _poisson(cenario):
+    store = cenario.store()
+    return lambda: poisson.gerar_combinacao_poisson(store)
+
+
+def _evolve_population(cenario):
+    freqs = frequency.counts_to_dict(SUPERSETE.contagem(cenario.supersete['matriz']), SUPERSETE.colunas)
+    populacao = np.random.default_rng(SEMENTE).integers(0, 10, size=(50, 7)).tolist()
+    return lambda: evolutionary.evolve_population(populacao, freqs)
+
+
+def _build_transition_matrix(cenario):
+    df = cenario.frame()
+    return lambda: markov_supersete.build_transition_matrix(df)
+
+
+CASOS = {
+    'beam_search': _beam_search,
+    'gerar_mutacoes': _gerar_mutacoes,
+    'markov.gerar_palpite': _markov,
+    'gerar_combinacao_poisson': _poisson,
+    'evolve_population': _evolve_population,
+    'build_transition_matrix': _build_transition_matrix,
+    'carregar_lotofacil_csv': _carregar_frio(LOTOFACIL),
+    'carregar_lotofacil_cache': _carregar_cache(LOTOFACIL),
+    'carregar_supersete_csv': _carregar_frio(SUPERSETE),
+    'carregar_supersete_cache': _carregar_cache(SUPERSETE),
+}
+
+
+# === MEDIÇÃO ===
+def medir(caso, cenario, repeticoes=REPETICOES, orcamento=ORCAMENTO):
+    """
+    Menor tempo (s) de até `repeticoes` execuções do caso; para antes quando
+    o tempo acumulado passa do `orcamento` (sempre roda ao menos uma vez).
+    """
+    tempos = []
+    while len(tempos) < repeticoes and (not tempos or sum(tempos) < orcamento):
+        chamada = caso(cenario)
+        inicio = time.perf_counter()
+        chamada()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), len(tempos)
+
+
+def executar(escalas=ESCALAS, casos=None, repeticoes=REPETICOES, orcamento=ORCAMENTO):
+    """
+    Mede os casos em cada escala: {caso: {escala: segundos}}.
+    """
+    nomes = list(casos or CASOS)
+    resultados = {nome: {} for nome in nomes}
+    for escala in escalas:
+        print(f"\n⏱️ Escala {escala}x")
+        cenario = Cenario(escala)
+        try:
+            print(f"   {len(cenario.mascaras)} concursos (Lotofácil), {len(cenario.supersete['matriz'])} (Super Sete)")
+            for nome in nomes:
+                segundos, n = medir(CASOS[nome], cenario, repeticoes, orcamento)
+                resultados[nome][str(escala)] = round(segundos, 6)
+                print(f"   {nome:<26} {segundos * 1000:>12.3f} ms  ({n}x)")
+        finally:
+            cenario.limpar()
+    return resultados
+
+
+# === REFERÊNCIA E COMPARAÇÃO ===
+def ambiente():
+    return {'python': platform.python_version(), 'numpy': np.__version__,
+            'maquina': platform.machine(), 'cpus': os.cpu_count()}
+
+
+def carregar_referencia(path=REFERENCIA):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def salvar_referencia(resultados, path=REFERENCIA):
+    """
+    Grava os tempos como referência, preservando os casos e escalas que não foram medidos agora.
+    """
+    referencia = carregar_referencia(path) or {'resultados': {}}
+    for nome, tempos in resultados.items():
+        referencia['resultados'].setdefault(nome, {}).update(tempos)
+    referencia['ambiente'] = ambiente()
+
+    def escrever(tmp):
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(referencia, f, ensure_ascii=False, indent=2, sort_keys=True)
+    salvar_atomico(path, escrever)
+    return path
+
+
+def comparar(resultados, referencia, tolerancia=TOLERANCIA, piso=PISO):
+    """
+    Regressões em relação à referência: [(caso, escala, referência, atual)]
+    para os tempos acima de referência x (1 + tolerancia) e de referência + piso.
+    Casos ou escalas sem referência são ignorados.
+    """
+    regressoes = []
+    base = (referencia or {}).get('resultados', {})
+    for nome, tempos in resultados.items():
+        for escala, atual in tempos.items():
+            ref = base.get(nome, {}).get(escala)
+            if ref is not None and atual > ref * (1 + tolerancia) and atual - ref > piso:
+                regressoes.append((nome, escala, ref, atual))
+    return regressoes
+
+
+def relatar(regressoes):
+    for nome, escala, ref, atual in regressoes:
+        print(f"❌ {nome} ({escala}x): {ref * 1000:.3f} ms -> {atual * 1000:.3f} ms (+{(atual / ref - 1) * 100:.0f}%)")
+
+
+# === PYTEST ===
+def test_sem_regressao_escala_real():
+    # Os tempos dependem da máquina: a referência não é versionada, cada
+    # máquina grava a sua com --salvar
+    import pytest
+
+    referencia = carregar_referencia()
+    if referencia is None:
+        pytest.skip(f"sem referência em {REFERENCIA}; grave uma com --salvar")
+    resultados = executar(escalas=(1,), repeticoes=3, orcamento=1.0)
+    regressoes = comparar(resultados, referencia)
+    relatar(regressoes)
+    assert not regressoes
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Microbenchmarks de desempenho dos modelos e carregadores")
+    p.add_argument("--escalas", type=int, nargs="+", default=list(ESCALAS), help="múltiplos do histórico real (1 = CSVs)")
+    p.add_argument("--casos", nargs="+", choices=list(CASOS), help="casos a medir (padrão: todos)")
+    p.add_argument("--repeticoes", type=int, default=REPETICOES)
+    p.add_argument("--orcamento", type=float, default=ORCAMENTO, help="segundos por caso e escala")
+    p.add_argument("--referencia", default=REFERENCIA, help="arquivo JSON de referência")
+    p.add_argument("--salvar", action="store_true", help="grava os tempos medidos como referência")
+    p.add_argument("--comparar", action="store_true", help="falha se algum tempo regrediu em relação à referência")
+    p.add_argument("--tolerancia", type=float, default=TOLERANCIA, help="fração acima da referência tolerada")
+    args = p.parse_args(argv)
+
+    resultados = executar(args.escalas, args.casos, args.repeticoes, args.orcamento)
+
+    if args.comparar:
+        referencia = carregar_referencia(args.referencia)
+        if referencia is None:
+            print(f"\n⚠️ Sem referência em {args.referencia}; rode com --salvar antes.")
+            return 1
+        regressoes = comparar(resultados, referencia, args.tolerancia)
+        relatar(regressoes)
+        if regressoes:
+            return 1
+        print("\n✅ Nenhuma regressão em relação à referência.")
+    if args.salvar:
+        print(f"\n💾 Referência salva em {salvar_referencia(resultados, args.referencia)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""
+Atalho para `python -m Oraculo supersete <etapa>` (Super Sete): veja Oraculo/__main__.py.
+"""
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from Oraculo.__main__ import main
+
+if __name__ == '__main__':
+    main(['supersete'] + sys.argv[1:])
@@ -0,0 +1,36 @@
+from Oraculo.dataset import carregar_sorteios
+from Oraculo.jogos import SUPERSETE
+
+GAME = SUPERSETE.nome
+DATA_PATH = SUPERSETE.data_path
+
+
+def load_frame(path, columns):
+    """
+    Histórico como DataFrame (uma coluna por posição) sobre a matriz mapeada
+    dos sidecars, para modelos executados em outros processos.
+    """
+    import pandas as pd
+    return pd.DataFrame(carregar_sorteios(path, columns)["matriz"], columns=columns)
+
+
+def encode_tickets(tickets):
+    """
+    Empacota bilhetes (n, 7) de dígitos em inteiros (coluna 1 mais significativa).
+    """
+    return SUPERSETE.codificar(tickets)
+
+
+def decode_tickets(codes):
+    """
+    Inverso de `encode_tickets`: matriz (n, 7) de dígitos.
+    """
+    return SUPERSETE.decodificar(codes)
+
+
+def sync(con, path=DATA_PATH):
+    """
+    Leva para o banco os concursos e faixas de prêmio novos do CSV.
+    """
+    return SUPERSETE.sincronizar(con, path)
+
@@ -0,0 +1,46 @@
+import numpy as np
+
+from Oraculo import ensemble
+from Oraculo.SuperSete.models import evolutionary
+from Oraculo.SuperSete.statistics import one_hot
+
+# Réplicas por modelo quando o ensemble é ativado (ORACULO_REPLICAS no predict)
+REPLICAS = 2000
+
+
+def sample_evolution(weights, n, rng, population_size=50, generations=30):
+    """
+    Melhor jogo de cada uma das `n` evoluções independentes: matriz (n, 7).
+    """
+    return evolutionary.evolve(weights, population_size, generations, rng=rng, replicas=n, top=1)[:, 0]
+
+
+def models(freqs, replicas=REPLICAS):
+    return {
+        "evolutivo": ensemble.modelo(sample_evolution, evolutionary.weight_matrix(freqs), replicas=replicas),
+    }
+
+
+def column_probabilities(samples):
+    """
+    Probabilidade de seleção de cada dígito por coluna (7 x 10), por modelo.
+    """
+    return {name: one_hot(s).mean(axis=0) for name, s in samples.items()}
+
+
+def consensus(probabilities, guesses=()):
+    """
+    Média das probabilidades dos modelos estocásticos com os palpites dos
+    determinísticos (cada modelo pesa igual); o consenso é o dígito mais
+    provável de cada coluna.
+    """
+    rows = list(probabilities.values()) + [one_hot(np.atleast_2d(g)).mean(axis=0) for g in guesses]
+    mean = np.mean(rows, axis=0)
+    return [int(d) for d in mean.argmax(axis=1)], mean
+
+
+def run(freqs, replicas=REPLICAS, seed=None, workers=None, guesses=()):
+    samples = ensemble.amostrar(models(freqs, replicas), seed=seed, processos=workers)
+    probabilities = column_probabilities(samples)
+    guess, mean = consensus(probabilities, guesses)
+    return guess, mean, probabilities
@@ -14,18 +14,27 @@ def initialize_priors():
 
 
 def update_posteriors(priors, evidence: pd.DataFrame):
+    # Count occurrences from evidence
+    counts = [evidence.iloc[:, idx].value_counts().to_dict() for idx in range(COLS)]
+    return posteriors_from_counts(priors, counts)
+
+
+def posteriors_from_counts(priors, counts):
+    """
+    Igual a `update_posteriors`, mas recebe as contagens por coluna já prontas
+    (ex.: uma janela do índice de prefixos, matriz 7 x 10).
+    """
     posteriors = defaultdict(lambda: defaultdict(float))
 
-    # Count occurrences from evidence
     for idx in range(COLS):
         col_key = f"Coluna{idx+1}"
-        col_data = evidence.iloc[:, idx]
-        counts = col_data.value_counts().to_dict()
-        total = sum(counts.values())
+        col_counts = counts[idx]
+        if not isinstance(col_counts, dict):
+            col_counts = {d: int(col_counts[d]) for d in DIGITS}
 
         # Add evidence to priors
         for digit in DIGITS:
-            posteriors[col_key][digit] = priors[col_key][digit] + counts.get(digit, 0)
+            posteriors[col_key][digit] = priors[col_key][digit] + col_counts.get(digit, 0)
 
         # Normalize
         col_total = sum(posteriors[col_key].values())
@@ -43,6 +52,13 @@ def get_top_candidates(posteriors: dict, top_n: int = 3):
     return top_digits
 
 
+def top_candidates_from_counts(counts, top_n: int = 3):
+    """
+    Top dígitos por coluna a partir de priors uniformes e das contagens por coluna.
+    """
+    return get_top_candidates(posteriors_from_counts(initialize_priors(), counts), top_n=top_n)
+
+
 if __name__ == '__main__':
     # Simulação simples
     data = pd.DataFrame({f"Coluna{i+1}": [0,1,2,3,4,5,6,7,8,9] for i in range(COLS)})
@@ -1,65 +1,94 @@
-import random
-import copy
+import os
+import sys
+import numpy as np
 from typing import List, Dict
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 
-DIGITS = list(range(10))  # 0 a 9
-COLS = 7  # Super Sete possui 7 colunas
-
-
-def initialize_population(size: int) -> List[List[int]]:
-    return [[random.choice(DIGITS) for _ in range(COLS)] for _ in range(size)]
-
-
-def evaluate_fitness(jogo: List[int], freq_data: Dict[str, Dict[int, float]]) -> float:
-    score = 0.0
-    for idx, digit in enumerate(jogo):
-        col_key = f"Coluna{idx+1}"
-        score += freq_data.get(col_key, {}).get(digit, 0)
-    return score
+from Oraculo.ensemble import gerador
 
 
-def mutate(jogo: List[int], mutation_rate: float = 0.1) -> List[int]:
-    mutated = jogo.copy()
-    for i in range(COLS):
-        if random.random() < mutation_rate:
-            mutated[i] = random.choice(DIGITS)
-    return mutated
-
+DIGITS = list(range(10))  # 0 a 9
+COLS = 7  # Super Sete possui 7 colunas
 
-def crossover(parent1: List[int], parent2: List[int]) -> List[int]:
-    cut = random.randint(1, COLS - 2)
-    return parent1[:cut] + parent2[cut:]
+_COL_IDX = np.arange(COLS)
+
+
+def weight_matrix(freq_data) -> np.ndarray:
+    """
+    Pesos (7 x 10) por coluna e dígito. Aceita o dicionário de frequências
+    (colunas na ordem do sorteio, como em `frequency.counts_to_dict`) ou uma
+    matriz já pronta.
+    """
+    if isinstance(freq_data, dict):
+        weights = np.zeros((COLS, len(DIGITS)))
+        for idx, counts in enumerate(freq_data.values()):
+            for digit, value in counts.items():
+                weights[idx, int(digit)] = value
+        return weights
+    return np.asarray(freq_data, dtype=np.float64)
+
+
+def fitness(population: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Fitness de cada jogo de `population` (..., 7): um gather na matriz de pesos.
+    """
+    return weights[_COL_IDX, population].sum(axis=-1)
+
+
+def evolve(weights, population_size: int = 50, generations: int = 50, rng=None, population=None,
+           replicas: int = None, elite_fraction: float = 0.2, mutation_rate: float = 0.1, top: int = 5) -> np.ndarray:
+    """
+    Mesmo algoritmo de `evolve_population` sobre arrays: a população é uma
+    matriz (pop_size, 7) uint8 e seleção da elite, cruzamento de um ponto e
+    mutação são feitos para a geração inteira de uma vez. Com `replicas`,
+    evolui esse número de populações independentes em paralelo e devolve
+    (replicas, top, 7); sem, devolve (top, 7).
+    """
+    rng = gerador(rng)
+    if population is None:
+        population = rng.integers(0, len(DIGITS), size=(replicas or 1, population_size, COLS), dtype=np.uint8)
+    else:
+        population = np.asarray(population, dtype=np.uint8).reshape(-1, len(population), COLS)
+    batch, size = population.shape[:2]
+    elite = min(max(2, int(elite_fraction * size)), size)
+    children = size - elite
+
+    for _ in range(generations):
+        order = np.argsort(-fitness(population, weights), axis=1, kind='stable')
+        parents = np.take_along_axis(population, order[:, :elite, None], axis=1)
+        # Dois pais distintos da elite para cada filho
+        first = rng.integers(0, elite, size=(batch, children, 1))
+        second = (first + rng.integers(1, elite, size=(batch, children, 1))) % elite
+        cut = rng.integers(1, COLS - 1, size=(batch, children, 1))
+        child = np.where(_COL_IDX < cut,
+                         np.take_along_axis(parents, first, axis=1),
+                         np.take_along_axis(parents, second, axis=1))
+        mutated = rng.random(child.shape) < mutation_rate
+        child[mutated] = rng.integers(0, len(DIGITS), size=int(mutated.sum()), dtype=np.uint8)
+        population = np.concatenate([parents, child], axis=1)
+
+    order = np.argsort(-fitness(population, weights), axis=1, kind='stable')[:, :top]
+    best = np.take_along_axis(population, order[..., None], axis=1)
+    return best if replicas else best[0]
 
 
 def evolve_population(population: List[List[int]], freq_data: Dict[str, Dict[int, float]], generations: int = 50) -> List[List[int]]:
-    pop_size = len(population)
-    elite_size = max(2, int(0.2 * pop_size))
-
-    for gen in range(generations):
-        population.sort(key=lambda x: evaluate_fitness(x, freq_data), reverse=True)
-        new_pop = population[:elite_size]
-
-        while len(new_pop) < pop_size:
-            parents = random.sample(population[:elite_size], 2)
-            child = crossover(parents[0], parents[1])
-            child = mutate(child, mutation_rate=0.1)
-            new_pop.append(child)
+    return evolve(weight_matrix(freq_data), population=population, generations=generations).tolist()  # Os 5 melhores jogos
 
-        population = new_pop
 
-    # Ordena por fitness final
-    population.sort(key=lambda x: evaluate_fitness(x, freq_data), reverse=True)
-    return population[:5]  # Retorna os 5 melhores jogos
+def run_evolution(freq_data: Dict[str, Dict[int, float]], population_size: int = 50, generations: int = 50, seed=None) -> List[List[int]]:
+    return evolve(weight_matrix(freq_data), population_size, generations, rng=seed).tolist()
 
 
 if __name__ == '__main__':
     # Exemplo de uso com dados fictícios de frequência
+    rng = np.random.default_rng()
     freq_data_example = {
-        f"Coluna{i+1}": {d: random.random() for d in DIGITS} for i in range(COLS)
+        f"Coluna {i+1}": {d: rng.random() for d in DIGITS} for i in range(COLS)
     }
 
-    pop = initialize_population(100)
+    pop = rng.integers(0, len(DIGITS), size=(100, COLS)).tolist()
     melhores = evolve_population(pop, freq_data_example, generations=20)
     print("Melhores jogos otimizados:")
     for jogo in melhores:
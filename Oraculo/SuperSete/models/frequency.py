@@ -1,8 +1,7 @@
-import pandas as pd
 from collections import defaultdict
 
 
-def calculate_frequency_by_column(df: pd.DataFrame) -> dict:
+def calculate_frequency_by_column(df) -> dict:
     """
     Calcula a frequência absoluta dos dígitos (0 a 9) em cada uma das 7 colunas do Super Sete.
     """
@@ -15,6 +14,16 @@ def calculate_frequency_by_column(df: pd.DataFrame) -> dict:
     return {col: dict(digs) for col, digs in freq_dict.items()}
 
 
+def counts_to_dict(counts, columns) -> dict:
+    """
+    Converte uma matriz de contagens (7 x 10) no formato de `calculate_frequency_by_column`.
+    """
+    return {
+        col: {int(d): int(row[d]) for d in range(len(row)) if row[d] > 0}
+        for col, row in zip(columns, counts)
+    }
+
+
 def normalize_frequency(freq_dict: dict) -> dict:
     """
     Converte a frequência absoluta em relativa (%), com 4 casas decimais por coluna.
@@ -33,6 +42,7 @@ def normalize_frequency(freq_dict: dict) -> dict:
 
 if __name__ == '__main__':
     # Exemplo de uso
+    import pandas as pd
     df = pd.DataFrame({
         'Coluna1': [1, 2, 2, 3, 1],
         'Coluna2': [0, 1, 0, 0, 9],
@@ -1,7 +1,14 @@
+import os
+import sys
+import numpy as np
 import pandas as pd
 from collections import defaultdict
 from typing import Dict
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from Oraculo.SuperSete import statistics
+
 
 def build_transition_matrix(df: pd.DataFrame) -> Dict[str, Dict[int, Dict[int, float]]]:
     """
@@ -37,20 +44,55 @@ def predict_next_digit(transitions: Dict[int, Dict[int, float]], last_digit: int
     return transitions.get(last_digit, {})
 
 
-def generate_predictions(df: pd.DataFrame) -> Dict[str, Dict[int, float]]:
+def next_digit_probabilities(counts_by_order, last_rows) -> np.ndarray:
     """
-    Para cada coluna, prevê o próximo dígito baseado no último valor da série e na matriz de transição.
+    Distribuição (7 x 10) do próximo dígito de cada coluna dado o final da
+    série (`last_rows`, k x 7): usa a maior ordem disponível cujo estado já
+    foi observado e recua para ordens menores quando não foi. Custo
+    constante em relação ao tamanho do histórico.
     """
-    transition_matrix = build_transition_matrix(df)
-    predictions = {}
-
-    last_row = df.tail(1).astype(int)
-    for col in df.columns:
-        last_digit = int(last_row[col].values[0])
-        prediction = predict_next_digit(transition_matrix[col], last_digit)
-        predictions[col] = prediction
-
-    return predictions
+    last_rows = np.asarray(last_rows, dtype=np.int64)
+    cols = np.arange(last_rows.shape[1])
+    probs = np.zeros((last_rows.shape[1], 10))
+    pending = np.ones(len(cols), dtype=bool)
+    for order in sorted(counts_by_order, reverse=True):
+        if order > len(last_rows):
+            continue
+        state = np.zeros(len(cols), dtype=np.int64)
+        for row in last_rows[-order:]:
+            state = state * 10 + row
+        counts = np.asarray(counts_by_order[order])[cols, state]
+        totals = counts.sum(axis=1)
+        use = pending & (totals > 0)
+        probs[use] = counts[use] / totals[use, None]
+        pending &= ~use
+    return probs
+
+
+def generate_predictions(df: pd.DataFrame, transition_counts=None, order: int = 1, window: int = None) -> Dict[str, Dict[int, float]]:
+    """
+    Para cada coluna, prevê o próximo dígito a partir dos últimos `order`
+    valores da série (ordem 1 a 3, recuando de ordem para estados nunca vistos).
+    `transition_counts` são as contagens já acumuladas: {ordem: tensor
+    (7, 10^k, 10)} ou só o tensor de ordem 1 (7 x 10 x 10). Com `window`,
+    conta apenas as transições dos últimos `window` sorteios.
+    """
+    rows = df.to_numpy(dtype=np.int64)
+    orders = range(1, order + 1)
+    if window is not None:
+        counts = {k: statistics.window_transitions(rows, k, window) for k in orders}
+    elif transition_counts is None:
+        counts = {k: statistics.count_transitions(rows, k) for k in orders}
+    elif isinstance(transition_counts, dict):
+        counts = {k: transition_counts[k] for k in orders}
+    else:
+        counts = {1: transition_counts}
+
+    probs = next_digit_probabilities(counts, rows[-order:])
+    return {
+        col: {d: float(p) for d, p in enumerate(row) if p > 0}
+        for col, row in zip(df.columns, probs)
+    }
 
 
 if __name__ == '__main__':
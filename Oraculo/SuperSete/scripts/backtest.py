@@ -0,0 +1,176 @@
+# backtest.py (Super Sete: walk-forward — a cada concurso t, os modelos são ajustados só com os sorteios anteriores a t)
+
+import os
+import sys
+from collections import Counter
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from Oraculo.SuperSete import statistics
+from Oraculo.SuperSete.draws import DATA_PATH, GAME, encode_tickets
+from Oraculo.SuperSete.models import bayesian, evolutionary, frequency, markov, poisson
+from Oraculo.benchmark import gerar_summary
+from Oraculo.dataset import carregar_sorteios
+from Oraculo.jogos import SUPERSETE
+from Oraculo import banco, perfil
+from Oraculo.paralelo import mapear_blocos
+from Oraculo.runner import semente_modelo
+
+# Configs
+RESULT_CSV = f"{SUPERSETE.validacao}/backtest_results.csv"
+SUMMARY_MD = f"{SUPERSETE.validacao}/backtest_summary.md"
+CHART_IMG = f"{SUPERSETE.docs_path}/charts/backtest_summary.png"
+COLUNAS = SUPERSETE.colunas
+
+N_CONCURSOS = 3000
+BLOCO = 100  # concursos por tarefa do pool
+SEED = 0
+
+
+# Modelos: (contexto, semente) -> bilhete ou lista de bilhetes, com os mesmos
+# parâmetros do predict. O contexto de t só tem contagens dos sorteios [0, t).
+
+def top_digits(counts):
+    # Dígito mais frequente de cada coluna (empate: o menor, como no predict)
+    return np.asarray(counts).argmax(axis=1).tolist()
+
+
+def best_scores(scores):
+    return [max(col.items(), key=lambda x: x[1])[0] for col in scores.values()]
+
+
+def markov_guess(ctx, seed):
+    probs = markov.next_digit_probabilities({1: ctx["transitions"]}, ctx["last_row"])
+    return probs.argmax(axis=1).tolist()
+
+
+def bayes_guess(ctx, seed):
+    return [top[0] for top in bayesian.top_candidates_from_counts(ctx["bayes"], top_n=3).values()]
+
+
+def poisson_guess(ctx, seed):
+    return best_scores(poisson.column_poisson_scores(frequency.counts_to_dict(ctx["frequency"], COLUNAS)))
+
+
+def evolutionary_games(ctx, seed):
+    freqs = frequency.counts_to_dict(ctx["frequency"], COLUNAS)
+    return evolutionary.run_evolution(freqs, population_size=50, generations=30, seed=seed)
+
+
+def round_guess(games):
+    # Consenso coluna a coluna de todos os palpites, como o palpite_rodada sem ensemble
+    tickets = [game for name in MODELS for game in np.reshape(games[name], (-1, len(COLUNAS))).tolist()]
+    return [Counter([ticket[i] for ticket in tickets]).most_common(1)[0][0] for i in range(len(COLUNAS))]
+
+
+MODELS = {
+    "curto_prazo": lambda ctx, seed: top_digits(ctx["short"]),
+    "medio_prazo": lambda ctx, seed: top_digits(ctx["mid"]),
+    "longo_prazo": lambda ctx, seed: top_digits(ctx["frequency"]),
+    "bayesiano": bayes_guess,
+    "markov": markov_guess,
+    "poisson": poisson_guess,
+    "evolutivo": evolutionary_games,
+}
+# Combinação dos palpites dos MODELS em cada concurso
+ROUND = "palpite_rodada"
+
+
+_DATA = {}
+
+
+def load(path=DATA_PATH):
+    """
+    Histórico e índices de prefixo (frequências e transições por coluna), uma vez por processo.
+    """
+    if path not in _DATA:
+        dados = carregar_sorteios(path, COLUNAS)
+        _DATA[path] = (
+            dados,
+            statistics.index(dados["concurso"], dados["matriz"]),
+            statistics.transitions_index(dados["concurso"], dados["matriz"]),
+        )
+    return _DATA[path]
+
+
+def context(dados, index, transitions_index, t):
+    return {
+        "frequency": index.contagem(0, t),
+        "short": index.janela(5, fim=t),
+        "mid": index.janela(20, fim=t),
+        "bayes": index.janela(10, fim=t),
+        "transitions": transitions_index.contagem(0, t),
+        "last_row": dados["matriz"][t - 1:t],
+    }
+
+
+def seed_for(seed, model, concurso):
+    # Depende só do modelo e do concurso: o resultado não muda com o número de processos
+    return int(np.random.SeedSequence([semente_modelo(seed, model), int(concurso)]).generate_state(1)[0])
+
+
+def evaluate_block(positions, models, seed, path):
+    """
+    Linhas (posição, índice do modelo, acertos, acertos por coluna) de cada
+    bilhete de cada modelo em cada concurso do bloco.
+    """
+    dados, *indexes = load(path)
+    draws = encode_tickets(dados["matriz"])
+    rows = []
+    for t in positions:
+        ctx = context(dados, *indexes, t)
+        games = {name: fn(ctx, seed_for(seed, name, dados["concurso"][t])) for name, fn in MODELS.items()}
+        games[ROUND] = round_guess(games)
+        for i, name in enumerate(models):
+            codes = encode_tickets(np.reshape(games[name], (-1, len(COLUNAS))))
+            drawn = np.full(len(codes), draws[t])
+            rows.append(np.column_stack([
+                np.full(len(codes), t), np.full(len(codes), i),
+                SUPERSETE.acertos(codes, drawn), SUPERSETE.acertos_por_coluna(codes, drawn),
+            ]))
+    return np.concatenate(rows) if rows else np.empty((0, 4), dtype=np.int64)
+
+
+def backtest(n=N_CONCURSOS, models=None, seed=SEED, processes=None, block=BLOCO, path=DATA_PATH):
+    """
+    Walk-forward sobre os últimos `n` concursos: para cada concurso t, cada
+    modelo é ajustado com os sorteios anteriores e pontuado no sorteio t.
+    Mesmo formato de `benchmark.benchmark`.
+    """
+    models = list(models or [*MODELS, ROUND])
+    dados = load(path)[0]
+    total = len(dados["concurso"])
+    # A partir do terceiro sorteio: antes dele não há transição para o markov
+    positions = np.arange(max(2, total - n), total)
+    rows = mapear_blocos(evaluate_block, positions, block, processes, extra=(models, seed, path)).reshape(-1, 4)
+
+    t, i = rows[:, 0], rows[:, 1]
+    df = pd.DataFrame({
+        "modelo": np.array(models, dtype=object)[i],
+        "data_palpite": dados["data"][t - 1],
+        "data_concurso": dados["data"][t],
+        "acertos_totais": rows[:, 2],
+        "acertos_por_coluna": rows[:, 3],
+    }).sort_values(["data_concurso", "modelo"], kind="stable")
+
+    with closing(banco.conectar(banco.caminho(SUPERSETE.pred_path))) as con:
+        banco.salvar_benchmark(con, GAME, "backtest", df)
+    os.makedirs(os.path.dirname(RESULT_CSV), exist_ok=True)
+    df.to_csv(RESULT_CSV, index=False)
+    return df
+
+
+def main(grafico=True):
+    print(f"\n⏪ Executando backtest walk-forward ({N_CONCURSOS} concursos)...")
+    with perfil.etapa("backtest"):
+        df = backtest()
+    gerar_summary(df, SUMMARY_MD, CHART_IMG, grafico=grafico)
+    print("✅ Backtest concluído.")
+
+
+if __name__ == '__main__':
+    main()
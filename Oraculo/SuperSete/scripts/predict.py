@@ -1,144 +1,183 @@
 import os
 import sys
-import json
+import numpy as np
 from datetime import datetime
-import pandas as pd
-import plotly.graph_objects as go
 from collections import Counter
 
 # Adiciona raiz do projeto ao sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 
 from Oraculo.SuperSete.models import frequency
-from Oraculo.SuperSete.models import poisson
-from Oraculo.SuperSete.models import markov
-from Oraculo.SuperSete.models import bayesian
-from Oraculo.SuperSete.models import evolutionary
+from Oraculo.SuperSete import statistics
+from Oraculo.SuperSete import ensemble
+from Oraculo.dataset import carregar_sorteios
+from Oraculo.SuperSete.draws import GAME, encode_tickets, sync
+from Oraculo import runner
+from Oraculo import banco
+from Oraculo import graficos
+from Oraculo import perfil
 
 # Configs
 DATA_PATH = "Oraculo/SuperSete/data/SuperSete.csv"
 OUTPUT_PATH = "Oraculo/SuperSete/predictions"
 DOCS_PATH = "Oraculo/SuperSete/docs"
-
-print("\n📊 Carregando dados históricos...")
-df_full = pd.read_csv(DATA_PATH)
-df_full = df_full.sort_values(by="Concurso").reset_index(drop=True)
-df = df_full[[f"Coluna {i}" for i in range(1, 8)]]
-print(f"Linhas carregadas: {len(df)} | Último sorteio: Concurso {df_full['Concurso'].iloc[-1]}")
-
-# -----------------------------
-# Estatísticas
-# -----------------------------
-print("\n📈 Calculando estatísticas...")
-freqs = frequency.calculate_frequency_by_column(df)
-norm_freqs = frequency.normalize_frequency(freqs)
-poisson_scores = poisson.column_poisson_scores(freqs)
-markov_preds = markov.generate_predictions(df)
-priors = bayesian.initialize_priors()
-bayes_post = bayesian.update_posteriors(priors, df.tail(10))
-top_bayes = bayesian.get_top_candidates(bayes_post, top_n=3)
-
-print("\n🎯 Top 3 dígitos por coluna (modelo Bayesiano):")
-for col, digs in top_bayes.items():
-    print(f"{col}: {digs}")
-
-# -----------------------------
-# Geração de Palpites
-# -----------------------------
-print("\n🎰 Gerando palpites...")
-
-# Curto prazo (últimos 5)
-short_df = df.tail(5)
-short_freqs = frequency.calculate_frequency_by_column(short_df)
-short_guess = [max(col.items(), key=lambda x: x[1])[0] for col in short_freqs.values()]
-
-# Médio prazo (últimos 20)
-mid_df = df.tail(20)
-mid_freqs = frequency.calculate_frequency_by_column(mid_df)
-mid_guess = [max(col.items(), key=lambda x: x[1])[0] for col in mid_freqs.values()]
-
-# Longo prazo (histórico completo)
-long_guess = [max(col.items(), key=lambda x: x[1])[0] for col in freqs.values()]
-
-# Evolutivo
-evo_games = evolutionary.evolve_population(
-    evolutionary.initialize_population(50),
-    freqs,
-    generations=30
-)
-
-# Bayesian palpite
-bayes_guess = [top[0] for top in top_bayes.values()]
-
-# Markov palpite
-markov_guess = [max(pred.items(), key=lambda x: x[1])[0] for pred in markov_preds.values()]
-
-# Poisson palpite
-poisson_guess = [max(scores.items(), key=lambda x: x[1])[0] for scores in poisson_scores.values()]
-
-# Palpite da rodada (baseado nas dezenas mais frequentes entre todos os palpites)
-all_jogos = [short_guess, mid_guess, long_guess, bayes_guess, markov_guess, poisson_guess] + evo_games
-palpite_rodada = [Counter([jogo[i] for jogo in all_jogos]).most_common(1)[0][0] for i in range(7)]
-
-# -----------------------------
-# Salvamento
-# -----------------------------
-print("\n💾 Salvando palpites...")
-today = datetime.now().strftime("%Y-%m-%d")
-os.makedirs(OUTPUT_PATH, exist_ok=True)
-
-output = [
-    {"modelo": "curto_prazo", "jogo": short_guess},
-    {"modelo": "medio_prazo", "jogo": mid_guess},
-    {"modelo": "longo_prazo", "jogo": long_guess},
-    {"modelo": "bayesiano", "jogo": bayes_guess},
-    {"modelo": "markov", "jogo": markov_guess},
-    {"modelo": "poisson", "jogo": poisson_guess},
-    {"modelo": "palpite_rodada", "jogo": palpite_rodada},
-]
-for j in evo_games:
-    output.append({"modelo": "evolutivo", "jogo": j})
-
-json_path = os.path.join(OUTPUT_PATH, f"prediction_{today}.json")
-with open(json_path, 'w', encoding='utf-8') as f:
-    json.dump(output, f, ensure_ascii=False, indent=2)
-
-csv_path = os.path.join(OUTPUT_PATH, f"prediction_{today}.csv")
-pd.DataFrame([{**{"col"+str(i+1): num for i, num in enumerate(x['jogo'])}, "modelo": x['modelo']} for x in output]).to_csv(csv_path, index=False)
-
-print(f"\n✅ Previsões salvas:")
-print(f"- JSON: {json_path}")
-print(f"- CSV : {csv_path}")
-
-# -----------------------------
-# Geração de Tabelas e Gráficos
-# -----------------------------
-os.makedirs(DOCS_PATH, exist_ok=True)
-
-# Tabela de frequência por coluna
-freq_table = pd.DataFrame.from_dict(freqs, orient="index").fillna(0).astype(int)
-freq_table = freq_table.reindex(columns=range(10)).fillna(0)
-freq_table = freq_table.T  # Transforma para que dezenas (0-9) fiquem no eixo Y e colunas (1-7) no eixo X
-freq_table = freq_table.sort_index(ascending=True)  # Garante que 0 fique no topo
-freq_table.columns = [f"Coluna {i}" for i in range(1, 8)]
-
-# Heatmap consolidado
-fig = go.Figure(data=go.Heatmap(
-    z=freq_table.values,
-    x=freq_table.columns,
-    y=freq_table.index,
-    colorscale=[[0, '#f7fbec'], [0.5, '#afd355'], [1, '#6b8c21']],
-    text=freq_table.index.values[:, None].repeat(freq_table.shape[1], axis=1),
-    texttemplate="%{text}",
-    hoverinfo="y+z"
-))
-fig.update_layout(
-    title="Heatmap de Frequência por Coluna (0 a 9)",
-    xaxis_title="Colunas",
-    yaxis_title="Dezenas",
-    height=500,
-)
-fig.write_html(os.path.join(DOCS_PATH, "heatmap.html"))
-
-print("\n📊 Relatórios gerados na pasta docs.")
-print("\n🚀 Pipeline de previsão finalizada com sucesso.")
+CORES = [[0, '#f7fbec'], [0.5, '#afd355'], [1, '#6b8c21']]
+COLUNAS = [f"Coluna {i}" for i in range(1, 8)]
+# Cada processo do runner abre o mesmo histórico pelos sidecars mapeados em memória
+DADOS = ("Oraculo.SuperSete.draws:load_frame", (DATA_PATH, COLUNAS))
+
+
+def model_tasks(stats, dados, freqs):
+    return [
+        runner.tarefa("poisson", "Oraculo.SuperSete.models.poisson:column_poisson_scores", freqs, timeout=60),
+        runner.tarefa("markov", "Oraculo.SuperSete.models.markov:generate_predictions", dados=DADOS, timeout=60,
+                      transition_counts=statistics.transitions(stats)),
+        runner.tarefa("bayesiano", "Oraculo.SuperSete.models.bayesian:top_candidates_from_counts", statistics.window(dados["matriz"], 10), top_n=3, timeout=60),
+        runner.tarefa("evolutivo", "Oraculo.SuperSete.models.evolutionary:run_evolution", freqs, population_size=50, generations=30, timeout=120),
+    ]
+
+
+def column_heatmap(counts, title):
+    # Dígitos (0-9) no eixo Y e colunas (1-7) no eixo X
+    digits = np.arange(counts.shape[0])
+    return graficos.heatmap(counts, x=COLUNAS, y=digits, titulo=title, cores=CORES,
+                            texto=digits[:, None].repeat(counts.shape[1], axis=1))
+
+
+def load():
+    print("\n📊 Carregando dados históricos...")
+    with perfil.etapa("carregar"):
+        dados = carregar_sorteios(DATA_PATH, COLUNAS)
+    print(f"Linhas carregadas: {len(dados['concurso'])} | Último sorteio: Concurso {dados['concurso'][-1]}")
+
+    # -----------------------------
+    # Estatísticas
+    # -----------------------------
+    print("\n📈 Calculando estatísticas...")
+    with perfil.etapa("estatisticas"):
+        stats = statistics.update(dados["concurso"], dados["matriz"])
+    return dados, stats
+
+
+def predict(dados, stats):
+    """
+    Etapa de previsão: roda os modelos, combina o palpite da rodada e grava
+    os palpites no banco.
+    """
+    freqs = frequency.counts_to_dict(stats["frequencia"], COLUNAS)
+
+    # Modelos (independentes: um processo por modelo, semente via ORACULO_SEED)
+    print("\n🧠 Executando modelos...")
+    with perfil.etapa("modelos"):
+        outputs = runner.executar_modelos(model_tasks(stats, dados, freqs), seed=runner.semente_ambiente())
+    results = runner.resultados(outputs)
+    poisson_scores = results.get("poisson")
+    markov_preds = results.get("markov")
+    top_bayes = results.get("bayesiano")
+
+    if top_bayes:
+        print("\n🎯 Top 3 dígitos por coluna (modelo Bayesiano):")
+        for col, digs in top_bayes.items():
+            print(f"{col}: {digs}")
+
+    # -----------------------------
+    # Geração de Palpites
+    # -----------------------------
+    print("\n🎰 Gerando palpites...")
+
+    # Curto prazo (últimos 5)
+    short_freqs = frequency.counts_to_dict(statistics.window(dados["matriz"], 5), COLUNAS)
+    short_guess = [max(col.items(), key=lambda x: x[1])[0] for col in short_freqs.values()]
+
+    # Médio prazo (últimos 20)
+    mid_freqs = frequency.counts_to_dict(statistics.window(dados["matriz"], 20), COLUNAS)
+    mid_guess = [max(col.items(), key=lambda x: x[1])[0] for col in mid_freqs.values()]
+
+    # Longo prazo (histórico completo)
+    long_guess = [max(col.items(), key=lambda x: x[1])[0] for col in freqs.values()]
+
+    # Evolutivo
+    evo_games = results.get("evolutivo", [])
+
+    # Bayesian palpite
+    bayes_guess = [top[0] for top in top_bayes.values()] if top_bayes else None
+
+    # Markov palpite
+    markov_guess = [max(pred.items(), key=lambda x: x[1])[0] for pred in markov_preds.values()] if markov_preds else None
+
+    # Poisson palpite
+    poisson_guess = [max(scores.items(), key=lambda x: x[1])[0] for scores in poisson_scores.values()] if poisson_scores else None
+
+    # Palpite da rodada (baseado nas dezenas mais frequentes entre todos os palpites)
+    # Com ensemble (opcional: ORACULO_REPLICAS=N, ex. ensemble.REPLICAS):
+    # probabilidades por coluna das réplicas do evolutivo combinadas com os
+    # palpites determinísticos
+    deterministic = [j for j in [short_guess, mid_guess, long_guess, bayes_guess, markov_guess, poisson_guess] if j]
+    with perfil.etapa("consenso"):
+        replicas = int(os.environ.get("ORACULO_REPLICAS", 0))
+        round_probs = None
+        if replicas:
+            print(f"\n🎲 Ensemble Monte Carlo ({replicas} réplicas por modelo)...")
+            palpite_rodada, round_probs, _ = ensemble.run(freqs, replicas, seed=runner.semente_ambiente(), guesses=deterministic)
+        else:
+            all_jogos = deterministic + evo_games
+            palpite_rodada = [Counter([jogo[i] for jogo in all_jogos]).most_common(1)[0][0] for i in range(7)]
+
+    # -----------------------------
+    # Salvamento
+    # -----------------------------
+    print("\n💾 Salvando palpites...")
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    output = [
+        {"modelo": "curto_prazo", "jogo": short_guess},
+        {"modelo": "medio_prazo", "jogo": mid_guess},
+        {"modelo": "longo_prazo", "jogo": long_guess},
+        {"modelo": "bayesiano", "jogo": bayes_guess},
+        {"modelo": "markov", "jogo": markov_guess},
+        {"modelo": "poisson", "jogo": poisson_guess},
+        {"modelo": "palpite_rodada", "jogo": palpite_rodada},
+    ]
+    if round_probs is not None:
+        output[-1]["probabilidades"] = round_probs.round(4).tolist()
+    # Modelos que falharam ou estouraram o tempo ficam de fora
+    output = [x for x in output if x["jogo"]]
+    for j in evo_games:
+        output.append({"modelo": "evolutivo", "jogo": j})
+
+    # Palpites (e os concursos novos do CSV) vão para o banco SQLite do jogo
+    with perfil.etapa("salvar"):
+        con = banco.abrir(GAME, OUTPUT_PATH, encode_tickets)
+        try:
+            sync(con, DATA_PATH)
+            banco.salvar_palpites(con, GAME, today, output, encode_tickets, concurso=int(dados["concurso"][-1]) + 1)
+        finally:
+            con.close()
+
+    print(f"\n✅ Previsões salvas em {banco.caminho(OUTPUT_PATH)}")
+
+
+@perfil.medido()
+def heatmap(dados=None, stats=None):
+    # Heatmaps (dados em JSON, desenhados por static/heatmap.js na página):
+    # histórico completo e janela dos últimos 20 concursos, com os dígitos
+    # (0-9) nas linhas e as colunas (1-7) nas colunas
+    if dados is None or stats is None:
+        dados, stats = load()
+    graficos.salvar_heatmaps(os.path.join(DOCS_PATH, "heatmap.json"), [
+        column_heatmap(stats["frequencia"].T, "Heatmap de Frequência por Coluna (0 a 9)"),
+        column_heatmap(statistics.window(dados["matriz"], 20).T, "Frequência por Coluna nos Últimos 20 Concursos"),
+    ])
+    print("\n📊 Relatórios gerados na pasta docs.")
+
+
+def main(gerar_heatmap=True):
+    dados, stats = load()
+    predict(dados, stats)
+    if gerar_heatmap:
+        heatmap(dados, stats)
+    print("\n🚀 Pipeline de previsão finalizada com sucesso.")
+
+
+if __name__ == '__main__':
+    main()
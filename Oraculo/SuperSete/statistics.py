@@ -0,0 +1,138 @@
+import os
+
+import numpy as np
+
+from Oraculo import estatisticas
+from Oraculo.indice import IndicePrefixo
+
+DATA_PATH = "Oraculo/SuperSete/data/SuperSete.csv"
+VERSION = 5
+COLS = 7
+DIGITS = 10
+ORDERS = (1, 2, 3)
+MAX_ORDER = max(ORDERS)
+
+_COL_IDX = np.arange(COLS)
+
+
+def snapshot_path(path=DATA_PATH):
+    # Ao lado do CSV (versionado), não em data/cache/: o CI commita o snapshot
+    # junto com os sorteios e a próxima execução só conta os concursos novos
+    return os.path.join(os.path.dirname(path), "SuperSete.estatisticas.npz")
+
+
+def one_hot(rows):
+    """
+    Matriz (n, 7, 10) com 1 no dígito sorteado de cada coluna.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    return (rows[..., None] == np.arange(DIGITS)).astype(np.int32)
+
+
+def transitions_key(order):
+    return f"transitions_{order}"
+
+
+def count_transitions(rows, order=1):
+    """
+    Contagens de transição de ordem `order` por coluna: tensor (7, 10^k, 10)
+    em que o estado codifica os k dígitos anteriores em base 10 (o mais
+    antigo é o dígito mais significativo). Só contam os sorteios com k
+    antecessores em `rows`.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    states = DIGITS ** order
+    if len(rows) <= order:
+        return np.zeros((COLS, states, DIGITS), dtype=np.int64)
+    state = np.zeros((len(rows) - order, COLS), dtype=np.int64)
+    for j in range(order):
+        state = state * DIGITS + rows[j:len(rows) - order + j]
+    flat = ((_COL_IDX * states + state) * DIGITS + rows[order:]).ravel()
+    return np.bincount(flat, minlength=COLS * states * DIGITS).reshape(COLS, states, DIGITS).astype(np.int64)
+
+
+def transitions_by_draw(rows):
+    """
+    Transições de ordem 1 de cada sorteio: tensor (n, 7, 10, 10) com 1 em
+    [i, c, a, b] quando a coluna c passou do dígito a (sorteio i - 1) para b.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    per_draw = np.zeros((len(rows), COLS, DIGITS, DIGITS), dtype=np.int32)
+    if len(rows) > 1:
+        draw = np.arange(1, len(rows))[:, None]
+        per_draw[draw, _COL_IDX, rows[:-1], rows[1:]] = 1
+    return per_draw
+
+
+def window_transitions(rows, order=1, window=None):
+    """
+    Contagens de ordem `order` só das transições que terminam nos últimos
+    `window` sorteios (O(window), sem tocar o resto do histórico).
+    """
+    rows = np.asarray(rows)
+    if window is None:
+        return count_transitions(rows, order)
+    return count_transitions(rows[max(0, len(rows) - window - order):], order)
+
+
+def initialize():
+    return estatisticas.novo_snapshot(
+        VERSION, (COLS,), np.int8, (COLS, DIGITS),
+        # transitions_k[c, s, b]: quantas vezes o dígito b sucedeu os k dígitos do estado s na coluna c
+        **{transitions_key(k): np.zeros((COLS, DIGITS ** k, DIGITS), dtype=np.int64) for k in ORDERS},
+        # Últimos sorteios já contabilizados: contexto das transições de ordem > 1
+        tail=np.zeros((0, COLS), dtype=np.int8),
+    )
+
+
+def accumulate(snap, rows):
+    """
+    Incorpora novos sorteios (matriz n x 7) às contagens de transição por coluna.
+    """
+    rows = np.asarray(rows, dtype=np.int8)
+    # As primeiras transições novas partem dos sorteios já contabilizados
+    seq = np.vstack([snap["tail"].astype(np.int8), rows])
+    known = len(snap["tail"])
+    for k in ORDERS:
+        snap[transitions_key(k)] += count_transitions(seq[max(0, known - k):], k)
+    snap["tail"] = seq[-MAX_ORDER:]
+
+
+def transitions(snap, orders=ORDERS):
+    """
+    Contagens persistidas por ordem: {k: tensor (7, 10^k, 10)}.
+    """
+    return {k: snap[transitions_key(k)] for k in orders}
+
+
+def update(concursos, matrix, path=None):
+    """
+    Estatísticas acumuladas do histórico, persistidas ao lado do CSV e
+    atualizadas apenas com os concursos novos.
+    """
+    path = path or snapshot_path()
+    return estatisticas.atualizar(path, VERSION, concursos, matrix, initialize, accumulate, one_hot)
+
+
+def window(matrix, n):
+    """
+    Frequências (7 x 10) por coluna nos últimos `n` concursos.
+    """
+    return estatisticas.janela(matrix, n, one_hot)
+
+
+def index(concursos, matrix):
+    """
+    Índice de frequências (7 x 10) por coluna sobre qualquer intervalo de
+    concursos, montado em memória (para o backtest, que consulta todos os
+    pontos do histórico).
+    """
+    return IndicePrefixo.construir(one_hot(matrix), concursos)
+
+
+def transitions_index(concursos, matrix):
+    """
+    Índice das transições de ordem 1 (7 x 10 x 10) sobre qualquer intervalo
+    de concursos, montado em memória (o snapshot só guarda os totais).
+    """
+    return IndicePrefixo.construir(transitions_by_draw(matrix), concursos)
@@ -0,0 +1,105 @@
+"""
+Linha de comando do Oráculo:
+
+    python -m Oraculo <jogo> predict [--sem-heatmap]
+    python -m Oraculo <jogo> heatmap
+    python -m Oraculo <jogo> benchmark [--sem-grafico]
+    python -m Oraculo <jogo> backtest [--sem-grafico]
+    python -m Oraculo <jogo> ingest [--fonte URL|ARQUIVO]
+
+Toda etapa grava um relatório de execução (tempo, CPU e pico de memória por
+etapa e por modelo; ver Oraculo.perfil) em <jogo>/predictions. Opções comuns:
+`--memoria` liga o tracemalloc e `--cprofile [ARQUIVO]` grava o perfil
+cProfile do processo principal.
+
+O jogo é qualquer especificação de Oraculo.jogos (lotofacil, supersete,
+megasena). Jogos com motor próprio apontam seus módulos em `Jogo.modulos`;
+os demais usam os motores genéricos (Oraculo.previsao, Oraculo.benchmark,
+Oraculo.ingestao).
+Cada etapa importa o próprio módulo só quando é executada.
+"""
+import argparse
+import cProfile
+import importlib
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Oraculo import perfil
+from Oraculo.jogos import JOGOS, jogo as especificacao
+
+# etapa -> (chave em Jogo.modulos, função, motor genérico)
+ETAPAS = {
+    "predict": ("predict", "main", "Oraculo.previsao"),
+    "heatmap": ("predict", "heatmap", "Oraculo.previsao"),
+    "benchmark": ("benchmark", "main", "Oraculo.benchmark"),
+    "backtest": ("backtest", "main", None),
+    "ingest": ("ingest", "main", "Oraculo.ingestao"),
+}
+
+
+def etapa(jogo, nome):
+    """
+    Função da etapa para o jogo. Motores genéricos recebem a especificação
+    como primeiro argumento; os próprios do jogo já a conhecem.
+    """
+    chave, funcao, generico = ETAPAS[nome]
+    modulo = jogo.modulos.get(chave)
+    if modulo:
+        return getattr(importlib.import_module(modulo), funcao), ()
+    if generico:
+        return getattr(importlib.import_module(generico), funcao), (jogo,)
+    raise SystemExit(f"{jogo.titulo} não tem a etapa '{nome}'.")
+
+
+def parser():
+    p = argparse.ArgumentParser(prog="oraculo", description="Oráculo: previsões e benchmarks de loterias")
+    p.add_argument("jogo", type=especificacao, metavar="jogo", help=f"um de: {', '.join(JOGOS)}")
+    etapas = p.add_subparsers(dest="etapa", required=True)
+
+    comum = argparse.ArgumentParser(add_help=False)
+    comum.add_argument("--memoria", action="store_true", help="mede o pico de memória alocada com tracemalloc (mais lento)")
+    comum.add_argument("--cprofile", nargs="?", const=True, metavar="ARQUIVO",
+                       help="grava o perfil cProfile (padrão: <jogo>/predictions/<etapa>.prof)")
+
+    e = etapas.add_parser("predict", parents=[comum], help="roda os modelos e grava os palpites no banco")
+    e.add_argument("--sem-heatmap", dest="gerar_heatmap", action="store_false", help="não regrava docs/heatmap.json")
+
+    etapas.add_parser("heatmap", parents=[comum], help="regrava os heatmaps (docs/heatmap.json)")
+
+    for nome, ajuda in [("benchmark", "compara os palpites salvos com os sorteios"),
+                        ("backtest", "backtest walk-forward dos modelos")]:
+        e = etapas.add_parser(nome, parents=[comum], help=ajuda)
+        e.add_argument("--sem-grafico", dest="grafico", action="store_false", help="não gera o PNG do sumário (dispensa matplotlib)")
+
+    e = etapas.add_parser("ingest", parents=[comum], help="acrescenta ao CSV os concursos novos de uma URL ou de um HTML/CSV salvo")
+    e.add_argument("--fonte", help="URL ou arquivo HTML/CSV (padrão: a fonte do jogo, se houver)")
+    return p
+
+
+def main(argv=None):
+    args = vars(parser().parse_args(argv))
+    jogo, nome = args.pop("jogo"), args.pop("etapa")
+    memoria, cprofile = args.pop("memoria"), args.pop("cprofile")
+    funcao, posicionais = etapa(jogo, nome)
+
+    relatorio = perfil.iniciar(jogo.nome, nome, memoria)
+    perfilador = cProfile.Profile() if cprofile else None
+    try:
+        if perfilador:
+            perfilador.enable()
+        funcao(*posicionais, **args)
+    finally:
+        if perfilador:
+            perfilador.disable()
+            destino = cprofile if isinstance(cprofile, str) else os.path.join(jogo.pred_path, f"{nome}.prof")
+            os.makedirs(os.path.dirname(destino) or ".", exist_ok=True)
+            perfilador.dump_stats(destino)
+            print(f"🧪 Perfil cProfile salvo em {destino}")
+        perfil.finalizar()
+    print(f"⏱️ Relatório de execução salvo em {relatorio.salvar(jogo.pred_path)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,371 @@
+import glob
+import json
+import os
+import sqlite3
+
+import numpy as np
+
+from Oraculo.dataset import carregar_sorteios, ler_premios
+
+# Um banco por jogo, junto dos palpites (<Jogo>/predictions/previsoes.sqlite):
+# os workflows de cada jogo gravam e comitam só o próprio arquivo.
+ARQUIVO = "previsoes.sqlite"
+
+# Todas as tabelas levam o jogo na frente da chave: uma consulta por jogo e
+# concurso/data é sempre uma busca no índice. Bilhetes e sorteios ficam
+# empacotados em um inteiro pelo codificador do jogo (bitmask na Lotofácil,
+# dígitos na Super Sete).
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS sorteios (
+    jogo TEXT NOT NULL,
+    concurso INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    numeros INTEGER NOT NULL,
+    PRIMARY KEY (jogo, concurso)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_sorteios_data ON sorteios (jogo, data);
+
+CREATE TABLE IF NOT EXISTS premios (
+    jogo TEXT NOT NULL,
+    concurso INTEGER NOT NULL,
+    faixa INTEGER NOT NULL,
+    ganhadores INTEGER,
+    rateio REAL,
+    PRIMARY KEY (jogo, concurso, faixa)
+) WITHOUT ROWID;
+
+-- Um registro por bilhete: palpites com vários bilhetes (beam_search, mutation)
+-- ocupam várias linhas com o mesmo (jogo, data, modelo) e `indice` crescente.
+CREATE TABLE IF NOT EXISTS previsoes (
+    id INTEGER PRIMARY KEY,
+    jogo TEXT NOT NULL,
+    data TEXT NOT NULL,
+    concurso INTEGER,
+    modelo TEXT NOT NULL,
+    indice INTEGER NOT NULL,
+    bilhete INTEGER NOT NULL,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_previsoes_data ON previsoes (jogo, data, modelo);
+CREATE INDEX IF NOT EXISTS idx_previsoes_modelo ON previsoes (jogo, modelo, data);
+CREATE INDEX IF NOT EXISTS idx_previsoes_concurso ON previsoes (jogo, concurso);
+
+-- `origem` separa o benchmark dos palpites publicados do backtest walk-forward
+CREATE TABLE IF NOT EXISTS benchmark (
+    jogo TEXT NOT NULL,
+    origem TEXT NOT NULL,
+    modelo TEXT NOT NULL,
+    data_palpite TEXT,
+    data_concurso TEXT NOT NULL,
+    acertos_totais INTEGER NOT NULL,
+    acertos_por_coluna INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_benchmark ON benchmark (jogo, origem, modelo, data_concurso);
+
+CREATE TABLE IF NOT EXISTS importados (
+    jogo TEXT NOT NULL,
+    arquivo TEXT NOT NULL,
+    PRIMARY KEY (jogo, arquivo)
+);
+"""
+
+_INSERIR_PREVISAO = (
+    "INSERT INTO previsoes (jogo, data, concurso, modelo, indice, bilhete, extra) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def caminho(pasta):
+    return os.path.join(pasta, ARQUIVO)
+
+
+def conectar(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    con = sqlite3.connect(path)
+    con.executescript(ESQUEMA)
+    return con
+
+
+def conectar_leitura(path):
+    """
+    Conexão só de leitura (sem criar o arquivo, o esquema ou importar
+    legados), para quem apenas consulta o banco, como a página HTML.
+    """
+    return sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+
+
+def _datas(valores):
+    return np.array(valores, dtype="datetime64[D]")
+
+
+# === Sorteios e faixas de prêmio ===
+
+def ultimo_concurso(con, jogo, tabela="sorteios"):
+    return con.execute(f"SELECT MAX(concurso) FROM {tabela} WHERE jogo = ?", (jogo,)).fetchone()[0] or 0
+
+
+def sincronizar_sorteios(con, jogo, csv_path, colunas, codificar, faixas=()):
+    """
+    Acrescenta ao banco os concursos do CSV posteriores ao último já gravado
+    (sorteios e, se `faixas` for dado, ganhadores/rateio de cada faixa).
+    O CSV só é relido quando há concursos novos. Retorna quantos entraram.
+    """
+    dados = carregar_sorteios(csv_path, colunas)
+    ultimo = ultimo_concurso(con, jogo)
+    novos = np.flatnonzero(dados["concurso"] > ultimo)
+    with con:
+        if len(novos):
+            numeros = codificar(dados["matriz"][novos])
+            con.executemany(
+                "INSERT OR REPLACE INTO sorteios (jogo, concurso, data, numeros) VALUES (?, ?, ?, ?)",
+                zip([jogo] * len(novos), dados["concurso"][novos].tolist(),
+                    dados["data"][novos].astype(str).tolist(), numeros.tolist()),
+            )
+        if faixas and ultimo_concurso(con, jogo, "premios") < int(dados["concurso"][-1]):
+            premios = ler_premios(csv_path, faixas, desde=ultimo_concurso(con, jogo, "premios"))
+            con.executemany(
+                "INSERT OR REPLACE INTO premios (jogo, concurso, faixa, ganhadores, rateio) VALUES (?, ?, ?, ?, ?)",
+                ((jogo, c, f, g, r) for c, f, g, r in premios),
+            )
+    return len(novos)
+
+
+def sorteios(con, jogo, ultimos=None, inicio=None, fim=None):
+    """
+    Sorteios do jogo em ordem crescente de concurso, opcionalmente só os
+    `ultimos` N ou os de concurso em [inicio, fim]. Retorna {"concurso",
+    "data", "numeros"} como arrays (`numeros` ainda codificado).
+    """
+    filtros, params = ["jogo = ?"], [jogo]
+    if inicio is not None:
+        filtros.append("concurso >= ?")
+        params.append(int(inicio))
+    if fim is not None:
+        filtros.append("concurso <= ?")
+        params.append(int(fim))
+    sql = f"SELECT concurso, data, numeros FROM sorteios WHERE {' AND '.join(filtros)} ORDER BY concurso DESC"
+    if ultimos is not None:
+        sql += " LIMIT ?"
+        params.append(int(ultimos))
+    linhas = con.execute(sql, params).fetchall()[::-1]
+    concurso, data, numeros = zip(*linhas) if linhas else ((),) * 3
+    return {
+        "concurso": np.array(concurso, dtype=np.int64),
+        "data": _datas(data),
+        "numeros": np.array(numeros, dtype=np.int64),
+    }
+
+
+def premios_medios(con, jogo, faixas):
+    """
+    Rateio médio por faixa, considerando só os concursos em que a faixa pagou
+    algum valor. Retorna {acertos: valor}.
+    """
+    medias = dict(con.execute(
+        f"SELECT faixa, AVG(rateio) FROM premios WHERE jogo = ? AND rateio > 0 "
+        f"AND faixa IN ({', '.join('?' * len(faixas))}) GROUP BY faixa",
+        [jogo, *faixas],
+    ).fetchall())
+    return {n: float(medias.get(n) or 0.0) for n in faixas}
+
+
+# === Palpites ===
+
+def _linhas(jogo, data, concurso, entradas, codificar):
+    """
+    Achata [{"modelo", "jogo", ...}] em linhas da tabela. Chaves além de
+    modelo/jogo (ex.: probabilidades do palpite da rodada) vão como JSON em
+    `extra` no primeiro bilhete do modelo.
+    """
+    linhas, proximo = [], {}
+    for entrada in entradas:
+        bilhetes = entrada["jogo"]
+        if bilhetes is None or len(bilhetes) == 0:
+            continue
+        modelo = entrada["modelo"]
+        extras = {k: v for k, v in entrada.items() if k not in ("modelo", "jogo")}
+        codigos = codificar(np.atleast_2d(np.asarray(bilhetes, dtype=np.int64)))
+        for i, codigo in enumerate(codigos):
+            # Um modelo pode aparecer em várias entradas (ex.: evolutivo da Super Sete)
+            indice = proximo.get(modelo, 0)
+            proximo[modelo] = indice + 1
+            extra = json.dumps(extras, ensure_ascii=False) if extras and i == 0 else None
+            linhas.append((jogo, str(data), concurso, modelo, indice, int(codigo), extra))
+    return linhas
+
+
+def salvar_palpites(con, jogo, data, entradas, codificar, concurso=None):
+    """
+    Grava os palpites de uma data, substituindo os que já existirem para ela
+    (reexecuções no mesmo dia).
+    """
+    with con:
+        con.execute("DELETE FROM previsoes WHERE jogo = ? AND data = ?", (jogo, str(data)))
+        con.executemany(_INSERIR_PREVISAO, _linhas(jogo, data, concurso, entradas, codificar))
+
+
+def consultar_palpites(con, jogo, inicio=None, fim=None, modelos=None):
+    """
+    Bilhetes com data em [inicio, fim], ordenados por modelo, data e índice.
+    Retorna {"data", "concurso", "modelo", "indice", "bilhete"} como arrays.
+    """
+    filtros, params = ["jogo = ?"], [jogo]
+    if inicio is not None:
+        filtros.append("data >= ?")
+        params.append(str(inicio))
+    if fim is not None:
+        filtros.append("data <= ?")
+        params.append(str(fim))
+    if modelos:
+        filtros.append(f"modelo IN ({', '.join('?' * len(modelos))})")
+        params.extend(modelos)
+    linhas = con.execute(
+        f"SELECT data, concurso, modelo, indice, bilhete FROM previsoes WHERE {' AND '.join(filtros)} "
+        "ORDER BY modelo, data, indice",
+        params,
+    ).fetchall()
+    data, concurso, modelo, indice, bilhete = zip(*linhas) if linhas else ((),) * 5
+    return {
+        "data": _datas(data),
+        "concurso": np.array([-1 if c is None else c for c in concurso], dtype=np.int64),
+        "modelo": np.array(modelo, dtype=object),
+        "indice": np.array(indice, dtype=np.int64),
+        "bilhete": np.array(bilhete, dtype=np.int64),
+    }
+
+
+def ultima_data(con, jogo, antes_de=None, modelo=None):
+    """
+    Data do palpite mais recente (de `modelo`, se dado), ou do mais recente
+    estritamente anterior à data `antes_de`.
+    """
+    filtros, params = ["jogo = ?"], [jogo]
+    if modelo is not None:
+        filtros.append("modelo = ?")
+        params.append(modelo)
+    if antes_de is not None:
+        filtros.append("data < ?")
+        params.append(str(antes_de))
+    return con.execute(f"SELECT MAX(data) FROM previsoes WHERE {' AND '.join(filtros)}", params).fetchone()[0]
+
+
+def data_palpite_concurso(con, jogo, concurso, modelo=None):
+    """
+    Data do último palpite (de `modelo`, se dado) feito antes do sorteio do
+    `concurso`: duas buscas nos índices, sem varrer a tabela. None se o
+    concurso não estiver no banco ou não houver palpite anterior.
+    """
+    sorteio = con.execute(
+        "SELECT data FROM sorteios WHERE jogo = ? AND concurso = ?", (jogo, int(concurso))
+    ).fetchone()
+    return ultima_data(con, jogo, antes_de=sorteio[0], modelo=modelo) if sorteio else None
+
+
+def modelos(con, jogo):
+    """
+    Modelos com palpites gravados, em ordem alfabética (um salto no índice
+    por modelo, em vez de um DISTINCT sobre todas as linhas).
+    """
+    nomes, atual = [], ""
+    while True:
+        atual = con.execute(
+            "SELECT MIN(modelo) FROM previsoes WHERE jogo = ? AND modelo > ?", (jogo, atual)
+        ).fetchone()[0]
+        if atual is None:
+            return nomes
+        nomes.append(atual)
+
+
+def bilhetes(con, jogo, modelo, data):
+    """
+    Bilhetes codificados do palpite de `modelo` na `data`, na ordem gravada.
+    """
+    linhas = con.execute(
+        "SELECT bilhete FROM previsoes WHERE jogo = ? AND modelo = ? AND data = ? ORDER BY indice",
+        (jogo, modelo, str(data)),
+    ).fetchall()
+    return np.array([b for (b,) in linhas], dtype=np.int64)
+
+
+def palpites(con, jogo, data, decodificar):
+    """
+    Palpites de uma data no formato dos antigos JSON diários: [{"modelo", "jogo"}]
+    (vários bilhetes viram lista de jogos), na ordem em que foram gravados.
+    """
+    linhas = con.execute(
+        "SELECT modelo, bilhete, extra FROM previsoes WHERE jogo = ? AND data = ? ORDER BY id", (jogo, str(data))
+    ).fetchall()
+    saida, por_modelo = [], {}
+    for modelo, bilhete, extra in linhas:
+        jogo_ = [int(n) for n in decodificar(np.array([bilhete]))[0]]
+        if modelo not in por_modelo:
+            por_modelo[modelo] = {"modelo": modelo, "jogos": []}
+            if extra:
+                por_modelo[modelo].update(json.loads(extra))
+            saida.append(por_modelo[modelo])
+        por_modelo[modelo]["jogos"].append(jogo_)
+    for entrada in saida:
+        jogos = entrada.pop("jogos")
+        entrada["jogo"] = jogos[0] if len(jogos) == 1 else jogos
+    return saida
+
+
+def migrar(con, jogo, pasta, codificar):
+    """
+    Importa os palpites legados de `pasta` ainda não importados (arquivos
+    diários `prediction_AAAA-MM-DD.json`). Retorna quantos arquivos entraram.
+    """
+    importados = {a for (a,) in con.execute("SELECT arquivo FROM importados WHERE jogo = ?", (jogo,))}
+    novos = 0
+    for arquivo in sorted(glob.glob(os.path.join(pasta, "prediction_*.json"))):
+        nome = os.path.basename(arquivo)
+        if nome in importados:
+            continue
+        data = nome.replace("prediction_", "").replace(".json", "")
+        with open(arquivo, "r", encoding="utf-8") as f:
+            conteudo = json.load(f)
+        if isinstance(conteudo, dict):
+            conteudo = [conteudo]
+        with con:
+            con.executemany(_INSERIR_PREVISAO, _linhas(jogo, data, None, conteudo, codificar))
+            con.execute("INSERT INTO importados (jogo, arquivo) VALUES (?, ?)", (jogo, nome))
+        novos += 1
+    return novos
+
+
+# === Resultados de benchmark ===
+
+def salvar_benchmark(con, jogo, origem, df):
+    """
+    Substitui os resultados de `origem` ("benchmark", "backtest") do jogo pelas
+    linhas de `df` (colunas de `benchmark.benchmark`).
+    """
+    import pandas as pd
+
+    por_coluna = df["acertos_por_coluna"] if "acertos_por_coluna" in df else None
+    if por_coluna is not None and not pd.api.types.is_numeric_dtype(por_coluna):
+        por_coluna = None  # Lotofácil grava "-"
+    n = len(df)
+    linhas = zip(
+        [jogo] * n, [origem] * n, df["modelo"].tolist(),
+        df["data_palpite"].astype(str).tolist(), df["data_concurso"].astype(str).tolist(),
+        df["acertos_totais"].astype(int).tolist(),
+        por_coluna.astype(int).tolist() if por_coluna is not None else [None] * n,
+    )
+    with con:
+        con.execute("DELETE FROM benchmark WHERE jogo = ? AND origem = ?", (jogo, origem))
+        con.executemany(
+            "INSERT INTO benchmark (jogo, origem, modelo, data_palpite, data_concurso, acertos_totais, acertos_por_coluna) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            linhas,
+        )
+
+
+def abrir(jogo, pasta, codificar=None, path=None):
+    """
+    Abre o banco do jogo em `pasta` (ou em `path`), importando antes os
+    palpites legados da pasta quando há `codificar`.
+    """
+    con = conectar(path or caminho(pasta))
+    if codificar is not None:
+        migrar(con, jogo, pasta, codificar)
+    return con
@@ -0,0 +1,161 @@
+# benchmark.py (qualquer jogo de Oraculo.jogos: sorteios e palpites comparados já codificados)
+
+import pandas as pd
+import numpy as np
+import os
+import sys
+from contextlib import closing
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Oraculo import banco, perfil
+from Oraculo.jogos import jogo as especificacao
+
+# === PARÂMETROS ===
+N_VALID = 300
+
+# === CAMINHOS ===
+def caminhos(jogo):
+    return {
+        "resultados": f"{jogo.validacao}/benchmark_results.csv",
+        "sumario": f"{jogo.validacao}/benchmark_summary.md",
+        "grafico": f"{jogo.docs_path}/charts/benchmark_summary.png",
+        "historico": f"{jogo.validacao}/historico_acertos.csv",
+    }
+
+# === FUNÇÕES ===
+@perfil.medido('carregar_sorteios')
+def load_dataset(jogo):
+    with closing(jogo.abrir_banco()) as con:
+        return banco.sorteios(con, jogo.nome, ultimos=N_VALID)
+
+@perfil.medido('carregar_palpites')
+def load_predictions(jogo, inicio=None, fim=None, modelos=None):
+    # Bilhetes já vêm ordenados por (modelo, data) do índice do banco
+    with closing(jogo.abrir_banco()) as con:
+        linhas = banco.consultar_palpites(con, jogo.nome, inicio, fim, modelos)
+    return {"data": linhas["data"], "modelo": linhas["modelo"], "bilhetes": linhas["bilhete"]}
+
+def palpites_por_concurso(con, jogo, modelo, concursos):
+    """
+    Para cada concurso, os bilhetes do último palpite de `modelo` feito antes
+    do sorteio (uma busca no índice por concurso). Retorna (posições dos
+    concursos, datas dos palpites, bilhetes), um item por bilhete.
+    """
+    posicoes, datas, codigos, lidos = [], [], [], {}
+    for i, concurso in enumerate(concursos):
+        data = banco.data_palpite_concurso(con, jogo.nome, concurso, modelo)
+        if data is None:
+            continue
+        if data not in lidos:
+            lidos[data] = banco.bilhetes(con, jogo.nome, modelo, data)
+        posicoes.extend([i] * len(lidos[data]))
+        datas.extend([data] * len(lidos[data]))
+        codigos.append(lidos[data])
+    codigos = np.concatenate(codigos) if codigos else np.empty(0, dtype=np.int64)
+    return np.array(posicoes, dtype=np.int64), np.array(datas, dtype="datetime64[D]"), codigos
+
+@perfil.medido('ranking')
+def ranking_historico(jogo):
+    """
+    Pontua os bilhetes do palpite mais recente contra todo o histórico: quantas
+    vezes cada um teria caído em cada faixa premiada e quanto teria rendido
+    pelo rateio médio de cada faixa.
+    """
+    with closing(jogo.abrir_banco()) as con:
+        ultima = banco.ultima_data(con, jogo.nome)
+    preds = load_predictions(jogo, inicio=ultima)
+    if len(preds["data"]) == 0:
+        return pd.DataFrame()
+
+    sel = preds["data"] == preds["data"].max()
+    codigos = preds["bilhetes"][sel]
+    histograma = jogo.histograma_acertos(codigos, jogo.codificar(jogo.carregar()["matriz"]))
+    with closing(jogo.abrir_banco()) as con:
+        premios = banco.premios_medios(con, jogo.nome, jogo.faixas)
+
+    df = pd.DataFrame({
+        "modelo": preds["modelo"][sel],
+        "data_palpite": preds["data"][sel],
+        "jogo": [" ".join(str(n) for n in bilhete) for bilhete in jogo.decodificar(codigos)],
+    })
+    for n in jogo.faixas:
+        df[f"acertos_{n}"] = histograma[:, n]
+    df["premio_historico"] = histograma[:, list(jogo.faixas)] @ np.array([premios[n] for n in jogo.faixas])
+    df = df.sort_values("premio_historico", ascending=False)
+
+    historico_csv = caminhos(jogo)["historico"]
+    os.makedirs(os.path.dirname(historico_csv), exist_ok=True)
+    df.to_csv(historico_csv, index=False)
+    return df
+
+@perfil.medido()
+def benchmark(jogo):
+    reais = load_dataset(jogo)
+    frames = []
+    with closing(jogo.abrir_banco()) as con:
+        for modelo in banco.modelos(con, jogo.nome):
+            idx_conc, datas_pred, palpites = palpites_por_concurso(con, jogo, modelo, reais["concurso"])
+            if len(palpites) == 0:
+                continue
+
+            sorteados = reais["numeros"][idx_conc]
+            por_coluna = jogo.acertos_por_coluna(palpites, sorteados)
+            frames.append(pd.DataFrame({
+                "modelo": modelo,
+                "data_palpite": datas_pred,
+                "data_concurso": reais["data"][idx_conc],
+                "acertos_totais": jogo.acertos(palpites, sorteados),
+                "acertos_por_coluna": "-" if por_coluna is None else por_coluna,
+            }))
+
+    if not frames:
+        print("⚠️ Nenhum registro válido para benchmarking.")
+        return pd.DataFrame()
+
+    df_benchmark = pd.concat(frames, ignore_index=True).sort_values(["data_concurso", "modelo"])
+    with closing(jogo.abrir_banco()) as con:
+        banco.salvar_benchmark(con, jogo.nome, "benchmark", df_benchmark)
+    resultados_csv = caminhos(jogo)["resultados"]
+    os.makedirs(os.path.dirname(resultados_csv), exist_ok=True)
+    df_benchmark.to_csv(resultados_csv, index=False)
+    return df_benchmark
+
+@perfil.medido('sumario')
+def gerar_summary(df, summary_md, chart_img, grafico=True):
+    if df.empty:
+        print("⚠️ DataFrame vazio. Sumário não gerado.")
+        return
+
+    resumo = df.groupby("modelo")["acertos_totais"].agg(["mean", "std", "count"]).reset_index()
+    resumo.columns = ["modelo", "media_acertos", "desvio_padrao", "n"]
+
+    os.makedirs(os.path.dirname(summary_md), exist_ok=True)
+    with open(summary_md, "w") as f:
+        f.write("# Benchmark Summary\n\n")
+        f.write(resumo.to_markdown(index=False))
+
+    if not grafico:
+        return
+
+    # Gráfico (matplotlib só é carregado quando o gráfico é pedido)
+    import matplotlib.pyplot as plt
+    os.makedirs(os.path.dirname(chart_img), exist_ok=True)
+    plt.figure(figsize=(10,6))
+    plt.bar(resumo["modelo"], resumo["media_acertos"], yerr=resumo["desvio_padrao"], capsize=5)
+    plt.title("Média de Acertos por Modelo")
+    plt.ylabel("Acertos")
+    plt.savefig(chart_img)
+    plt.close()
+
+def main(jogo, grafico=True):
+    jogo = especificacao(jogo)
+    print(f"\n🔍 Executando benchmark ({jogo.titulo})...")
+    df = benchmark(jogo)
+    arquivos = caminhos(jogo)
+    gerar_summary(df, arquivos["sumario"], arquivos["grafico"], grafico=grafico)
+    ranking_historico(jogo)
+    print("✅ Benchmark concluído.")
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "lotofacil")
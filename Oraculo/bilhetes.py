@@ -0,0 +1,108 @@
+import numpy as np
+
+_POPCOUNT16 = None
+
+
+def popcount(x):
+    """
+    Conta os bits ligados de cada elemento de um array de inteiros sem sinal
+    (uint32 ou uint64).
+    """
+    global _POPCOUNT16
+    x = np.asarray(x)
+    if not np.issubdtype(x.dtype, np.unsignedinteger):
+        x = x.astype(np.uint64 if x.dtype.itemsize > 4 else np.uint32)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(x).astype(np.int64)
+    # Fallback para NumPy < 2.0: tabela de 16 bits
+    if _POPCOUNT16 is None:
+        _POPCOUNT16 = np.array([bin(i).count('1') for i in range(1 << 16)], dtype=np.int64)
+    total = np.zeros(x.shape, dtype=np.int64)
+    for deslocamento in range(0, 8 * x.dtype.itemsize, 16):
+        total += _POPCOUNT16[(x >> x.dtype.type(deslocamento)) & x.dtype.type(0xFFFF)]
+    return total
+
+
+def tipo_mascara(simbolos):
+    """
+    Menor inteiro sem sinal que guarda um bit por símbolo.
+    """
+    if simbolos <= 32:
+        return np.uint32
+    if simbolos <= 63:  # o banco guarda bilhetes como INTEGER com sinal
+        return np.uint64
+    raise ValueError(f"{simbolos} símbolos não cabem em um bitmask de 63 bits")
+
+
+# --- Jogos sem ordem (Lotofácil, Mega-Sena): conjunto de dezenas -> bitmask
+
+def codificar_mascaras(jogos, primeiro=1, tipo=np.uint32):
+    """
+    Converte jogos (matriz n x k de dezenas) em bitmasks (dezena d -> bit d - primeiro).
+    """
+    jogos = np.atleast_2d(np.asarray(jogos)).astype(tipo) - tipo(primeiro)
+    return np.bitwise_or.reduce(np.left_shift(tipo(1), jogos), axis=1).astype(tipo)
+
+
+def matriz_mascaras(mascaras, simbolos, tipo=np.uint32):
+    """
+    Expande bitmasks em uma matriz 0/1 de formato (n, simbolos).
+    """
+    mascaras = np.asarray(mascaras, dtype=tipo)
+    return ((mascaras[..., None] >> np.arange(simbolos, dtype=tipo)) & 1).astype(np.uint8)
+
+
+def decodificar_mascaras(mascaras, simbolos, primeiro=1, tipo=np.uint32):
+    """
+    Converte bitmasks de k dezenas de volta em uma matriz (n, k) ordenada.
+    """
+    bits = matriz_mascaras(np.atleast_1d(mascaras), simbolos, tipo)
+    _, colunas = np.nonzero(bits)
+    return (colunas + primeiro).reshape(len(bits), -1)
+
+
+# --- Jogos com ordem (Super Sete): um símbolo por coluna -> inteiro posicional
+
+def pesos_posicionais(colunas, base=10):
+    return base ** np.arange(colunas - 1, -1, -1, dtype=np.int64)
+
+
+def codificar_posicoes(jogos, pesos):
+    """
+    Empacota bilhetes (n, colunas) em inteiros (coluna 1 mais significativa).
+    """
+    return np.atleast_2d(np.asarray(jogos, dtype=np.int64)) @ pesos
+
+
+def decodificar_posicoes(codigos, pesos, base=10):
+    """
+    Inverso de `codificar_posicoes`: matriz (n, colunas).
+    """
+    return np.atleast_1d(np.asarray(codigos, dtype=np.int64))[:, None] // pesos % base
+
+
+def acertos_colunas(bilhetes, sorteios):
+    """
+    Acertos por coluna de cada bilhete (n, c) contra cada sorteio (m, c): matriz (n, m).
+    """
+    bilhetes = np.asarray(bilhetes, dtype=np.int8)
+    sorteios = np.asarray(sorteios, dtype=np.int8)
+    return (bilhetes[:, None, :] == sorteios[None, :, :]).sum(axis=2)
+
+
+# --- Histograma de acertos (um bincount por bloco de bilhetes)
+
+def contar_acertos(acertos, maximo):
+    """
+    Linha i: em quantos sorteios o bilhete i fez 0..maximo acertos.
+    """
+    deslocados = acertos + (maximo + 1) * np.arange(len(acertos))[:, None]
+    return np.bincount(deslocados.ravel(), minlength=(maximo + 1) * len(acertos)).reshape(len(acertos), -1)
+
+
+def histograma_mascaras(bilhetes, sorteios, maximo):
+    return contar_acertos(popcount(bilhetes[:, None] & sorteios[None, :]), maximo)
+
+
+def histograma_colunas(bilhetes, sorteios, maximo):
+    return contar_acertos(acertos_colunas(bilhetes, sorteios), maximo)
@@ -0,0 +1,171 @@
+import os
+import json
+import hashlib
+import numpy as np
+
+COLUNA_CONCURSO = 'Concurso'
+COLUNA_DATA = 'Data Sorteio'
+FORMATO_DATA = '%d/%m/%Y'
+VERSAO = 1
+
+_CAMPOS = ('concurso', 'data', 'matriz')
+
+
+def caminho_cache(csv_path, sufixo=''):
+    """
+    Diretório (ou arquivo dentro dele) onde ficam os artefatos derivados do CSV.
+    """
+    pasta = os.path.join(os.path.dirname(os.path.abspath(csv_path)), 'cache')
+    return os.path.join(pasta, sufixo) if sufixo else pasta
+
+
+def hash_arquivo(path, bloco=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for parte in iter(lambda: f.read(bloco), b''):
+            h.update(parte)
+    return h.hexdigest()
+
+
+def salvar_atomico(path, escrever):
+    """
+    Grava em um arquivo temporário e troca de nome ao final, para que leitores
+    concorrentes nunca vejam um arquivo pela metade.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        escrever(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def salvar_npy(path, arr):
+    def escrever(tmp):
+        with open(tmp, 'wb') as f:
+            np.save(f, arr)
+    salvar_atomico(path, escrever)
+
+
+def _arquivos(csv_path):
+    base = os.path.splitext(os.path.basename(csv_path))[0]
+    arquivos = {campo: caminho_cache(csv_path, f'{base}.{campo}.npy') for campo in _CAMPOS}
+    return arquivos, caminho_cache(csv_path, f'{base}.meta.json')
+
+
+def _ler_meta(meta_path):
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _gravar_meta(meta_path, meta):
+    def escrever(tmp):
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+    salvar_atomico(meta_path, escrever)
+
+
+def _cache_valido(csv_path, colunas, arquivos, meta_path):
+    meta = _ler_meta(meta_path)
+    if not meta or meta.get('versao') != VERSAO or meta.get('colunas') != list(colunas):
+        return False
+    if not all(os.path.exists(p) for p in arquivos.values()):
+        return False
+
+    st = os.stat(csv_path)
+    if meta['tamanho'] == st.st_size and meta['mtime_ns'] == st.st_mtime_ns:
+        return True
+
+    # mtime mudou (ex.: checkout no CI): só reconstrói se o conteúdo mudou
+    if meta['tamanho'] == st.st_size and meta['sha256'] == hash_arquivo(csv_path):
+        meta['mtime_ns'] = st.st_mtime_ns
+        _gravar_meta(meta_path, meta)
+        return True
+    return False
+
+
+def construir_cache(csv_path, colunas, arquivos, meta_path):
+    import pandas as pd
+
+    df = pd.read_csv(csv_path, usecols=[COLUNA_CONCURSO, COLUNA_DATA] + list(colunas))
+    df = df.sort_values(by=COLUNA_CONCURSO).reset_index(drop=True)
+    dados = {
+        'concurso': df[COLUNA_CONCURSO].to_numpy(dtype=np.int32),
+        'data': pd.to_datetime(df[COLUNA_DATA], format=FORMATO_DATA).to_numpy(dtype='datetime64[D]'),
+        'matriz': np.ascontiguousarray(df[list(colunas)].to_numpy(dtype=np.int8)),
+    }
+    for campo, path in arquivos.items():
+        salvar_npy(path, dados[campo])
+
+    st = os.stat(csv_path)
+    _gravar_meta(meta_path, {
+        'versao': VERSAO,
+        'colunas': list(colunas),
+        'tamanho': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'sha256': hash_arquivo(csv_path),
+        'linhas': int(len(df)),
+    })
+    return dados
+
+
+def carregar_sorteios(csv_path, colunas, mmap=True):
+    """
+    Carrega `Concurso`, data e a matriz de dezenas/colunas de um CSV de sorteios.
+
+    Na primeira leitura grava um sidecar binário (.npy) em `data/cache/`; nas
+    seguintes, mapeia os arrays em memória e só volta a ler o CSV quando o
+    arquivo de origem muda. Retorna um dict com `concurso`, `data` e `matriz`,
+    em ordem crescente de concurso.
+    """
+    arquivos, meta_path = _arquivos(csv_path)
+    if not _cache_valido(csv_path, colunas, arquivos, meta_path):
+        return construir_cache(csv_path, colunas, arquivos, meta_path)
+    modo = 'r' if mmap else None
+    return {campo: np.load(path, mmap_mode=modo) for campo, path in arquivos.items()}
+
+
+def _valor_monetario(serie):
+    # "R$1.388,95" -> 1388.95
+    texto = serie.astype(str).str.replace(r'[^0-9,]', '', regex=True).str.replace(',', '.')
+    return texto.replace('', 'nan').astype(float)
+
+
+def premios_medios(csv_path, faixas):
+    """
+    Rateio médio por faixa de acertos (`Rateio N acertos`), considerando só os
+    concursos em que a faixa pagou algum valor. Retorna {acertos: valor}.
+    """
+    import pandas as pd
+
+    colunas = {n: f'Rateio {n} acertos' for n in faixas}
+    df = pd.read_csv(csv_path, usecols=list(colunas.values()))
+    medias = {}
+    for n, coluna in colunas.items():
+        valores = _valor_monetario(df[coluna])
+        valores = valores[valores > 0]
+        medias[n] = float(valores.mean()) if len(valores) else 0.0
+    return medias
+
+
+def ler_premios(csv_path, faixas, desde=0):
+    """
+    Ganhadores e rateio de cada faixa dos concursos posteriores a `desde`:
+    lista de tuplas (concurso, faixa, ganhadores, rateio).
+    """
+    import pandas as pd
+
+    df = pd.read_csv(csv_path)
+    df.columns = df.columns.str.strip()
+    df = df[df[COLUNA_CONCURSO] > desde]
+    linhas = []
+    for n in faixas:
+        ganhadores = pd.to_numeric(df[f'Ganhadores {n} acertos'], errors='coerce').fillna(0).astype(int)
+        rateio = _valor_monetario(df[f'Rateio {n} acertos']).fillna(0.0)
+        linhas.extend(zip(df[COLUNA_CONCURSO].astype(int).tolist(), [n] * len(df), ganhadores.tolist(), rateio.tolist()))
+    return linhas
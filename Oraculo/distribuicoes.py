@@ -0,0 +1,35 @@
+import math
+
+import numpy as np
+
+_LOG_FATORIAL = np.zeros(1)
+
+
+def log_fatorial(k):
+    """
+    log(k!) elemento a elemento. Inteiros saem de uma tabela de somas de
+    logaritmos (ampliada sob demanda); valores não inteiros usam lgamma.
+    """
+    global _LOG_FATORIAL
+    k = np.asarray(k)
+    if not np.issubdtype(k.dtype, np.integer):
+        return np.vectorize(math.lgamma, otypes=[np.float64])(k + 1.0)
+    maior = int(k.max(initial=0))
+    if maior >= len(_LOG_FATORIAL):
+        _LOG_FATORIAL = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, 2 * maior + 2)))])
+    return _LOG_FATORIAL[k]
+
+
+def poisson_logpmf(k, mu):
+    """
+    log P(X = k) para X ~ Poisson(mu), vetorizado em `k` e `mu`.
+    """
+    k = np.asarray(k)
+    mu = np.asarray(mu, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        termo = np.where(k == 0, 0.0, k * np.log(mu))
+    return termo - mu - log_fatorial(k)
+
+
+def poisson_pmf(k, mu):
+    return np.exp(poisson_logpmf(k, mu))
@@ -0,0 +1,65 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Oraculo.paralelo import numero_processos
+from Oraculo.runner import resolver
+
+LOTE = 1000  # réplicas por bloco (cada bloco tem seu próprio fluxo aleatório)
+
+
+def gerador(seed=None):
+    """
+    Generator do NumPy para os modelos. Sem semente explícita, deriva do
+    estado global (que o runner semeia por modelo), mantendo as execuções
+    reprodutíveis com ORACULO_SEED.
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    if seed is None:
+        seed = np.random.randint(0, 2**32, dtype=np.int64)
+    return np.random.default_rng(seed)
+
+
+def modelo(amostrador, *args, replicas=LOTE, **kwargs):
+    """
+    Descreve um modelo do ensemble: `amostrador(*args, n=..., rng=..., **kwargs)`
+    devolve as n réplicas do bloco como um array (uma linha por réplica).
+    `amostrador` pode ser um callable de nível de módulo ou 'modulo:funcao'.
+    """
+    return {'amostrador': amostrador, 'args': args, 'kwargs': kwargs, 'replicas': int(replicas)}
+
+
+def _bloco(amostrador, args, kwargs, n, semente):
+    amostrador = resolver(amostrador) if isinstance(amostrador, str) else amostrador
+    return np.asarray(amostrador(*args, n=n, rng=np.random.default_rng(semente), **kwargs))
+
+
+def amostrar(modelos, seed=None, lote=LOTE, processos=None):
+    """
+    Executa as réplicas de cada modelo em blocos de até `lote`, cada bloco com
+    um fluxo independente (SeedSequence.spawn), distribuídos por um único
+    ProcessPoolExecutor. Os fluxos dependem só de `seed`, do modelo e do
+    bloco, nunca do número de processos.
+
+    Retorna {nome: array com as réplicas concatenadas}.
+    """
+    raiz = np.random.SeedSequence(seed)
+    blocos = []
+    for (nome, m), semente_modelo in zip(modelos.items(), raiz.spawn(len(modelos))):
+        tamanhos = [min(lote, m['replicas'] - i) for i in range(0, m['replicas'], lote)]
+        for tamanho, semente in zip(tamanhos, semente_modelo.spawn(len(tamanhos))):
+            blocos.append((nome, (m['amostrador'], m['args'], m['kwargs'], tamanho, semente)))
+
+    processos = min(numero_processos(processos), len(blocos))
+    if processos <= 1:
+        partes = [(nome, _bloco(*b)) for nome, b in blocos]
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            futuros = [(nome, pool.submit(_bloco, *b)) for nome, b in blocos]
+            partes = [(nome, f.result()) for nome, f in futuros]
+
+    saida = {}
+    for nome, parte in partes:
+        saida.setdefault(nome, []).append(parte)
+    return {nome: np.concatenate(p) for nome, p in saida.items()}
@@ -0,0 +1,32 @@
+import json
+
+import numpy as np
+
+from Oraculo.dataset import salvar_atomico
+
+
+def heatmap(z, x, y, titulo, cores, texto=None, casas=4):
+    """
+    Dados de um heatmap para o renderizador compartilhado (static/heatmap.js):
+    matriz `z` (len(y) x len(x)), rótulos dos eixos, escala de cores
+    [[posição, "#rrggbb"], ...] e, opcionalmente, o texto de cada célula.
+    """
+    z = np.asarray(z, dtype=float)
+    return {
+        "titulo": titulo,
+        "x": [str(v) for v in x],
+        "y": [str(v) for v in y],
+        "z": np.round(z, casas).tolist(),
+        "texto": None if texto is None else np.asarray(texto).astype(str).tolist(),
+        "cores": cores,
+    }
+
+
+def salvar_heatmaps(path, heatmaps):
+    """
+    Grava a lista de heatmaps de um jogo como um único JSON.
+    """
+    def escrever(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(heatmaps, f, ensure_ascii=False, separators=(",", ":"))
+    salvar_atomico(path, escrever)
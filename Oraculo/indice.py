@@ -0,0 +1,76 @@
+import numpy as np
+
+
+class IndicePrefixo:
+    """
+    Contagens acumuladas do histórico: `acumulado[i]` soma as contagens dos `i`
+    primeiros sorteios, com formato (n_sorteios + 1, *simbolos). Qualquer janela
+    [a, b) de sorteios sai de uma subtração O(símbolos).
+    """
+
+    def __init__(self, acumulado, concursos):
+        self.acumulado = acumulado
+        self.concursos = np.asarray(concursos)
+
+    @classmethod
+    def construir(cls, contagens, concursos):
+        """
+        `contagens` tem formato (n_sorteios, *simbolos), ex. matriz 0/1 (n, 25)
+        da Lotofácil ou one-hot (n, 7, 10) do Super Sete.
+        """
+        return cls(acumular_prefixo(contagens), concursos)
+
+    def __len__(self):
+        return len(self.acumulado) - 1
+
+    def contagem(self, a=0, b=None):
+        """
+        Contagens dos sorteios nas posições [a, b).
+        """
+        b = len(self) if b is None else b
+        return self.acumulado[b] - self.acumulado[a]
+
+    def posicao(self, concurso):
+        """
+        Posição do primeiro sorteio com número de concurso >= `concurso`.
+        """
+        return np.searchsorted(self.concursos, concurso, side='left')
+
+    def intervalo(self, concurso_a, concurso_b):
+        """
+        Contagens dos concursos no intervalo [concurso_a, concurso_b).
+        """
+        return self.contagem(self.posicao(concurso_a), self.posicao(concurso_b))
+
+    def total(self):
+        return self.acumulado[-1]
+
+    def janela(self, n, fim=None):
+        """
+        Contagens dos últimos `n` sorteios antes da posição `fim` (padrão: todo o histórico).
+        """
+        fim = len(self) if fim is None else fim
+        return self.acumulado[fim] - self.acumulado[max(fim - n, 0)]
+
+    def janelas(self, tamanhos, fim=None):
+        """
+        Várias janelas de uma vez: retorna (len(tamanhos), *simbolos). Útil para
+        varrer centenas de comprimentos de janela em uma única operação.
+        """
+        fim = len(self) if fim is None else fim
+        inicio = np.clip(fim - np.asarray(tamanhos), 0, fim)
+        return self.acumulado[fim] - self.acumulado[inicio]
+
+
+def acumular_prefixo(contagens, base=None):
+    """
+    Soma acumulada com a linha inicial `base` (zeros por padrão), em int32.
+    """
+    contagens = np.asarray(contagens, dtype=np.int32)
+    if base is None:
+        base = np.zeros(contagens.shape[1:], dtype=np.int32)
+    prefixo = np.empty((len(contagens) + 1,) + contagens.shape[1:], dtype=np.int32)
+    prefixo[0] = base
+    np.cumsum(contagens, axis=0, out=prefixo[1:])
+    prefixo[1:] += base
+    return prefixo
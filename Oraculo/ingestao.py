@@ -0,0 +1,388 @@
+# ingestao.py (ingestão incremental dos sorteios de qualquer jogo a partir de uma URL ou de um HTML/CSV salvo)
+
+import codecs
+import csv
+import importlib.util
+import io
+import os
+import re
+import sys
+from contextlib import closing
+from html.parser import HTMLParser
+from urllib.request import Request, urlopen
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Oraculo import perfil
+from Oraculo.dataset import COLUNA_CONCURSO, COLUNA_DATA
+from Oraculo.jogos import _chave, jogo as especificacao
+
+# Parsers de HTML em ordem de preferência; html.parser (biblioteca padrão) sempre existe
+PARSERS = ('lxml', 'selectolax', 'html.parser')
+BLOCO = 1 << 16
+TIMEOUT = 60
+
+_DATA = re.compile(r'(\d{2})[/.-](\d{2})[/.-](\d{4})|(\d{4})-(\d{2})-(\d{2})')
+_REGISTRO = re.compile(rb'"?(\d+)"?,')
+
+
+# === FONTES ===
+def eh_url(fonte):
+    return str(fonte).startswith(('http://', 'https://'))
+
+
+def abrir(fonte, timeout=TIMEOUT):
+    """
+    Abre a fonte como arquivo binário. Retorna (arquivo, formato, codificação):
+    formato 'csv' ou 'html' (pela extensão ou pelo Content-Type) e a
+    codificação informada pelo servidor, se houver.
+    """
+    if eh_url(fonte):
+        resposta = urlopen(Request(fonte, headers={'User-Agent': 'Mozilla/5.0 (Oraculo)'}), timeout=timeout)
+        tipo = resposta.headers.get_content_type()
+        formato = 'csv' if tipo == 'text/csv' or fonte.split('?')[0].lower().endswith('.csv') else 'html'
+        return resposta, formato, resposta.headers.get_content_charset()
+    formato = 'csv' if str(fonte).lower().endswith('.csv') else 'html'
+    return open(fonte, 'rb'), formato, None
+
+
+# === LINHAS DE TABELA ===
+# Cada leitor devolve as linhas da fonte como listas de textos das células,
+# uma a uma, sem montar o documento inteiro quando o parser permite.
+
+def _texto(partes):
+    return ' '.join(' '.join(partes).split())
+
+
+def _linhas_lxml(arquivo, codificacao):
+    from lxml import etree
+    opcoes = {'encoding': codificacao} if codificacao else {}
+    for _, tr in etree.iterparse(arquivo, events=('end',), tag='tr', html=True, recover=True, **opcoes):
+        yield [_texto(c.itertext()) for c in tr if c.tag in ('td', 'th')]
+        # Libera a linha e as anteriores: memória constante no tamanho da página
+        tr.clear()
+        while tr.getprevious() is not None:
+            del tr.getparent()[0]
+
+
+def _linhas_selectolax(arquivo, codificacao):
+    from selectolax.lexbor import LexborHTMLParser as Documento
+    conteudo = arquivo.read()
+    documento = Documento(conteudo.decode(codificacao, errors='replace') if codificacao else conteudo)
+    for tr in documento.css('tr'):
+        yield [c.text(separator=' ', strip=True) for c in tr.iter() if c.tag in ('td', 'th')]
+
+
+class _Tabela(HTMLParser):
+    """
+    Coletor de linhas para o html.parser: acumula as células de cada <tr>
+    (tags de fechamento omitidas são aceitas, como nos navegadores).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.linhas, self.linha, self.celula = [], None, None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            self.handle_endtag('tr')
+            self.linha = []
+        elif tag in ('td', 'th') and self.linha is not None:
+            self.handle_endtag('td')
+            self.celula = []
+        elif self.celula is not None:
+            self.celula.append(' ')  # tags internas separam textos (ex.: uma bola por <span>)
+
+    def handle_endtag(self, tag):
+        if self.celula is not None and tag in ('td', 'th', 'tr', 'table'):
+            self.linha.append(' '.join(''.join(self.celula).split()))
+            self.celula = None
+        elif self.celula is not None:
+            self.celula.append(' ')
+        if self.linha is not None and tag in ('tr', 'table'):
+            self.linhas.append(self.linha)
+            self.linha = None
+
+    def handle_data(self, data):
+        # Um mesmo texto pode chegar em pedaços (blocos do feed): concatena sem separar
+        if self.celula is not None:
+            self.celula.append(data)
+
+    def coletar(self, texto):
+        self.feed(texto)
+        linhas, self.linhas = self.linhas, []
+        return linhas
+
+
+def _linhas_html_padrao(arquivo, codificacao):
+    tabela = _Tabela()
+    decodificador = codecs.getincrementaldecoder(codificacao or 'utf-8')(errors='replace')
+    for bloco in iter(lambda: arquivo.read(BLOCO), b''):
+        yield from tabela.coletar(decodificador.decode(bloco))
+    yield from tabela.coletar(decodificador.decode(b'', final=True))
+    tabela.close()
+    tabela.handle_endtag('table')
+    yield from tabela.linhas
+
+
+def _linhas_csv(arquivo, codificacao):
+    yield from csv.reader(io.TextIOWrapper(arquivo, encoding=codificacao or 'utf-8-sig', newline=''))
+
+
+_LEITORES = {'lxml': _linhas_lxml, 'selectolax': _linhas_selectolax, 'html.parser': _linhas_html_padrao}
+
+
+def escolher_parser(preferido=None):
+    """
+    Primeiro parser de HTML disponível (ou o `preferido`, se instalado).
+    """
+    for nome in ([preferido] if preferido else PARSERS):
+        if nome not in _LEITORES:
+            raise ValueError(f"Parser desconhecido: {nome!r} (disponíveis: {', '.join(PARSERS)})")
+        if nome == 'html.parser' or importlib.util.find_spec(nome):
+            return nome
+    raise ValueError(f"Parser {preferido!r} não está instalado")
+
+
+def linhas(arquivo, formato, codificacao=None, parser=None):
+    if formato == 'csv':
+        return _linhas_csv(arquivo, codificacao)
+    return _LEITORES[escolher_parser(parser)](arquivo, codificacao)
+
+
+# === REGISTROS ===
+def _data(texto):
+    # 'dd/mm/aaaa', 'dd-mm-aaaa' ou 'aaaa-mm-dd' -> 'dd/mm/aaaa' (formato dos CSVs)
+    m = _DATA.search(texto)
+    if not m:
+        return None
+    d, mes, a = m.group(1, 2, 3) if m.group(1) else m.group(6, 5, 4)
+    return f'{d}/{mes}/{a}'
+
+
+def _inteiro(texto):
+    texto = texto.strip()
+    return int(texto) if texto.isdigit() else None
+
+
+def mapear_cabecalho(celulas, cabecalho):
+    """
+    Posição de cada coluna do CSV (`cabecalho`) em uma linha de títulos da
+    fonte, comparando os nomes sem acentos, maiúsculas ou espaços
+    ('Coluna 1' = 'coluna1'). 'Data' vale como a coluna de data.
+    """
+    chaves = {_chave(c): c for c in cabecalho}
+    for apelido in ('data', 'datadosorteio'):
+        chaves.setdefault(apelido, COLUNA_DATA)
+    mapa = {}
+    for i, celula in enumerate(celulas):
+        coluna = chaves.get(_chave(celula))
+        if coluna and coluna not in mapa:
+            mapa[coluna] = i
+    return mapa
+
+
+def _numeros(jogo, textos):
+    # Valores do bilhete, na ordem; None se faltar algum ou sair da faixa do jogo
+    numeros = [_inteiro(t) for t in textos]
+    if len(numeros) != jogo.por_sorteio or any(n is None or n not in jogo.simbolos for n in numeros):
+        return None
+    return numeros
+
+
+def _por_cabecalho(jogo, celulas, mapa, ultimo):
+    concurso = _inteiro(celulas[mapa[COLUNA_CONCURSO]]) if mapa[COLUNA_CONCURSO] < len(celulas) else None
+    if concurso is None or concurso <= ultimo:
+        return concurso, None
+    if max(mapa.values()) >= len(celulas):
+        return concurso, None
+    numeros = _numeros(jogo, [celulas[mapa[c]] for c in jogo.colunas])
+    data = _data(celulas[mapa[COLUNA_DATA]])
+    if numeros is None or data is None:
+        return concurso, None
+    registro = {coluna: celulas[i] for coluna, i in mapa.items()}
+    registro.update({COLUNA_CONCURSO: str(concurso), COLUNA_DATA: data})
+    registro.update({c: str(n) for c, n in zip(jogo.colunas, numeros)})
+    return concurso, registro
+
+
+def registros(jogo, linhas, cabecalho, ultimo=0):
+    """
+    Converte as linhas da fonte em pares (concurso, registro {coluna do CSV:
+    texto}) dos concursos posteriores a `ultimo`. A linha de títulos com
+    concurso, data e todas as colunas do bilhete dita as posições (e traz as
+    demais colunas com o mesmo nome do CSV, como ganhadores e rateios); linhas
+    antes dela são ignoradas e, se a fonte não tiver nenhuma, a leitura falha
+    com ValueError em vez de adivinhar os campos. Concursos antigos saem como
+    (concurso, None) assim que o número é lido; linhas com data ou valores
+    fora da faixa do jogo são ignoradas.
+
+    Em páginas do mais recente para o mais antigo, a leitura para no segundo
+    concurso antigo em ordem decrescente: o resto da fonte já está gravado e
+    a ingestão diária custa só os sorteios novos.
+    """
+    necessarias = {COLUNA_CONCURSO, COLUNA_DATA, *jogo.colunas}
+    mapa = antigo = None
+    for celulas in linhas:
+        if not celulas:
+            continue
+        # Títulos não têm células numéricas: só essas linhas são comparadas ao cabeçalho
+        if not any(c.isdigit() for c in celulas):
+            candidato = mapear_cabecalho(celulas, cabecalho)
+            if necessarias <= candidato.keys():
+                mapa = candidato
+            continue
+        if mapa is None:
+            continue
+        concurso, registro = _por_cabecalho(jogo, celulas, mapa, ultimo)
+        if concurso is None or (registro is None and concurso > ultimo):
+            continue
+        yield concurso, registro
+        if registro is None:
+            if antigo is not None and concurso < antigo:
+                return
+            antigo = concurso
+    if mapa is None:
+        faltando = ', '.join(sorted(necessarias))
+        raise ValueError(f"Nenhuma linha de títulos com as colunas {faltando} na fonte")
+
+
+def contiguos(novos, ultimo):
+    """
+    Registros de {concurso: registro} que continuam o CSV sem lacunas
+    (ultimo + 1, ultimo + 2, ...). Um concurso fora da sequência encerra a
+    lista: o que vier depois dele não é gravado.
+    """
+    sequencia = []
+    while ultimo + 1 in novos:
+        ultimo += 1
+        sequencia.append(novos[ultimo])
+    return sequencia
+
+
+# === CSV DE DESTINO ===
+def cabecalho_padrao(jogo):
+    return [COLUNA_CONCURSO, COLUNA_DATA] + list(jogo.colunas)
+
+
+def ler_cabecalho(path):
+    try:
+        with open(path, newline='', encoding='utf-8') as f:
+            return next(csv.reader(f), None)
+    except FileNotFoundError:
+        return None
+
+
+def ultimo_concurso(path, bloco=BLOCO):
+    """
+    Último concurso gravado no CSV (em ordem crescente), lendo só o final do
+    arquivo: a última linha que começa com um número seguido de vírgula.
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return 0
+    with f:
+        fim = f.seek(0, os.SEEK_END)
+        inicio = max(fim - bloco, 0)
+        f.seek(inicio)
+        trecho = f.read().splitlines()
+    if inicio:
+        trecho = trecho[1:]  # a primeira linha do bloco pode estar cortada
+    for linha in reversed(trecho):
+        m = _REGISTRO.match(linha.lstrip())
+        if m:
+            return int(m.group(1))
+    return ultimo_concurso(path, bloco * 8) if inicio else 0
+
+
+def _termina_em_quebra(path):
+    with open(path, 'rb') as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def acrescentar(path, novos, cabecalho):
+    """
+    Acrescenta os registros ao fim do CSV no próprio arquivo, sem copiar o
+    histórico (criando-o com `cabecalho` se não existir). Se a escrita falhar,
+    o arquivo volta ao tamanho original: nunca fica uma linha pela metade.
+    """
+    existe = os.path.exists(path)
+    tamanho = os.path.getsize(path) if existe else 0
+    quebra = not existe or _termina_em_quebra(path)
+    try:
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            if not quebra:
+                f.write('\n')
+            escritor = csv.writer(f, lineterminator='\n')
+            if not existe:
+                escritor.writerow(cabecalho)
+            escritor.writerows([r.get(c, '') for c in cabecalho] for r in novos)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        if existe:
+            os.truncate(path, tamanho)
+        elif os.path.exists(path):
+            os.remove(path)
+        raise
+
+
+# === ETAPA ===
+def _fonte(jogo, fonte):
+    fonte = fonte or jogo.fonte
+    if not fonte:
+        raise SystemExit(f"{jogo.titulo} não tem fonte padrão: informe --fonte (URL ou arquivo HTML/CSV).")
+    return fonte
+
+
+@perfil.medido()
+def ingerir(jogo, fonte=None, path=None, parser=None):
+    """
+    Acrescenta ao CSV do jogo os concursos da fonte (URL ou arquivo HTML/CSV
+    salvo) que continuam a sequência do último já gravado. Retorna
+    (concursos lidos, novos).
+    """
+    jogo = especificacao(jogo)
+    fonte = _fonte(jogo, fonte)
+    path = path or jogo.data_path
+    cabecalho = ler_cabecalho(path) or cabecalho_padrao(jogo)
+    ultimo = ultimo_concurso(path)
+
+    arquivo, formato, codificacao = abrir(fonte)
+    lidos, novos = 0, {}
+    with closing(arquivo):
+        for concurso, registro in registros(jogo, linhas(arquivo, formato, codificacao, parser), cabecalho, ultimo):
+            lidos += 1
+            if registro is not None:
+                novos[concurso] = registro
+
+    sequencia = contiguos(novos, ultimo)
+    if len(sequencia) < len(novos):
+        print(f"⚠️ {len(novos) - len(sequencia)} concursos ignorados: não continuam a sequência a partir do concurso {ultimo}.")
+    if sequencia:
+        acrescentar(path, sequencia, cabecalho)
+    return lidos, len(sequencia)
+
+
+def main(jogo, fonte=None):
+    jogo = especificacao(jogo)
+    fonte = _fonte(jogo, fonte)
+    print(f"\n📥 Ingerindo sorteios ({jogo.titulo}) de {fonte}...")
+    try:
+        lidos, novos = ingerir(jogo, fonte)
+    except ValueError as erro:
+        raise SystemExit(f"❌ {erro}.")
+    if not lidos:
+        print("⚠️ Nenhum sorteio reconhecido na fonte.")
+    elif not novos:
+        print(f"✅ Nenhum concurso novo ({lidos} lidos; último gravado: {ultimo_concurso(jogo.data_path)}).")
+    else:
+        print(f"✅ {novos} concursos novos acrescentados a {jogo.data_path} (último: {ultimo_concurso(jogo.data_path)}).")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else "supersete", sys.argv[2] if len(sys.argv) > 2 else None)
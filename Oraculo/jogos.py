@@ -0,0 +1,160 @@
+import unicodedata
+
+import numpy as np
+
+from Oraculo import banco, bilhetes
+from Oraculo.dataset import carregar_sorteios
+from Oraculo.paralelo import mapear_blocos
+
+
+class Jogo:
+    """
+    Especificação de uma loteria: faixa de símbolos, quantos saem por sorteio,
+    se a ordem importa (uma coluna por posição) e o layout do CSV. Codificação
+    dos bilhetes, contagem de acertos e caminhos dos artefatos saem daqui, de
+    modo que benchmark, banco, CLI e página tratam todos os jogos igualmente.
+
+    `modulos` aponta as etapas com motor próprio (ex.: {'predict':
+    'Oraculo.Lotofacil.scripts.predict'}); as demais usam o motor genérico.
+    `fonte` é a URL (ou arquivo HTML/CSV) padrão da etapa de ingestão.
+    """
+
+    def __init__(self, nome, titulo, simbolos, por_sorteio, ordenado=False, colunas=None,
+                 faixas=None, prefixo_coluna=None, modulos=None, fonte=None):
+        self.nome = nome
+        self.titulo = titulo
+        self.simbolos = simbolos
+        self.por_sorteio = por_sorteio
+        self.ordenado = ordenado
+        self.colunas = colunas or [f'Bola{i}' for i in range(1, por_sorteio + 1)]
+        self.faixas = faixas
+        self.prefixo_coluna = prefixo_coluna or ('col' if ordenado else 'Bola')
+        self.modulos = modulos or {}
+        self.fonte = fonte
+
+        self.raiz = f'Oraculo/{nome}'
+        self.data_path = f'{self.raiz}/data/{nome}.csv'
+        self.pred_path = f'{self.raiz}/predictions'
+        self.docs_path = f'{self.raiz}/docs'
+        self.validacao = f'{self.raiz}/validation'
+
+        if ordenado:
+            self.tipo = np.int64
+            self._pesos = bilhetes.pesos_posicionais(por_sorteio, len(simbolos))
+        else:
+            self.tipo = bilhetes.tipo_mascara(len(simbolos))
+
+    def __repr__(self):
+        return f'Jogo({self.nome!r})'
+
+    # --- Codificação: um inteiro por bilhete (bitmask ou posicional)
+
+    def codificar(self, jogos):
+        if self.ordenado:
+            return bilhetes.codificar_posicoes(jogos, self._pesos)
+        return bilhetes.codificar_mascaras(jogos, self.simbolos.start, self.tipo)
+
+    def decodificar(self, codigos):
+        if self.ordenado:
+            return bilhetes.decodificar_posicoes(codigos, self._pesos, len(self.simbolos))
+        return bilhetes.decodificar_mascaras(codigos, len(self.simbolos), self.simbolos.start, self.tipo)
+
+    # --- Acertos
+
+    def acertos(self, palpites, sorteios):
+        """
+        Acertos de pares (palpite, sorteio) codificados e alinhados linha a linha.
+        Jogos com ordem contam os símbolos em comum, como nos relatórios antigos;
+        os acertos por posição ficam em `acertos_por_coluna`.
+        """
+        if self.ordenado:
+            return bilhetes.popcount(self._presenca(palpites) & self._presenca(sorteios))
+        palpites = np.asarray(palpites).astype(self.tipo)
+        return bilhetes.popcount(palpites & np.asarray(sorteios).astype(self.tipo))
+
+    def acertos_por_coluna(self, palpites, sorteios):
+        if not self.ordenado:
+            return None
+        return (self.decodificar(palpites) == self.decodificar(sorteios)).sum(axis=1)
+
+    def _presenca(self, codigos):
+        # Bitmask dos símbolos presentes no bilhete, em qualquer coluna
+        return bilhetes.codificar_mascaras(self.decodificar(codigos), self.simbolos.start, np.uint64)
+
+    def histograma_acertos(self, palpites, sorteios, bloco=2048, processos=None):
+        """
+        Para cada palpite (codificado), em quantos sorteios (codificados) ele
+        teria feito 0..por_sorteio acertos: matriz (n_palpites, por_sorteio + 1).
+        Jogos com ordem contam colunas acertadas.
+        """
+        if len(palpites) == 0:
+            return np.zeros((0, self.por_sorteio + 1), dtype=np.int64)
+        if self.ordenado:
+            palpites = self.decodificar(palpites).astype(np.int8)
+            sorteios = self.decodificar(sorteios).astype(np.int8)
+            funcao = bilhetes.histograma_colunas
+        else:
+            palpites = np.asarray(palpites).astype(self.tipo)
+            sorteios = np.asarray(sorteios).astype(self.tipo)
+            funcao = bilhetes.histograma_mascaras
+        return mapear_blocos(funcao, palpites, bloco, processos, extra=(sorteios, self.por_sorteio))
+
+    # --- Dados
+
+    def contagem(self, matriz):
+        """
+        Ocorrências de cada símbolo: vetor (n_simbolos,) nos jogos sem ordem,
+        matriz (colunas, n_simbolos) nos jogos com ordem.
+        """
+        matriz = np.asarray(matriz, dtype=np.int64) - self.simbolos.start
+        n = len(self.simbolos)
+        if not self.ordenado:
+            return np.bincount(matriz.ravel(), minlength=n)
+        deslocados = matriz + n * np.arange(matriz.shape[1])
+        return np.bincount(deslocados.ravel(), minlength=n * matriz.shape[1]).reshape(-1, n)
+
+    def carregar(self, path=None):
+        return carregar_sorteios(path or self.data_path, self.colunas)
+
+    def sincronizar(self, con, path=None):
+        """
+        Leva para o banco os concursos e faixas de prêmio novos do CSV.
+        """
+        return banco.sincronizar_sorteios(con, self.nome, path or self.data_path, self.colunas, self.codificar, self.faixas)
+
+    def abrir_banco(self):
+        # Traz para o banco os concursos novos do CSV e os palpites legados
+        con = banco.abrir(self.nome, self.pred_path, self.codificar)
+        self.sincronizar(con)
+        return con
+
+
+LOTOFACIL = Jogo('Lotofacil', 'Lotofácil', range(1, 26), 15, faixas=range(11, 16),
+                 modulos={'predict': 'Oraculo.Lotofacil.scripts.predict',
+                          'backtest': 'Oraculo.Lotofacil.scripts.backtest'})
+SUPERSETE = Jogo('SuperSete', 'Super Sete', range(0, 10), 7, ordenado=True,
+                 colunas=[f'Coluna {i}' for i in range(1, 8)], faixas=range(3, 8),
+                 modulos={'predict': 'Oraculo.SuperSete.scripts.predict',
+                          'backtest': 'Oraculo.SuperSete.scripts.backtest'},
+                 fonte='https://asloterias.com.br/super-sete')
+MEGASENA = Jogo('MegaSena', 'Mega-Sena', range(1, 61), 6, faixas=range(4, 7))
+
+JOGOS = {j.nome.lower(): j for j in (LOTOFACIL, SUPERSETE, MEGASENA)}
+
+
+def _chave(nome):
+    texto = unicodedata.normalize('NFKD', nome).encode('ascii', 'ignore').decode()
+    return ''.join(c for c in texto.lower() if c.isalnum())
+
+
+def jogo(nome):
+    """
+    Especificação pelo nome, sem diferenciar maiúsculas, acentos ou
+    separadores ('lotofacil', 'Lotofácil', 'mega-sena'...).
+    """
+    if isinstance(nome, Jogo):
+        return nome
+    try:
+        return JOGOS[_chave(nome)]
+    except KeyError:
+        raise ValueError(f"Jogo desconhecido: {nome!r} (disponíveis: {', '.join(JOGOS)})") from None
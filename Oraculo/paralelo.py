@@ -0,0 +1,28 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def numero_processos(processos=None):
+    if processos:
+        return max(1, int(processos))
+    return max(1, os.cpu_count() or 1)
+
+
+def mapear_blocos(funcao, dados, bloco, processos=None, extra=()):
+    """
+    Aplica `funcao(dados[i:i + bloco], *extra)` a blocos consecutivos de `dados`
+    e concatena os resultados na ordem original. Com mais de um bloco e mais
+    de um processo disponível, os blocos são distribuídos em um
+    ProcessPoolExecutor; `funcao` precisa ser definida no nível do módulo.
+    """
+    inicios = range(0, len(dados), bloco)
+    processos = min(numero_processos(processos), len(inicios))
+    if processos <= 1:
+        partes = [funcao(dados[i:i + bloco], *extra) for i in inicios]
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            futuros = [pool.submit(funcao, np.asarray(dados[i:i + bloco]), *extra) for i in inicios]
+            partes = [f.result() for f in futuros]
+    return np.concatenate(partes) if partes else np.empty(0)
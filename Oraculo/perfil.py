@@ -0,0 +1,237 @@
+# perfil.py (relatório de execução: tempo, CPU e memória por etapa e por modelo)
+
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+
+from Oraculo.dataset import salvar_atomico
+
+# Herdada pelos processos do runner: liga o tracemalloc também em cada modelo
+VARIAVEL_MEMORIA = 'ORACULO_TRACEMALLOC'
+ARQUIVO = 'relatorio_{etapa}.json'
+HISTORICO = 'relatorios.jsonl'
+HISTORICO_MAXIMO = 100  # execuções mantidas no histórico (as mais recentes)
+
+_ATUAL = None
+
+
+def rss_pico_mb(filhos=False):
+    """
+    Pico de memória residente (MB) do processo ou, com `filhos`, do maior
+    processo filho já encerrado. None onde `resource` não existe (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_CHILDREN if filhos else resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB; macOS, bytes
+    return round(pico / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10), 1)
+
+
+def memoria_ativa():
+    return os.environ.get(VARIAVEL_MEMORIA, '') not in ('', '0')
+
+
+class Relatorio:
+    """
+    Tempos (parede e CPU), pico de RSS e, com tracemalloc ligado, pico de
+    memória alocada por Python de cada etapa de uma execução. Etapas podem ser
+    aninhadas: o nome registrado é o caminho ('heatmap/carregar') e o pico de
+    uma etapa inclui o das etapas internas.
+    """
+
+    def __init__(self, jogo, etapa, memoria=False):
+        self.jogo = jogo
+        self.etapa = etapa
+        self.memoria = memoria
+        self.etapas = []
+        self.modelos = {}
+        self._pilha = []
+        self._inicio = datetime.now(timezone.utc)
+        self._relogio = time.perf_counter()
+        if memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _pico(self):
+        # Pico do tracemalloc desde o último reset (zerado na entrada/saída de cada etapa)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        return pico
+
+    @contextmanager
+    def medir(self, nome):
+        if self.memoria and self._pilha:
+            self._pilha[-1]['pico'] = max(self._pilha[-1]['pico'], self._pico())
+        elif self.memoria:
+            tracemalloc.reset_peak()
+        quadro = {'pico': 0}
+        self._pilha.append(quadro)
+        caminho = '/'.join([e['nome'] for e in self._pilha[:-1]] + [nome])
+        quadro['nome'] = nome
+        registro = {'etapa': caminho}
+        self.etapas.append(registro)
+        parede, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield registro
+        finally:
+            registro['segundos'] = round(time.perf_counter() - parede, 4)
+            registro['cpu_segundos'] = round(time.process_time() - cpu, 4)
+            registro['rss_pico_mb'] = rss_pico_mb()
+            self._pilha.pop()
+            if self.memoria:
+                pico = max(quadro['pico'], self._pico())
+                registro['tracemalloc_pico_mb'] = round(pico / 2 ** 20, 2)
+                if self._pilha:
+                    self._pilha[-1]['pico'] = max(self._pilha[-1]['pico'], pico)
+
+    def registrar_modelos(self, saidas):
+        # Saídas de runner.executar_modelos, sem os resultados
+        for nome, saida in saidas.items():
+            self.modelos[nome] = {chave: valor for chave, valor in saida.items() if chave != 'resultado'}
+
+    def dados(self):
+        return {
+            'jogo': self.jogo,
+            'etapa': self.etapa,
+            'inicio': self._inicio.isoformat(timespec='seconds'),
+            'segundos': round(time.perf_counter() - self._relogio, 4),
+            'rss_pico_mb': rss_pico_mb(),
+            'rss_pico_filhos_mb': rss_pico_mb(filhos=True),
+            'tracemalloc': self.memoria,
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'etapas': self.etapas,
+            'modelos': self.modelos,
+        }
+
+    def salvar(self, pasta):
+        """
+        Grava o relatório da execução (sobrescrito a cada rodada) e acrescenta
+        uma linha ao histórico, para acompanhar regressões entre execuções. O
+        histórico guarda só as `HISTORICO_MAXIMO` execuções mais recentes: o
+        CI o commita a cada rodada e ele não pode crescer sem limite.
+        """
+        dados = self.dados()
+        path = os.path.join(pasta, ARQUIVO.format(etapa=self.etapa))
+
+        def escrever(tmp):
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(dados, f, ensure_ascii=False, indent=2)
+        salvar_atomico(path, escrever)
+
+        historico = os.path.join(pasta, HISTORICO)
+        try:
+            with open(historico, encoding='utf-8') as f:
+                linhas = deque(f, maxlen=HISTORICO_MAXIMO)
+        except FileNotFoundError:
+            linhas = deque(maxlen=HISTORICO_MAXIMO)
+        linhas.append(json.dumps(dados, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+        def escrever_historico(tmp):
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.writelines(linhas)
+        salvar_atomico(historico, escrever_historico)
+        return path
+
+
+def iniciar(jogo, etapa, memoria=False):
+    """
+    Abre o relatório da execução corrente; `etapa` e `medido` passam a registrar nele.
+    """
+    global _ATUAL
+    if memoria:
+        os.environ[VARIAVEL_MEMORIA] = '1'
+    _ATUAL = Relatorio(jogo, etapa, memoria)
+    return _ATUAL
+
+
+def finalizar():
+    global _ATUAL
+    relatorio, _ATUAL = _ATUAL, None
+    if relatorio is not None and relatorio.memoria:
+        os.environ.pop(VARIAVEL_MEMORIA, None)
+        tracemalloc.stop()
+    return relatorio
+
+
+def atual():
+    return _ATUAL
+
+
+@contextmanager
+def etapa(nome):
+    """
+    Mede o bloco no relatório corrente; sem relatório aberto, não faz nada.
+    """
+    if _ATUAL is None:
+        yield None
+        return
+    with _ATUAL.medir(nome) as registro:
+        yield registro
+
+
+def medido(nome=None):
+    """
+    Decorador: mede cada chamada da função como uma etapa (nome da função por padrão).
+    """
+    def decorador(funcao):
+        @wraps(funcao)
+        def envolvida(*args, **kwargs):
+            with etapa(nome or funcao.__name__):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorador
+
+
+@contextmanager
+def medir_chamada(nome):
+    """
+    Mede uma chamada isolada (ex.: um modelo em um processo do runner) no
+    relatório corrente ou, em processos sem relatório, em um avulso que liga
+    o tracemalloc quando `ORACULO_TRACEMALLOC` está definida.
+    """
+    relatorio = _ATUAL or Relatorio(None, None, memoria_ativa())
+    with relatorio.medir(nome) as registro:
+        yield registro
+
+
+def modelos(saidas):
+    if _ATUAL is not None:
+        _ATUAL.registrar_modelos(saidas)
+
+
+def tabela_markdown(dados):
+    """
+    Resumo de um relatório em Markdown (ex.: para o $GITHUB_STEP_SUMMARY do CI).
+    """
+    def celula(valor):
+        return '-' if valor is None else valor
+    linhas = [f"### {dados['jogo']} {dados['etapa']}: {dados['segundos']:.2f}s, RSS pico {celula(dados['rss_pico_mb'])} MB", '',
+              '| etapa | segundos | CPU | RSS pico (MB) | tracemalloc pico (MB) |', '|---|---|---|---|---|']
+    for e in dados['etapas']:
+        linhas.append(f"| {e['etapa']} | {e['segundos']} | {e['cpu_segundos']} | {celula(e['rss_pico_mb'])} | {celula(e.get('tracemalloc_pico_mb'))} |")
+    medidos = {e['etapa'].rsplit('/', 1)[-1] for e in dados['etapas']}
+    for nome, m in dados['modelos'].items():
+        if nome in medidos:  # runner em série: o modelo já aparece como etapa
+            continue
+        medidas = m.get('medidas', {})
+        segundos = m['erro'] or round(m['segundos'], 4)
+        linhas.append(f"| modelo {nome} | {segundos} | {celula(medidas.get('cpu_segundos'))} | "
+                      f"{celula(medidas.get('rss_pico_processo_mb'))} | {celula(medidas.get('tracemalloc_pico_mb'))} |")
+    linhas += ['', 'RSS pico: maior RSS do processo desde o início (ru_maxrss), não só da etapa; '
+               'nos modelos, do worker que os executou, incluindo os modelos que ele rodou antes.']
+    return '\n'.join(linhas)
+
+
+if __name__ == '__main__':
+    for path in sys.argv[1:]:
+        with open(path, encoding='utf-8') as f:
+            print(tabela_markdown(json.load(f)) + '\n')
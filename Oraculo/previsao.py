@@ -0,0 +1,123 @@
+# previsao.py (motor genérico: frequência em janelas + Poisson para qualquer jogo de Oraculo.jogos)
+
+import os
+import sys
+from collections import Counter
+from datetime import date
+from contextlib import closing
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Oraculo import banco
+from Oraculo import graficos
+from Oraculo import perfil
+from Oraculo.distribuicoes import poisson_logpmf
+from Oraculo.jogos import jogo as especificacao
+
+JANELAS = {"frequencia_curto": 5, "frequencia_medio": 75}
+CORES = [[0, '#eef5f9'], [0.5, '#5fa8d3'], [1, '#1b4965']]
+
+
+def escolher(jogo, pesos):
+    """
+    Bilhete com os maiores pesos: as `por_sorteio` dezenas mais pesadas (empates
+    pela menor dezena) ou, nos jogos com ordem, o símbolo mais pesado de cada coluna.
+    """
+    pesos = np.asarray(pesos, dtype=np.float64)
+    if jogo.ordenado:
+        return [int(jogo.simbolos[i]) for i in np.argmax(pesos, axis=1)]
+    melhores = np.argsort(-pesos, kind='stable')[:jogo.por_sorteio]
+    return sorted(int(jogo.simbolos[i]) for i in melhores)
+
+
+def pesos_poisson(contagem):
+    # pmf da frequência de cada símbolo com média comum (por coluna nos jogos com ordem)
+    contagem = np.asarray(contagem)
+    media = contagem.mean(axis=-1, keepdims=True)
+    return poisson_logpmf(contagem, media)
+
+
+def consenso(jogo, palpites, contagem):
+    """
+    Palpite da rodada: símbolo mais votado por coluna (jogos com ordem) ou as
+    dezenas mais presentes entre os palpites, desempatadas pela frequência histórica.
+    """
+    if jogo.ordenado:
+        return [Counter(p[i] for p in palpites).most_common(1)[0][0] for i in range(jogo.por_sorteio)]
+    votos = jogo.contagem(np.array(palpites))
+    return escolher(jogo, votos + contagem / max(contagem.sum(), 1))
+
+
+def palpites(jogo, matriz):
+    contagem = jogo.contagem(matriz)
+    entradas = [{"modelo": modelo, "jogo": escolher(jogo, jogo.contagem(matriz[-n:]))} for modelo, n in JANELAS.items()]
+    entradas.append({"modelo": "frequencia_longo", "jogo": escolher(jogo, contagem)})
+    entradas.append({"modelo": "poisson", "jogo": escolher(jogo, pesos_poisson(contagem))})
+    entradas.append({"modelo": "palpite_rodada", "jogo": consenso(jogo, [e["jogo"] for e in entradas], contagem)})
+    return entradas
+
+
+@perfil.medido()
+def carregar(jogo):
+    print(f"\n📊 Carregando dados históricos ({jogo.titulo})...")
+    dados = jogo.carregar()
+    print(f"Total de concursos: {len(dados['concurso'])} | Último concurso: {dados['concurso'][-1]}")
+    return dados
+
+
+def predict(jogo, dados=None):
+    jogo = especificacao(jogo)
+    dados = carregar(jogo) if dados is None else dados
+    with perfil.etapa("modelos"):
+        entradas = palpites(jogo, np.asarray(dados["matriz"]))
+
+    print("\n🎯 Palpites gerados:")
+    for e in entradas:
+        print(f"{e['modelo']}: {e['jogo']}")
+
+    print("\n💾 Salvando previsões...")
+    with perfil.etapa("salvar"), closing(jogo.abrir_banco()) as con:
+        banco.salvar_palpites(con, jogo.nome, date.today().isoformat(), entradas, jogo.codificar,
+                              concurso=int(dados["concurso"][-1]) + 1)
+    print(f"\n✅ Previsões salvas em {banco.caminho(jogo.pred_path)}")
+
+
+@perfil.medido()
+def heatmap(jogo, dados=None):
+    # Heatmap (dados em JSON, desenhados por static/heatmap.js na página)
+    jogo = especificacao(jogo)
+    dados = carregar(jogo) if dados is None else dados
+    contagem = jogo.contagem(dados["matriz"])
+    if jogo.ordenado:
+        # Símbolos nas linhas e colunas do bilhete nas colunas
+        simbolos = np.asarray(jogo.simbolos)
+        mapa = graficos.heatmap(contagem.T, x=[f"Coluna {i}" for i in range(1, jogo.por_sorteio + 1)], y=simbolos,
+                                titulo="Frequência por Coluna", cores=CORES,
+                                texto=simbolos[:, None].repeat(jogo.por_sorteio, axis=1))
+    else:
+        # Volante em linhas de 10 dezenas
+        linhas = -(-len(jogo.simbolos) // 10)
+        freq = np.zeros(linhas * 10)
+        freq[:len(contagem)] = contagem / max(contagem.sum(), 1)
+        rotulos = np.full(linhas * 10, "", dtype=object)
+        rotulos[:len(contagem)] = [str(d) for d in jogo.simbolos]
+        mapa = graficos.heatmap(freq.reshape(linhas, 10), x=range(1, 11), y=[f"Linha {i}" for i in range(1, linhas + 1)],
+                                titulo=f"Heatmap de Frequência das Dezenas ({jogo.simbolos.start} a {jogo.simbolos[-1]})",
+                                cores=CORES, texto=rotulos.reshape(linhas, 10))
+    path = os.path.join(jogo.docs_path, "heatmap.json")
+    graficos.salvar_heatmaps(path, [mapa])
+    print(f"\n🗺️ Heatmap salvo em {path}")
+
+
+def main(jogo, gerar_heatmap=True):
+    jogo = especificacao(jogo)
+    dados = carregar(jogo)
+    predict(jogo, dados)
+    if gerar_heatmap:
+        heatmap(jogo, dados)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else "megasena")
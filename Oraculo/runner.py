@@ -0,0 +1,199 @@
+import importlib
+import os
+import signal
+import threading
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from Oraculo import perfil
+from Oraculo.paralelo import numero_processos
+
+TIMEOUT_PADRAO = 300  # segundos por modelo
+# Folga do processo principal sobre o limite de cada modelo (importações e
+# carga do dataset no worker acontecem antes do alarme ser armado)
+MARGEM = 30
+_MEDIDAS = ('cpu_segundos', 'rss_pico_mb', 'tracemalloc_pico_mb')
+
+# Datasets já carregados neste processo, por (carregador, argumentos)
+_DADOS = {}
+
+
+class TempoEsgotado(Exception):
+    pass
+
+
+def resolver(alvo):
+    """
+    Resolve 'pacote.modulo:objeto.atributo' para o objeto correspondente.
+    """
+    modulo, _, atributo = alvo.partition(':')
+    obj = importlib.import_module(modulo)
+    for parte in atributo.split('.'):
+        obj = getattr(obj, parte)
+    return obj
+
+
+def semente_modelo(base, nome):
+    """
+    Semente própria de cada modelo, derivada da semente base da rodada. Sem
+    base, cada processo sorteia a sua a partir da entropia do sistema.
+    """
+    if base is None:
+        return None
+    return (int(base) * 1_000_003 + zlib.crc32(nome.encode('utf-8'))) % 2**32
+
+
+def semente_ambiente(variavel='ORACULO_SEED'):
+    valor = os.environ.get(variavel)
+    return int(valor) if valor else None
+
+
+def tarefa(nome, funcao, *args, dados=None, seed=None, timeout=None, passar_semente=False, **kwargs):
+    """
+    Descreve a execução de um modelo. `funcao` e o carregador em `dados`
+    ('modulo:funcao', (argumentos,)) são referências por nome, para que os
+    processos importem o código e mapeiem o dataset (sidecar .npy) por conta
+    própria em vez de receber DataFrames serializados. Com `passar_semente`,
+    a semente do modelo também vai para `funcao` como `seed=`.
+    """
+    return {'nome': nome, 'funcao': funcao, 'args': args, 'kwargs': kwargs,
+            'dados': dados, 'seed': seed, 'timeout': timeout, 'passar_semente': passar_semente}
+
+
+def _alarme(signum, frame):
+    raise TempoEsgotado()
+
+
+def _executar(nome, funcao, args, kwargs, dados, seed, timeout):
+    # Processos filhos herdam o estado do gerador global: sempre ressemear
+    np.random.seed(seed)
+
+    if dados is not None:
+        carregador, argumentos = dados
+        chave = (carregador, repr(argumentos))
+        if chave not in _DADOS:
+            _DADOS[chave] = resolver(carregador)(*argumentos)
+        args = (_DADOS[chave],) + tuple(args)
+
+    usar_alarme = bool(timeout) and hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+    if usar_alarme:
+        anterior = signal.signal(signal.SIGALRM, _alarme)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    inicio = time.perf_counter()
+    try:
+        with perfil.medir_chamada(nome) as registro:
+            resultado = resolver(funcao)(*args, **kwargs)
+        medidas = {chave: registro[chave] for chave in _MEDIDAS if chave in registro}
+        # ru_maxrss é o pico do processo inteiro: num worker do pool, inclui
+        # os modelos que ele já executou antes deste
+        medidas['rss_pico_processo_mb'] = medidas.pop('rss_pico_mb', None)
+        return resultado, time.perf_counter() - inicio, medidas
+    finally:
+        if usar_alarme:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, anterior)
+
+
+def executar_modelos(tarefas, processos=None, seed=None, timeout=TIMEOUT_PADRAO):
+    """
+    Executa modelos independentes em um ProcessPoolExecutor (ou em série com
+    `processos=1`). Cada tarefa recebe sua semente e seu limite de tempo; um
+    modelo que falha ou estoura o tempo não derruba os demais.
+
+    Retorna {nome: {'resultado', 'segundos', 'erro', 'medidas'}} na ordem das
+    tarefas; `medidas` traz tempo de CPU e picos de memória do modelo (ver
+    Oraculo.perfil) e também vai para o relatório da execução, se houver um aberto.
+    """
+    processos = min(numero_processos(processos), len(tarefas)) or 1
+    saidas = {}
+
+    def preparar(t):
+        semente = t['seed'] if t['seed'] is not None else semente_modelo(seed, t['nome'])
+        kwargs = dict(t['kwargs'], seed=semente) if t.get('passar_semente') else t['kwargs']
+        return (t['nome'], t['funcao'], t['args'], kwargs, t['dados'], semente, t['timeout'] or timeout)
+
+    def registrar(t, obter):
+        try:
+            resultado, segundos, medidas = obter()
+            saidas[t['nome']] = {'resultado': resultado, 'segundos': segundos, 'erro': None, 'medidas': medidas}
+        except TempoEsgotado:
+            saidas[t['nome']] = {'resultado': None, 'segundos': None, 'erro': 'tempo esgotado', 'medidas': {}}
+        except Exception as e:
+            saidas[t['nome']] = {'resultado': None, 'segundos': None, 'erro': f'{type(e).__name__}: {e}', 'medidas': {}}
+
+    if processos <= 1:
+        for t in tarefas:
+            registrar(t, lambda t=t: _executar(*preparar(t)))
+    else:
+        _executar_pool(tarefas, [preparar(t) for t in tarefas], processos, registrar)
+        saidas = {t['nome']: saidas[t['nome']] for t in tarefas}
+    perfil.modelos(saidas)
+    return saidas
+
+
+def _esgotado():
+    raise TempoEsgotado()
+
+
+def _encerrar(pool):
+    # Mata os workers (um deles pode estar preso em código que ignora o
+    # SIGALRM) em vez de esperar por eles no shutdown
+    for processo in list((getattr(pool, '_processes', None) or {}).values()):
+        processo.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _executar_pool(tarefas, argumentos, processos, registrar):
+    """
+    Executa as tarefas no pool com limite de tempo também do lado do processo
+    principal. O pool atende em ordem, então as `processos` primeiras tarefas
+    pendentes são as que estão rodando: cada uma tem prazo de `timeout +
+    MARGEM` a partir de quando entrou nesse grupo. Se um prazo vence, a
+    tarefa sai como tempo esgotado, o pool é morto e as demais pendentes
+    recomeçam em um pool novo (com as mesmas sementes).
+    """
+    pendentes = list(range(len(tarefas)))
+    while pendentes:
+        pool = ProcessPoolExecutor(max_workers=min(processos, len(pendentes)))
+        futuros = {i: pool.submit(_executar, *argumentos[i]) for i in pendentes}
+        inicio, vencida = {}, None
+        while pendentes:
+            agora = time.monotonic()
+            rodando = pendentes[:processos]
+            prazos = {}
+            for i in rodando:
+                inicio.setdefault(i, agora)
+                limite = argumentos[i][-1]
+                prazos[i] = inicio[i] + limite + MARGEM if limite else float('inf')
+            proxima = min(rodando, key=prazos.get)
+            espera = None if prazos[proxima] == float('inf') else max(prazos[proxima] - agora, 0)
+            feitos, _ = wait([futuros[i] for i in rodando], timeout=espera, return_when=FIRST_COMPLETED)
+            if not feitos:
+                vencida = proxima
+                break
+            for i in [i for i in pendentes if futuros[i].done()]:
+                registrar(tarefas[i], futuros[i].result)
+                pendentes.remove(i)
+        if vencida is None:
+            pool.shutdown()
+        else:
+            registrar(tarefas[vencida], _esgotado)
+            pendentes.remove(vencida)
+            _encerrar(pool)
+
+
+def resultados(saidas):
+    """
+    Imprime tempo ou erro de cada modelo e devolve {nome: resultado} só dos que concluíram.
+    """
+    validos = {}
+    for nome, saida in saidas.items():
+        if saida['erro'] is None:
+            print(f"⏱️ {nome}: {saida['segundos']:.2f}s")
+            validos[nome] = saida['resultado']
+        else:
+            print(f"⚠️ {nome} ignorado: {saida['erro']}")
+    return validos
@@ -1,60 +1,97 @@
 import markdown2
-from pathlib import Path
-from jinja2 import Template
+import os
+import sys
 import json
+import hashlib
+from pathlib import Path
+from jinja2 import Environment, FileSystemLoader
+import numpy as np
 import pandas as pd
 
-# Caminhos dos relatórios por jogo
-jogos = {
-    "Lotofácil": {
-        "predictions": Path("Oraculo/Lotofacil/predictions"),
-        "heatmap": Path("Oraculo/Lotofacil/docs/heatmap.html"),
-        "title": "Lotofácil"
-    },
-    "Super Sete": {
-        "predictions": Path("Oraculo/SuperSete/predictions"),
-        "heatmap": Path("Oraculo/SuperSete/docs/heatmap.html"),
-        "title": "Super Sete"
-    },
-    "Mega-Sena": {
-        "predictions": Path("Oraculo/MegaSena/predictions"),
-        "heatmap": Path("Oraculo/MegaSena/docs/heatmap.html"),
-        "title": "Mega-Sena"
-    }
-}
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-def gerar_tabela_previsoes(prediction_dir: Path) -> str:
-    if not prediction_dir.exists():
-        return "<p><em>Nenhuma previsão encontrada.</em></p>"
+from Oraculo import banco
+from Oraculo.dataset import hash_arquivo, salvar_atomico
+from Oraculo.jogos import JOGOS
 
-    arquivos = sorted(prediction_dir.glob("*.json"), reverse=True)
-    if not arquivos:
-        return "<p><em>Sem arquivos de previsão.</em></p>"
+# Build incremental: cada aba é um fragmento em cache, refeito só quando o
+# hash das suas entradas (palpites mais recentes + heatmap) muda
+VERSAO = 2  # incrementar quando o HTML dos fragmentos mudar
+TEMPLATES = Path(__file__).parent / "templates"
+CACHE_DIR = Path("scripts/cache/html")
+MANIFESTO = CACHE_DIR / "manifest.json"
+SAIDA = Path("index.html")
+CSV_RECENTES = "previsoes_recentes.csv"
 
-    mais_recente = arquivos[0]
-    df = pd.read_json(mais_recente)
-    csv_path = prediction_dir / (mais_recente.stem + ".csv")
-    if csv_path.exists():
-        df_csv = pd.read_csv(csv_path)
-    else:
-        df.to_csv(csv_path, index=False)
-        df_csv = df
+# Caminhos dos relatórios por jogo (uma aba por especificação de Oraculo.jogos)
+jogos = {
+    j.titulo: {
+        "predictions": Path(j.pred_path),
+        "heatmap": Path(j.docs_path) / "heatmap.json",
+        "title": j.titulo,
+        "jogo": j.nome,
+        "codec": (j.codificar, j.decodificar),
+        "coluna": j.prefixo_coluna,
+    }
+    for j in JOGOS.values()
+}
 
-    tabela_html = df_csv.to_html(index=False, classes="prediction-table")
+def carregar_palpites(paths: dict) -> list:
+    """
+    Palpites da data mais recente do jogo no banco (só essa data é lida).
+    """
+    if paths["codec"] is None:
+        return []
+
+    # Só leitura: a página não cria bancos nem importa palpites legados (isso é do predict)
+    path = banco.caminho(str(paths["predictions"]))
+    if not os.path.exists(path):
+        return []
+    _, decodificar_jogo = paths["codec"]
+    con = banco.conectar_leitura(path)
+    try:
+        data = banco.ultima_data(con, paths["jogo"])
+        return banco.palpites(con, paths["jogo"], data, decodificar_jogo) if data else []
+    finally:
+        con.close()
+
+def tabela_palpites(entradas: list, paths: dict) -> pd.DataFrame:
+    """
+    Um bilhete por linha, com as mesmas colunas dos antigos CSV diários.
+    """
+    rows = []
+    for p in entradas:
+        for jogo in np.atleast_2d(p["jogo"]):
+            row = {f"{paths['coluna']}{i+1}": int(n) for i, n in enumerate(jogo)}
+            row["modelo"] = p["modelo"]
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+def gerar_tabela_previsoes(df: pd.DataFrame, prediction_dir: Path) -> str:
+    # CSV único, sobrescrito a cada execução, para o link de download
+    csv_path = prediction_dir / CSV_RECENTES
+    prediction_dir.mkdir(parents=True, exist_ok=True)
+    df.to_csv(csv_path, index=False)
+
+    tabela_html = df.to_html(index=False, classes="prediction-table")
     link = f"<a href='{csv_path.as_posix()}' download>📥 Baixar CSV</a>"
     return f"<h3>Previsões Recentes</h3>{tabela_html}<br>{link}"
 
 def carregar_heatmap(path: Path) -> str:
-    if path.exists():
-        return path.read_text(encoding="utf-8")
-    return "<p><em>Heatmap não disponível.</em></p>"
+    # Só os dados vão para a página; static/heatmap.js desenha cada um
+    if not path.exists():
+        return "<p><em>Heatmap não disponível.</em></p>"
+    html = ""
+    for heatmap in json.loads(path.read_text(encoding="utf-8")):
+        dados = json.dumps(heatmap, ensure_ascii=False).replace("</", "<\\/")
+        html += f"<div class='heatmap'><script type='application/json'>{dados}</script></div>"
+    return html
 
-def gerar_conteudo_jogo(nome: str, paths: dict) -> str:
+def gerar_conteudo_jogo(nome: str, paths: dict, entradas: list) -> str:
     html = f"<div class='tabcontent' id='{nome}'><h2>{paths['title']}</h2>"
 
-    prediction_dir = paths["predictions"]
-    arquivos = sorted(prediction_dir.glob("*.csv"), reverse=True)
-    if not arquivos:
+    df = tabela_palpites(entradas, paths)
+    if df.empty:
         html += "<p><em>Sem dados disponíveis.</em></p></div>"
         return html
 
@@ -62,11 +99,9 @@ def gerar_conteudo_jogo(nome: str, paths: dict) -> str:
     html += carregar_heatmap(paths["heatmap"])
 
     html += "<h3>🧠 Palpites Gerados</h3>"
-    html += gerar_tabela_previsoes(prediction_dir)
+    html += gerar_tabela_previsoes(df, paths["predictions"])
 
     # Exibir resumo de estratégias
-    mais_recente = arquivos[0]
-    df = pd.read_csv(mais_recente)
     modelo_counts = df['modelo'].value_counts().to_frame().reset_index()
     modelo_counts.columns = ['Modelo', 'Total']
     html += f"<h4>Resumo de estratégias</h4>"
@@ -75,78 +110,66 @@ def gerar_conteudo_jogo(nome: str, paths: dict) -> str:
     html += "</div>"
     return html
 
-# Coleta conteúdo por aba
-abas_html = "\n".join([
-    gerar_conteudo_jogo(nome, paths) for nome, paths in jogos.items()
-])
-
-html_template = Template("""
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-  <meta charset="UTF-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>Relatórios de Loterias</title>
-  <style>
-    body { font-family: system-ui, sans-serif; background: #111; color: #eee; padding: 2rem; }
-    h1 { color: #2fd39a; }
-    .tabs { display: flex; gap: 1rem; margin-bottom: 1rem; }
-    .tab-button {
-      padding: 0.5rem 1rem;
-      background: #222;
-      border: none;
-      color: #2fd39a;
-      cursor: pointer;
-    }
-    .tab-button.active { background: #2fd39a; color: #000; }
-    .tabcontent { display: none; animation: fadeIn 0.3s ease-in-out; }
-    .tabcontent.active { display: block; }
-    .plotly-container { margin-top: 1rem; }
-    @keyframes fadeIn {
-      from { opacity: 0; }
-      to { opacity: 1; }
-    }
-    table, th, td {
-      border: 1px solid #444;
-      border-collapse: collapse;
-      padding: 0.4rem;
-    }
-    th { background: #2fd39a; color: #000; }
-    .prediction-table { margin-top: 1rem; background: #000; }
-    .prediction-table th, .prediction-table td { text-align: center; }
-    a { color: #2fd39a; text-decoration: none; }
-  </style>
-</head>
-<body>
-  <h1>Relatórios Probabilísticos - Loterias</h1>
-  <div class="tabs">
-    {% for nome in jogos.keys() %}
-    <button class="tab-button" onclick="openTab('{{ nome }}')">{{ nome }}</button>
-    {% endfor %}
-  </div>
-  {{ abas_html | safe }}
-
-  <script>
-    function openTab(tabName) {
-      const contents = document.querySelectorAll('.tabcontent');
-      contents.forEach(c => c.classList.remove('active'));
-      const tabs = document.querySelectorAll('.tab-button');
-      tabs.forEach(t => t.classList.remove('active'));
-      document.getElementById(tabName).classList.add('active');
-      event.currentTarget.classList.add('active');
-    }
-    document.addEventListener('DOMContentLoaded', () => {
-      const firstTab = document.querySelector('.tab-button');
-      if (firstTab) firstTab.click();
-    });
-  </script>
-</body>
-</html>
-""")
-
-html_output = html_template.render(
-    abas_html=abas_html,
-    jogos=jogos
-)
-Path("index.html").write_text(html_output, encoding="utf-8")
-print("index.html gerado com sucesso.")
+def hash_texto(*partes) -> str:
+    h = hashlib.sha256()
+    for parte in partes:
+        h.update(str(parte).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+def chave_jogo(nome: str, paths: dict, entradas: list) -> str:
+    heatmap = hash_arquivo(paths["heatmap"]) if paths["heatmap"].exists() else ""
+    return hash_texto(VERSAO, nome, paths["title"], heatmap, json.dumps(entradas, sort_keys=True))
+
+def ler_manifesto() -> dict:
+    try:
+        return json.loads(MANIFESTO.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def gravar_texto(path: Path, texto: str):
+    def escrever(tmp):
+        Path(tmp).write_text(texto, encoding="utf-8")
+    salvar_atomico(str(path), escrever)
+
+def carregar_template():
+    env = Environment(loader=FileSystemLoader(str(TEMPLATES)), autoescape=False)
+    return env.get_template("index.html")
+
+def construir(jogos: dict, saida: Path = SAIDA) -> bool:
+    """
+    Refaz só as abas cujas entradas mudaram e só regrava a página quando
+    algum fragmento ou o template mudou. Retorna se a página foi regravada.
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    manifesto = ler_manifesto()
+    abas = manifesto.get("abas", {})
+
+    fragmentos, chaves, refeitas = [], {}, []
+    for nome, paths in jogos.items():
+        entradas = carregar_palpites(paths)
+        chave = chave_jogo(nome, paths, entradas)
+        fragmento = CACHE_DIR / f"{paths['jogo']}.html"
+        csv_ok = not entradas or (paths["predictions"] / CSV_RECENTES).exists()
+        if abas.get(nome) == chave and fragmento.exists() and csv_ok:
+            fragmentos.append(fragmento.read_text(encoding="utf-8"))
+        else:
+            html = gerar_conteudo_jogo(nome, paths, entradas)
+            gravar_texto(fragmento, html)
+            fragmentos.append(html)
+            refeitas.append(nome)
+        chaves[nome] = chave
+
+    pagina = hash_texto(hash_arquivo(str(TEMPLATES / "index.html")), *chaves.values())
+    if manifesto.get("pagina") == pagina and saida.exists():
+        print("index.html sem mudanças.")
+        return False
+
+    html_output = carregar_template().render(abas_html="\n".join(fragmentos), jogos=jogos)
+    gravar_texto(saida, html_output)
+    gravar_texto(MANIFESTO, json.dumps({"versao": VERSAO, "pagina": pagina, "abas": chaves}, indent=2))
+    print(f"index.html gerado com sucesso (abas refeitas: {', '.join(refeitas) or 'nenhuma'}).")
+    return True
+
+if __name__ == "__main__":
+    construir(jogos)
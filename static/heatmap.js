@@ -0,0 +1,59 @@
+// Renderizador de heatmaps da página: lê o JSON embutido em cada
+// <div class="heatmap"><script type="application/json">...</script></div>
+// (formato de Oraculo/graficos.py) e desenha uma tabela colorida.
+(function () {
+  function rgb(hex) {
+    const n = parseInt(hex.slice(1), 16);
+    return [(n >> 16) & 255, (n >> 8) & 255, n & 255];
+  }
+
+  function cor(escala, t) {
+    for (let i = 1; i < escala.length; i++) {
+      const [p0, c0] = escala[i - 1];
+      const [p1, c1] = escala[i];
+      if (t <= p1 || i === escala.length - 1) {
+        const f = p1 > p0 ? Math.min(Math.max((t - p0) / (p1 - p0), 0), 1) : 0;
+        const a = rgb(c0), b = rgb(c1);
+        return `rgb(${a.map((v, k) => Math.round(v + (b[k] - v) * f)).join(",")})`;
+      }
+    }
+    return escala[0][1];
+  }
+
+  function desenhar(el) {
+    const dados = JSON.parse(el.querySelector("script[type='application/json']").textContent);
+    const valores = dados.z.flat();
+    const min = Math.min(...valores), max = Math.max(...valores);
+    const escala = dados.cores.map(([p, c]) => [Number(p), c]);
+
+    const tabela = document.createElement("table");
+    tabela.className = "heatmap-table";
+    const titulo = tabela.createCaption();
+    titulo.textContent = dados.titulo;
+
+    const cabecalho = tabela.createTHead().insertRow();
+    cabecalho.insertCell().textContent = "";
+    dados.x.forEach(x => { const th = document.createElement("th"); th.textContent = x; cabecalho.appendChild(th); });
+
+    const corpo = tabela.createTBody();
+    dados.z.forEach((linha, i) => {
+      const tr = corpo.insertRow();
+      const th = document.createElement("th");
+      th.textContent = dados.y[i];
+      tr.appendChild(th);
+      linha.forEach((v, j) => {
+        const t = max > min ? (v - min) / (max - min) : 0;
+        const td = tr.insertCell();
+        td.style.background = cor(escala, t);
+        td.style.color = t > 0.6 ? "#fff" : "#000";
+        td.title = `${dados.y[i]} / ${dados.x[j]}: ${v}`;
+        td.textContent = dados.texto ? dados.texto[i][j] : "";
+      });
+    });
+    el.appendChild(tabela);
+  }
+
+  document.addEventListener("DOMContentLoaded", () => {
+    document.querySelectorAll(".heatmap").forEach(desenhar);
+  });
+})();